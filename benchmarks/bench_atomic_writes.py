@@ -0,0 +1,72 @@
+"""
+Measures the cost of the atomic experiment writes under each fsync policy,
+compared with writing the files in place, and of the project recovery pass.
+
+    python -m benchmarks.bench_atomic_writes
+"""
+import os
+import shutil
+import tempfile
+
+from deeplearning_logger.files import atomic_write, commit_files
+from deeplearning_logger.json import JSONSerializer
+from deeplearning_logger.keras.configs import MetricsConfig
+from deeplearning_logger.keras.project import Project
+from benchmarks.synthetic import make_history, make_project
+from benchmarks.utils import measure, print_table
+
+def write_in_place(folder, files):
+    for filename, content in files.items():
+        with open(os.path.join(folder, filename), 'wb') as file:
+            file.write(content)
+
+def main():
+    serializer = JSONSerializer()
+    rows = []
+
+    for epochs in [100, 10000]:
+        files = {
+            'experiment_config.json': serializer.dumps({'name': 'bench'}),
+            'experiment_data.json': serializer.dumps(
+                {'metrics': MetricsConfig(make_history(epochs)).config[1]})
+        }
+        folder = tempfile.mkdtemp()
+        data_path = os.path.join(folder, 'experiment_data.json')
+
+        rows.append({'epochs': epochs, 'write': 'in_place', 'fsync': '-',
+                     'seconds': measure(lambda: write_in_place(folder, files),
+                                        number=10)})
+
+        for fsync in ['never', 'always']:
+            rows.append({
+                'epochs': epochs, 'write': 'atomic_write', 'fsync': fsync,
+                'seconds': measure(lambda: atomic_write(
+                    data_path, files['experiment_data.json'], fsync),
+                    number=10)})
+            rows.append({
+                'epochs': epochs, 'write': 'commit_files', 'fsync': fsync,
+                'seconds': measure(lambda: commit_files(folder, files, fsync),
+                                   number=10)})
+
+        shutil.rmtree(folder)
+
+    print_table(rows)
+
+    rows = []
+
+    for experiments in [100, 1000]:
+        project_path = tempfile.mkdtemp()
+        make_project(project_path, 'bench', experiments)
+
+        rows.append({
+            'experiments': experiments,
+            'recover': measure(lambda: Project('bench', project_path,
+                                               recover=False).recover())
+        })
+
+        shutil.rmtree(project_path)
+
+    print_table(rows)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Measures capturing a callback holding large numpy buffers with CallbackConfig
+and serializing it, against copying its attributes and converting the arrays
+with the standard library encoder.
+
+    python -m benchmarks.bench_callbacks
+"""
+import json
+
+import numpy as np
+import tensorflow as tf
+
+from deeplearning_logger.json import ConfigsJSONEncoder, JSONSerializer
+from deeplearning_logger.keras.configs import CallbackConfig
+from benchmarks.utils import measure, print_table
+
+class BufferCallback(tf.keras.callbacks.Callback):
+    def __init__(self, values):
+        super().__init__()
+        rng = np.random.default_rng(0)
+        self.best = np.float32(0.5)
+        self.wait = 3
+        self.buffers = {f'buffer_{idx}': rng.random(values)
+                        for idx in range(4)}
+        self.history = {'loss': rng.random(100).tolist()}
+
+def copy_attributes(callback):
+    return {type(callback).__name__: {
+        key: value for key, value in callback.__dict__.items()
+        if key[0] != '_' and not callable(value)}}
+
+def main():
+    serializer = JSONSerializer()
+    rows = []
+
+    for values in [1000, 100000, 1000000]:
+        callback = BufferCallback(values)
+
+        rows.append({
+            'values': values,
+            'capture': measure(lambda: CallbackConfig(callback), number=10),
+            'capture_dumps': measure(lambda: serializer.dumps(
+                                    CallbackConfig(callback).config[1])),
+            'copy_tolist_dumps': measure(lambda: json.dumps(
+                                    copy_attributes(callback),
+                                    cls=ConfigsJSONEncoder))
+        })
+
+    print_table(rows)
+
+if __name__ == '__main__':
+    main()
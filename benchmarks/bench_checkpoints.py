@@ -0,0 +1,66 @@
+"""
+Measures the chunked hashing and deduplication of checkpoint files, and the
+best checkpoint lookup of the registry against scanning its entries.
+
+    python -m benchmarks.bench_checkpoints
+"""
+import os
+import shutil
+import tempfile
+
+from deeplearning_logger.checkpoints import BlobStore, CheckpointRegistry, \
+                                            hash_file
+from benchmarks.utils import measure, print_table
+
+_SIZES_MB = [16, 128]
+_ENTRIES = 100000
+
+def scan_best(entries, metric):
+    """
+    Finds the best checkpoint by scanning every entry.
+    """
+    return min((entry for entry in entries if metric in entry['metrics']),
+               key=lambda entry: entry['metrics'][metric])
+
+def main():
+    folder = tempfile.mkdtemp()
+    rows = []
+
+    try:
+        for size in _SIZES_MB:
+            path = os.path.join(folder, f'model_{size}.ckpt')
+            with open(path, 'wb') as file:
+                for _ in range(size):
+                    file.write(os.urandom(1 << 20))
+
+            copies = BlobStore(os.path.join(folder, f'.copy_{size}'))
+            links = BlobStore(os.path.join(folder, f'.link_{size}'), 'link')
+            copies.put(path)
+            links.put(path)
+
+            rows.append({
+                'size_mb': size,
+                'hash_file': measure(lambda: hash_file(path), repeat=3),
+                'copy_stored': measure(lambda: copies.put(path), repeat=3),
+                'link_stored': measure(lambda: links.put(path), repeat=3)
+            })
+
+        print_table(rows)
+
+        registry = CheckpointRegistry(os.path.join(folder, 'registry.jsonl'))
+        for epoch in range(_ENTRIES):
+            registry._add_entry({'path': 'model.ckpt', 'epoch': epoch,
+                                 'hash': str(epoch), 'stored': False,
+                                 'metrics': {'val_loss': 1 / (epoch + 1)}})
+        entries = registry.entries
+
+        print_table([{
+            'entries': _ENTRIES,
+            'registry_best': measure(registry.best, number=1000),
+            'scan_best': measure(lambda: scan_best(entries, 'val_loss'))
+        }])
+    finally:
+        shutil.rmtree(folder)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Measures Project.compare on projects with thousands of experiments, against
+opening each experiment and aligning its metrics by hand.
+
+    python -m benchmarks.bench_compare
+"""
+import tempfile
+
+import numpy as np
+
+from benchmarks.synthetic import make_project
+from benchmarks.utils import measure, print_table
+
+_EPOCHS = 100
+
+def compare_by_hand(project, names):
+    series = []
+
+    for name in names:
+        metrics = project.open_experiment(name).get_config('metrics')
+        series.append(metrics.get_columns()['metric_0'])
+
+    values = np.full((len(series), max(map(len, series))), np.nan)
+    for row, values_row in enumerate(series):
+        values[row, :len(values_row)] = values_row
+
+    return np.nanargmin(values, axis=1)
+
+def main():
+    rows = []
+
+    for experiments in [1000, 5000]:
+        with tempfile.TemporaryDirectory() as folder:
+            project = make_project(folder, 'bench', experiments,
+                                   epochs=_EPOCHS)
+            names = sorted(project.list_experiments())
+
+            rows.append({
+                'experiments': experiments,
+                'by_hand': measure(lambda: compare_by_hand(project, names),
+                                   repeat=1),
+                'compare': measure(lambda: project.compare(
+                                'metric_0', names).best_epoch(), repeat=3)
+            })
+
+    print_table(rows)
+
+if __name__ == '__main__':
+    main()
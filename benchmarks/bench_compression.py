@@ -0,0 +1,67 @@
+"""
+Compares the size and the write and read throughput of the experiment data
+file stored plain, with gzip and with zstd at several levels.
+
+    python -m benchmarks.bench_compression
+"""
+import gzip
+import io
+
+from deeplearning_logger.compression import compress_stream, zstandard
+from deeplearning_logger.json import JSONSerializer
+from deeplearning_logger.keras.configs import MetricsConfig
+from benchmarks.synthetic import make_history, make_model_config
+from benchmarks.utils import measure, print_table
+
+_SETTINGS = [(None, None), ('gzip', 1), ('gzip', 6), ('gzip', 9),
+             ('zstd', 1), ('zstd', 3), ('zstd', 10)]
+
+def write(payload, serializer, compression, level):
+    file = io.BytesIO()
+
+    with compress_stream(file, compression, level) as stream:
+        serializer.dump(payload, stream)
+
+    return file.getvalue()
+
+def read(content, compression):
+    # Same decompression as read_file, without the disk
+    file = io.BytesIO(content)
+
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=file).read()
+    if compression == 'zstd':
+        return zstandard.ZstdDecompressor().stream_reader(file).read()
+
+    return file.read()
+
+def main():
+    serializer = JSONSerializer()
+    payload = {'metrics': MetricsConfig(make_history(5000, metrics=8)
+                                        ).config[1],
+               'model': {'model_config': make_model_config()}}
+    plain_size = len(serializer.dumps(payload))
+    rows = []
+
+    for compression, level in _SETTINGS:
+        if compression == 'zstd' and zstandard is None:
+            continue
+
+        content = write(payload, serializer, compression, level)
+        write_time = measure(lambda: write(payload, serializer, compression,
+                                           level))
+        read_time = measure(lambda: read(content, compression))
+
+        rows.append({
+            'compression': compression or 'none',
+            'level': level if level is not None else '-',
+            'size_kb': len(content) // 1024,
+            'ratio': plain_size / len(content),
+            'write_mb_s': plain_size / write_time / 2**20,
+            'read_mb_s': plain_size / read_time / 2**20
+        })
+
+    print_table(rows)
+
+if __name__ == '__main__':
+    main()
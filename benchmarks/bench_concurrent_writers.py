@@ -0,0 +1,115 @@
+"""
+Stress test of several processes writing into the same project at the same
+time. Half of the experiment names are shared by every process, so the
+writers race to create them, and the rest are unique to each process.
+
+After the run every experiment file must be complete and each shared name
+must have been created by exactly one process.
+
+    python -m benchmarks.bench_concurrent_writers
+"""
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from deeplearning_logger.keras.configs import MetricsConfig
+from deeplearning_logger.keras.project import Project
+from deeplearning_logger.pytorch.experiment_data import MetricsData
+from deeplearning_logger.pytorch.pytorch_logger import ExperimentData, \
+                                                       PytorchLogger
+from benchmarks.synthetic import make_history
+from benchmarks.utils import print_table
+
+def get_names(worker, experiments):
+    shared = [f'shared_{idx}' for idx in range(experiments // 2)]
+    unique = [f'worker_{worker}_{idx}'
+              for idx in range(experiments - len(shared))]
+
+    return shared + unique
+
+def write_keras(project_path, worker, experiments):
+    project = Project('bench', project_path, recover=False)
+    metrics = MetricsConfig(make_history(100))
+    created = 0
+
+    for name in get_names(worker, experiments):
+        try:
+            project.create_experiment(name, configs=[metrics], exist_ok=False)
+            created += 1
+        except ValueError:
+            pass
+
+    return created
+
+def write_pytorch(project_path, worker, experiments):
+    logger = PytorchLogger(project_path)
+    losses = np.random.rand(100).tolist()
+    created = 0
+
+    for name in get_names(worker, experiments):
+        try:
+            logger.save(ExperimentData(metrics=MetricsData(
+                                            train_losses=losses)), name)
+            created += 1
+        except ValueError:
+            pass
+
+    return created
+
+def check_files(folder):
+    for root, _, filenames in os.walk(folder):
+        for filename in filenames:
+            if filename.endswith('.json'):
+                with open(os.path.join(root, filename), 'rb') as file:
+                    json.loads(file.read())
+
+            if filename.endswith('.tmp'):
+                raise ValueError(f'Temporary file left: {filename}')
+
+def main():
+    context = multiprocessing.get_context('fork')
+    experiments = 100
+    rows = []
+
+    for backend, write in [('keras', write_keras),
+                           ('pytorch', write_pytorch)]:
+        for processes in [1, 2, 4, 8]:
+            project_path = tempfile.mkdtemp()
+
+            # Creates the project before the workers
+            if backend == 'keras':
+                Project('bench', project_path)
+
+            start = time.perf_counter()
+
+            with context.Pool(processes) as pool:
+                created = pool.starmap(write, [(project_path, worker,
+                                                experiments)
+                                               for worker in range(processes)])
+
+            elapsed = time.perf_counter() - start
+            check_files(project_path)
+
+            # Each shared name is created once, the unique ones always
+            expected = experiments // 2 + processes * (experiments -
+                                                       experiments // 2)
+            rows.append({
+                'backend': backend,
+                'processes': processes,
+                'created': sum(created),
+                'expected': expected,
+                'seconds': elapsed,
+                'experiments_per_s': sum(created) / elapsed
+            })
+
+            shutil.rmtree(project_path)
+
+    print_table(rows)
+
+if __name__ == '__main__':
+    main()
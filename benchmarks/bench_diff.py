@@ -0,0 +1,80 @@
+"""
+Measures diffing large model configs, equal and with one changed layer,
+against a plain recursive walk of both configs, and the N-way diff of many
+experiments sharing a few distinct configs.
+
+    python -m benchmarks.bench_diff
+"""
+import copy
+
+from deeplearning_logger.architectures import fingerprint
+from deeplearning_logger.diff import diff_many, diff_trees
+from benchmarks.synthetic import make_model_config
+from benchmarks.utils import measure, print_table
+
+def walk(old, new, path, changes):
+    """
+    Compares two structures visiting every value.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old.keys() | new.keys():
+            walk(old.get(key), new.get(key), f'{path}.{key}', changes)
+    elif isinstance(old, list) and isinstance(new, list) and \
+            len(old) == len(new):
+        for idx, (old_value, new_value) in enumerate(zip(old, new)):
+            walk(old_value, new_value, f'{path}.{idx}', changes)
+    elif old != new:
+        changes.append(path)
+
+    return changes
+
+def make_model(layers, hashed):
+    config = make_model_config(layers)
+    model = {'model_config': config, 'optimizer_config': {'lr': 0.1}}
+
+    if hashed:
+        model['model_hash'] = fingerprint(config)
+
+    return model
+
+def main():
+    rows = []
+
+    for layers in [50, 500, 5000]:
+        old = make_model(layers, hashed=False)
+        equal = copy.deepcopy(old)
+        changed = copy.deepcopy(old)
+        changed['model_config']['layers'][layers // 2]['config']['units'] = 1
+        hashed = make_model(layers, hashed=True)
+        hashed_equal = copy.deepcopy(hashed)
+
+        rows.append({
+            'layers': layers,
+            'walk_equal': measure(lambda: walk(old, equal, '', [])),
+            'diff_equal': measure(lambda: diff_trees(old, equal)),
+            'diff_hashed': measure(lambda: diff_trees(hashed, hashed_equal),
+                                   number=100),
+            'walk_changed': measure(lambda: walk(old, changed, '', [])),
+            'diff_changed': measure(lambda: diff_trees(old, changed))
+        })
+
+    print_table(rows)
+
+    # Many experiments sharing four distinct configs
+    variants = [make_model(500, hashed=False) for _ in range(4)]
+    for idx, variant in enumerate(variants):
+        variant['optimizer_config']['lr'] = 10 ** -idx
+    trees = {f'experiment_{idx}': copy.deepcopy(variants[idx % 4])
+             for idx in range(200)}
+
+    print_table([{
+        'experiments': len(trees),
+        'diff_many': measure(lambda: diff_many(trees), repeat=3),
+        'pairwise_walk': measure(lambda: [walk(trees['experiment_0'], tree,
+                                               '', [])
+                                          for tree in trees.values()],
+                                 repeat=3)
+    }])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+"""
+Compares adding one epoch to an experiment by rewriting its files against
+appending a segment, for experiments of growing size.
+
+    python -m benchmarks.bench_extend_metrics
+"""
+import tempfile
+
+from deeplearning_logger.keras.configs import MetricsConfig
+from deeplearning_logger.keras.project import Project
+from benchmarks.synthetic import make_history
+from benchmarks.utils import measure, print_table
+
+def main():
+    rows = []
+    epoch = make_history(1)
+
+    for epochs in [1000, 10000, 100000]:
+        with tempfile.TemporaryDirectory() as folder:
+            project = Project('bench', folder)
+            experiment = project.create_experiment(
+                            'experiment', configs=[MetricsConfig(
+                                make_history(epochs), layout='columns')])
+
+            rows.append({
+                'epochs': epochs,
+                'rewrite': measure(experiment.register_experiment),
+                'extend_metrics': measure(
+                    lambda: experiment.extend_metrics(epoch), number=10)
+            })
+
+    print_table(rows)
+
+if __name__ == '__main__':
+    main()
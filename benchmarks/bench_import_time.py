@@ -0,0 +1,56 @@
+"""
+Measures the import time of the read-side modules in a fresh interpreter,
+and checks none of them imports a deep learning framework or pandas.
+
+    python -m benchmarks.bench_import_time
+"""
+import subprocess
+import sys
+
+from benchmarks.utils import print_table
+
+_MODULES = [
+    'deeplearning_logger.json',
+    'deeplearning_logger.keras.project',
+    'deeplearning_logger.pytorch.pytorch_logger',
+    'deeplearning_logger.keras.callbacks'
+]
+_HEAVY_MODULES = ('tensorflow', 'torch', 'pandas', 'keras')
+
+_SCRIPT = '''
+import sys
+import time
+
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+
+heavy = [module for module in {heavy!r} if module in sys.modules]
+print(elapsed, ','.join(heavy) or '-')
+'''
+
+def measure_import(module, repeat=3):
+    best = float('inf')
+
+    for _ in range(repeat):
+        result = subprocess.run(
+                    [sys.executable, '-c',
+                     _SCRIPT.format(module=module, heavy=_HEAVY_MODULES)],
+                    capture_output=True, text=True, check=True)
+        elapsed, heavy = result.stdout.split()[-2:]
+        best = min(best, float(elapsed))
+
+    return best, heavy
+
+def main():
+    rows = []
+
+    for module in _MODULES:
+        seconds, heavy = measure_import(module)
+        rows.append({'module': module, 'seconds': seconds,
+                     'heavy_modules': heavy})
+
+    print_table(rows)
+
+if __name__ == '__main__':
+    main()
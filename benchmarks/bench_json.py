@@ -0,0 +1,47 @@
+"""
+Compares the JSON backends on realistic experiment payloads, with and
+without indentation.
+
+    python -m benchmarks.bench_json
+"""
+from deeplearning_logger.json import JSONSerializer
+from deeplearning_logger.keras.configs import MetricsConfig
+from benchmarks.synthetic import make_history, make_model_config
+from benchmarks.utils import measure, print_table
+
+def make_payloads():
+    history = make_history(5000, metrics=8)
+
+    return {
+        'epochs_layout': {'metrics': MetricsConfig(history).config[1],
+                          'model': {'model_config': make_model_config()}},
+        'columns_layout': {
+            'metrics': MetricsConfig(history, layout='columns').config[1],
+            'model': {'model_config': make_model_config()}}
+    }
+
+def main():
+    rows = []
+
+    for payload_name, payload in make_payloads().items():
+        for backend in ['json', 'ujson', 'orjson']:
+            for compact in [False, True]:
+                try:
+                    serializer = JSONSerializer(backend, compact=compact)
+                except ImportError:
+                    continue
+
+                content = serializer.dumps(payload)
+                rows.append({
+                    'payload': payload_name,
+                    'backend': backend,
+                    'compact': compact,
+                    'size_kb': len(content) // 1024,
+                    'dumps': measure(lambda: serializer.dumps(payload)),
+                    'loads': measure(lambda: serializer.loads(content))
+                })
+
+    print_table(rows)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""
+Compares the MetricsConfig construction of the previous row by row
+implementation with the vectorized one, for both stored layouts.
+
+    python -m benchmarks.bench_metrics_config
+"""
+from deeplearning_logger.keras.configs import MetricsConfig
+from benchmarks.synthetic import make_history
+from benchmarks.utils import measure, print_table
+
+_HISTORY_SIZES = [100, 1000, 10000, 50000]
+
+def iterrows_config(data):
+    """
+    Previous implementation of `MetricsConfig.get_config`.
+    """
+    config = {}
+
+    for idx, row in data.iterrows():
+        config[f'epoch_{idx}'] = {}
+        for column in data.columns:
+            config[f'epoch_{idx}'][column] = float(row.loc[column])
+
+    return ('metrics', config)
+
+def main():
+    rows = []
+
+    for size in _HISTORY_SIZES:
+        history = make_history(size, metrics=24)
+        repeat = 1 if size > 1000 else 3
+
+        rows.append({
+            'epochs': size,
+            'iterrows': measure(lambda: iterrows_config(history), repeat),
+            'epochs_layout': measure(lambda: MetricsConfig(history), repeat),
+            'columns_layout': measure(
+                lambda: MetricsConfig(history, layout='columns'), repeat)
+        })
+
+    print_table(rows)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""
+Measures how Project.open_experiments scales with the number of threads and
+processes, against opening the experiments one after another.
+
+    python -m benchmarks.bench_open_experiments
+"""
+import tempfile
+
+from benchmarks.synthetic import make_project
+from benchmarks.utils import measure, print_table
+
+_EXPERIMENTS = 200
+_EPOCHS = 2000
+_WORKERS = [1, 2, 4, 8]
+
+def main():
+    with tempfile.TemporaryDirectory() as folder:
+        project = make_project(folder, 'bench', _EXPERIMENTS, epochs=_EPOCHS)
+        names = project.list_experiments()
+
+        def open_sequentially():
+            for name in names:
+                project.open_experiment(name, lazy=False)
+
+        rows = [{'mode': 'sequential', 'workers': 1,
+                 'seconds': measure(open_sequentially, repeat=3)}]
+
+        for workers in _WORKERS:
+            rows.append({'mode': 'threads', 'workers': workers,
+                         'seconds': measure(
+                            lambda: project.open_experiments(names, workers),
+                            repeat=3)})
+
+        for workers in _WORKERS:
+            rows.append({'mode': 'processes', 'workers': workers,
+                         'seconds': measure(
+                            lambda: project.open_experiments(
+                                        names, workers, processes=workers),
+                            repeat=3)})
+
+        print_table(rows)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Measures the overhead of the profiler on the logger operations, comparing
+the undecorated functions with the profiler disabled and enabled, and
+prints the stats collected while it is enabled.
+
+    python -m benchmarks.bench_profiling
+"""
+import itertools
+import json
+import shutil
+import tempfile
+
+from deeplearning_logger.keras.configs import MetricsConfig
+from deeplearning_logger.profiling import disable_profiling, \
+                                          enable_profiling, get_stats, \
+                                          reset_stats
+from deeplearning_logger.pytorch.pytorch_logger import ExperimentData, \
+                                                        PytorchLogger
+from benchmarks.synthetic import make_history
+from benchmarks.utils import measure, print_table
+
+def main():
+    folder = tempfile.mkdtemp()
+    logger = PytorchLogger(project_folder=folder + '/')
+    data = ExperimentData()
+    history = make_history(10, metrics=4)
+    config = MetricsConfig(history)
+    names = (f'experiment_{idx}' for idx in itertools.count())
+
+    operations = {
+        'ExperimentData.get': (
+            lambda: ExperimentData.get.__wrapped__(data), data.get, 10000),
+        'MetricsConfig.get_config': (
+            lambda: MetricsConfig.get_config.__wrapped__(config, history),
+            lambda: config.get_config(history), 1000),
+        'PytorchLogger.save': (
+            lambda: PytorchLogger.save.__wrapped__(logger, data, next(names)),
+            lambda: logger.save(data, next(names)), 100)
+    }
+    rows = []
+
+    reset_stats()
+
+    try:
+        for name, (undecorated, decorated, number) in operations.items():
+            row = {'operation': name,
+                   'undecorated': measure(undecorated, number=number),
+                   'disabled': measure(decorated, number=number)}
+
+            enable_profiling()
+            try:
+                row['enabled'] = measure(decorated, number=number)
+            finally:
+                disable_profiling()
+
+            rows.append(row)
+    finally:
+        shutil.rmtree(folder)
+
+    print_table(rows)
+    print(json.dumps(get_stats(), indent=2))
+
+if __name__ == '__main__':
+    main()
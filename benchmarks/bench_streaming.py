@@ -0,0 +1,70 @@
+"""
+Compares the time and peak memory of reading a metric from the experiment
+data file by loading it whole and by streaming it, with both layouts.
+
+    python -m benchmarks.bench_streaming
+"""
+import os
+import shutil
+import tempfile
+import tracemalloc
+
+from deeplearning_logger.json import JSONSerializer
+from deeplearning_logger.keras.configs import MetricsConfig
+from deeplearning_logger.streaming import iter_metric
+from benchmarks.synthetic import make_history, make_model_config
+from benchmarks.utils import measure, print_table
+
+def load(path):
+    with open(path, 'rb') as file:
+        metrics = JSONSerializer().loads(file.read())['metrics']
+
+    if 'metric_3' in metrics:
+        return list(metrics['metric_3'])
+
+    return [epoch.get('metric_3') for epoch in metrics.values()]
+
+def stream(path):
+    return list(iter_metric(path, 'metric_3'))
+
+def peak_memory(function):
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return peak
+
+def main():
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, 'experiment_data.json')
+    rows = []
+
+    try:
+        for epochs in [1000, 10000, 100000]:
+            for layout in ['epochs', 'columns']:
+                history = make_history(epochs, metrics=8)
+                payload = {
+                    'model': {'model_config': make_model_config()},
+                    'metrics': MetricsConfig(history, layout=layout
+                                             ).config[1]
+                }
+
+                with open(path, 'wb') as file:
+                    file.write(JSONSerializer().dumps(payload))
+
+                for name, function in [('load', load), ('stream', stream)]:
+                    rows.append({
+                        'epochs': epochs,
+                        'layout': layout,
+                        'reader': name,
+                        'seconds': measure(lambda: function(path), repeat=3),
+                        'peak_mb': peak_memory(lambda: function(path)) / 2**20
+                    })
+    finally:
+        shutil.rmtree(folder)
+
+    print_table(rows)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Compares logging the trials of a hyperparameter sweep as experiments of a
+project and into a sweep, and finding the best trial of each.
+
+    python -m benchmarks.bench_sweep
+"""
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from deeplearning_logger.keras.configs import MetricsConfig
+from deeplearning_logger.keras.project import Project
+from benchmarks.synthetic import make_history
+from benchmarks.utils import measure, print_table
+
+# Creating experiments is slow, so fewer are created and the time is scaled
+_EXPERIMENTS = 200
+_TRIALS = 10000
+
+def log_experiments(project, trials, metrics):
+    for idx, (lr, value) in enumerate(trials):
+        project.create_experiment(f'trial_{idx}', configs=[metrics],
+                                  description=f'lr={lr} val_loss={value}')
+
+def log_sweep(project, trials, metrics):
+    with project.create_sweep('sweep', configs=[metrics],
+                              params={'lr': 0.1, 'units': 64}) as sweep:
+        for lr, value in trials:
+            sweep.log_trial({'lr': lr}, {'val_loss': value})
+
+    return sweep
+
+def main():
+    folder = tempfile.mkdtemp()
+    rng = np.random.default_rng(0)
+    trials = list(zip(rng.random(_TRIALS).tolist(),
+                      rng.random(_TRIALS).tolist()))
+    metrics = MetricsConfig(make_history(100, metrics=8))
+
+    try:
+        project = Project(project_name='experiments', project_path=folder)
+        start = time.perf_counter()
+        log_experiments(project, trials[:_EXPERIMENTS], metrics)
+        experiments_time = (time.perf_counter() - start) * \
+                            _TRIALS / _EXPERIMENTS
+
+        project = Project(project_name='sweep', project_path=folder)
+        start = time.perf_counter()
+        sweep = log_sweep(project, trials, metrics)
+        sweep_time = time.perf_counter() - start
+
+        print_table([
+            {'storage': f'experiments (scaled from {_EXPERIMENTS})',
+             'trials': _TRIALS, 'log_seconds': experiments_time},
+            {'storage': 'sweep', 'trials': _TRIALS,
+             'log_seconds': sweep_time}
+        ])
+
+        sweep = project.open_sweep('sweep')
+        print_table([{
+            'trials': _TRIALS,
+            'open_sweep': measure(lambda: project.open_sweep('sweep'),
+                                  repeat=3),
+            'best': measure(lambda: sweep.best('val_loss'), number=100),
+            'best_rebuilt': measure(lambda: (sweep.refresh(),
+                                             sweep.best('val_loss')),
+                                    repeat=3),
+            'get_trial': measure(lambda: sweep.get_trial('trial_5000'),
+                                 number=1000)
+        }])
+    finally:
+        shutil.rmtree(folder)
+
+if __name__ == '__main__':
+    main()
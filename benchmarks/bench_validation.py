@@ -0,0 +1,80 @@
+"""
+Compares the construction cost of the data objects with the previous
+validation, which resolved the type hints once per field, with the cached
+validation, the trusted constructor and the validation disabled.
+
+    python -m benchmarks.bench_validation
+"""
+import typing
+from dataclasses import fields
+
+from deeplearning_logger.pytorch.experiment_data import MetricsData, \
+                                                        ModelData, \
+                                                        OptimizerData
+from deeplearning_logger.keras.configs import MetricsConfig
+from deeplearning_logger.validation import set_validation
+from benchmarks.synthetic import make_history
+from benchmarks.utils import measure, print_table
+
+_NUMBER = 2000
+
+def previous_validate_types(self, instance, class_type):
+    """
+    Previous implementation of `Data.validate_types`.
+    """
+    for field in fields(instance):
+        attr = getattr(instance, field.name)
+        attr_type = typing.get_type_hints(class_type)[field.name]
+
+        if attr is not None and not isinstance(attr, attr_type):
+            raise ValueError(f'Field {field.name} is of type {type(attr)}')
+
+def main():
+    history = make_history(10, metrics=4)
+    cases = {
+        'OptimizerData': lambda cls: cls(lr=0.01, optimizer='adam'),
+        'MetricsData': lambda cls: cls(train_losses=[0.5, 0.4],
+                                       test_metrics={'acc': 0.9}),
+        'ModelData': lambda cls: cls(checkpoint='model.pt', epochs=10)
+    }
+    classes = {'OptimizerData': OptimizerData, 'MetricsData': MetricsData,
+               'ModelData': ModelData}
+    rows = []
+
+    for name, build in cases.items():
+        cls = classes[name]
+        current = cls.validate_types
+
+        cls.validate_types = previous_validate_types
+        try:
+            previous = measure(lambda: build(cls), number=_NUMBER)
+        finally:
+            cls.validate_types = current
+
+        cached = measure(lambda: build(cls), number=_NUMBER)
+        trusted = measure(lambda: build(cls.trusted), number=_NUMBER)
+
+        set_validation(False)
+        try:
+            disabled = measure(lambda: build(cls), number=_NUMBER)
+        finally:
+            set_validation(True)
+
+        rows.append({'object': name, 'previous': previous, 'cached': cached,
+                     'trusted': trusted, 'disabled': disabled})
+
+    validated = measure(lambda: MetricsConfig(history), number=_NUMBER)
+    set_validation(False)
+    try:
+        disabled = measure(lambda: MetricsConfig(history), number=_NUMBER)
+    finally:
+        set_validation(True)
+
+    rows.append({'object': 'MetricsConfig', 'previous': float('nan'),
+                 'cached': validated, 'trusted': float('nan'),
+                 'disabled': disabled})
+
+    print_table(rows)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+"""
+Runs the benchmark suite, stores the results in a JSON file and compares
+them with a baseline to catch regressions.
+
+    python -m benchmarks --quick
+    python -m benchmarks --output baseline.json
+    python -m benchmarks --baseline baseline.json --threshold 1.25
+"""
+import argparse
+import fnmatch
+import os
+import platform
+import sys
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+
+from benchmarks.suite import BENCHMARKS
+from benchmarks.utils import measure, print_table
+
+_RESULTS_FOLDER = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                               'results')
+
+def get_machine() -> Dict:
+    """
+    Describes the machine and environment running the benchmarks, so the
+    results of different machines are not compared by mistake.
+
+    Returns
+    -------
+    machine : Dict
+        Platform, processor, CPU count, and Python, NumPy and JSON backend
+        versions.
+    """
+    from deeplearning_logger.json import JSONSerializer
+
+    return {
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'json_backend': JSONSerializer().backend
+    }
+
+def run(pattern: str = '*', quick: bool = False) -> Dict[str, Dict]:
+    """
+    Runs the benchmarks whose name matches a pattern.
+
+    Parameters
+    ----------
+    pattern : str
+        Shell-style pattern of the benchmark names. Default is '*'.
+    quick : bool
+        Whether to run only the small parameters. Default is False.
+
+    Returns
+    -------
+    results : Dict[str, Dict]
+        Best time per call of each benchmark and parameter, by
+        'name[param]'.
+    """
+    results = {}
+
+    for case in BENCHMARKS:
+        if not fnmatch.fnmatch(case.name, pattern):
+            continue
+
+        for param in case.get_params(quick):
+            with case.setup(param) as function:
+                # The first call warms up the caches and the lazy imports
+                function()
+                seconds = measure(function, case.repeat, case.number)
+
+            key = f'{case.name}[{param}]'
+            results[key] = {'seconds': seconds, 'repeat': case.repeat,
+                            'number': case.number}
+            print(f'{key}: {seconds:.6f}', file=sys.stderr)
+
+    return results
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict],
+            threshold: float = 1.25) -> List[Dict]:
+    """
+    Compares results with a baseline.
+
+    Parameters
+    ----------
+    results : Dict[str, Dict]
+        Results of the current run.
+    baseline : Dict[str, Dict]
+        Results of the baseline run.
+    threshold : float
+        Ratio over the baseline time considered a regression, and under its
+        inverse an improvement. Default is 1.25.
+
+    Returns
+    -------
+    rows : List[Dict]
+        Time, baseline time, ratio and status of each benchmark.
+    """
+    rows = []
+
+    for key, result in results.items():
+        base = baseline.get(key)
+
+        if base is None:
+            rows.append({'benchmark': key, 'seconds': result['seconds'],
+                         'baseline': '-', 'ratio': '-', 'status': 'new'})
+            continue
+
+        ratio = result['seconds'] / base['seconds']
+
+        if ratio > threshold:
+            status = 'regression'
+        elif ratio < 1 / threshold:
+            status = 'improvement'
+        else:
+            status = 'ok'
+
+        rows.append({'benchmark': key, 'seconds': result['seconds'],
+                     'baseline': base['seconds'], 'ratio': f'{ratio:.2f}',
+                     'status': status})
+
+    return rows
+
+def save(results: Dict[str, Dict], path: str, quick: bool) -> None:
+    """
+    Writes results into a JSON file, with the machine that produced them.
+
+    Parameters
+    ----------
+    results : Dict[str, Dict]
+        Results of the run.
+    path : str
+        JSON file path.
+    quick : bool
+        Whether the run was quick.
+    """
+    import json
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    with open(path, 'w') as file:
+        json.dump({
+            'created': datetime.now().strftime('%Y-%m-%dT%H:%M:%S'),
+            'quick': quick,
+            'machine': get_machine(),
+            'results': results
+        }, file, indent=2)
+
+def load(path: str) -> Dict:
+    """
+    Reads the results written by `save`.
+
+    Parameters
+    ----------
+    path : str
+        JSON file path.
+
+    Returns
+    -------
+    run : Dict
+        Creation date, machine and results of the run.
+    """
+    import json
+
+    with open(path, 'r') as file:
+        return json.load(file)
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description=__doc__.splitlines()[1])
+    parser.add_argument('-k', '--filter', default='*',
+                        help="Shell-style pattern of the benchmark names")
+    parser.add_argument('--quick', action='store_true',
+                        help='Run only the small parameters')
+    parser.add_argument('--output',
+                        help='Results file. Default is a timestamped file '
+                             'in benchmarks/results')
+    parser.add_argument('--baseline', help='Results file to compare with')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='Slowdown ratio reported as a regression')
+    parser.add_argument('--list', action='store_true',
+                        help='List the benchmarks without running them')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for case in BENCHMARKS:
+            print(case.name, case.get_params(args.quick))
+        return 0
+
+    results = run(args.filter, args.quick)
+    output = args.output or os.path.join(
+        _RESULTS_FOLDER, datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+    save(results, output, args.quick)
+
+    if args.baseline is None:
+        print_table([{'benchmark': key, 'seconds': result['seconds']}
+                     for key, result in results.items()])
+        print(f'Results written into {output}')
+        return 0
+
+    baseline = load(args.baseline)
+
+    if baseline['machine'] != get_machine():
+        print('Warning: the baseline was run on a different machine',
+              file=sys.stderr)
+
+    rows = compare(results, baseline['results'], args.threshold)
+    print_table(rows)
+    print(f'Results written into {output}')
+
+    # A failing exit code lets CI catch the regressions
+    return int(any(row['status'] == 'regression' for row in rows))
@@ -0,0 +1,217 @@
+"""
+Benchmarks of the logging hot paths run by `python -m benchmarks`.
+
+Each benchmark is a context manager which prepares the data for one
+parameter, yields the function to measure and cleans up afterwards. The
+data is synthetic and seeded, and nothing needs a GPU or the network.
+"""
+import atexit
+import itertools
+import json
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import Callable, Iterator, List
+
+import numpy as np
+
+from benchmarks.synthetic import make_history, make_model_config, \
+                                 make_project_files
+
+class Benchmark():
+    """
+    Benchmark registered in the suite.
+
+    Parameters
+    ----------
+    name : str
+        Benchmark name, such as 'metrics_config.epochs_layout'.
+    setup : Callable
+        Context manager which receives a parameter and yields the function
+        to measure.
+    params : List
+        Parameters of the full run.
+    quick_params : List
+        Parameters of the quick run.
+    repeat : int
+        Number of measurements.
+    number : int
+        Number of calls per measurement.
+    """
+    def __init__(self, name: str, setup: Callable, params: List,
+                 quick_params: List, repeat: int, number: int) -> None:
+        self.name = name
+        self.setup = setup
+        self.params = params
+        self.quick_params = quick_params
+        self.repeat = repeat
+        self.number = number
+
+    def get_params(self, quick: bool = False) -> List:
+        return self.quick_params if quick else self.params
+
+# Benchmarks of the suite, in the order they run
+BENCHMARKS = []
+
+def benchmark(name: str, params: List, quick_params: List = None,
+              repeat: int = 5, number: int = 1) -> Callable:
+    """
+    Registers a benchmark in the suite.
+
+    Parameters
+    ----------
+    name : str
+        Benchmark name.
+    params : List
+        Parameters of the full run.
+    quick_params : List
+        Parameters of the quick run. Default is None, which uses the same
+        parameters.
+    repeat : int
+        Number of measurements. Default is 5.
+    number : int
+        Number of calls per measurement. Default is 1.
+
+    Returns
+    -------
+    decorator : Callable
+        Decorator of the setup generator.
+    """
+    def decorator(setup: Callable) -> Callable:
+        setup = contextmanager(setup)
+        BENCHMARKS.append(Benchmark(name, setup, params,
+                                    quick_params or params, repeat, number))
+        return setup
+
+    return decorator
+
+# Projects shared by the benchmarks reading them, removed at exit
+_PROJECTS = {}
+_FOLDER = None
+
+def get_project(experiments: int):
+    global _FOLDER
+
+    if experiments not in _PROJECTS:
+        if _FOLDER is None:
+            _FOLDER = tempfile.mkdtemp()
+            atexit.register(shutil.rmtree, _FOLDER, True)
+
+        _PROJECTS[experiments] = make_project_files(
+                        _FOLDER, f'project_{experiments}', experiments)
+
+    return _PROJECTS[experiments]
+
+@benchmark('metrics_config.epochs_layout', [100, 1000, 10000, 100000],
+           [100, 1000, 10000])
+def metrics_config_epochs(epochs: int) -> Iterator[Callable]:
+    from deeplearning_logger.keras.configs import MetricsConfig
+
+    history = make_history(epochs, metrics=8)
+    yield lambda: MetricsConfig(history)
+
+@benchmark('metrics_config.columns_layout', [100, 1000, 10000, 100000],
+           [100, 1000, 10000])
+def metrics_config_columns(epochs: int) -> Iterator[Callable]:
+    from deeplearning_logger.keras.configs import MetricsConfig
+
+    history = make_history(epochs, metrics=8)
+    yield lambda: MetricsConfig(history, layout='columns')
+
+def make_numpy_payload(values: int) -> dict:
+    rng = np.random.default_rng(0)
+
+    return {
+        'arrays': {f'array_{idx}': rng.random(values // 10)
+                   for idx in range(10)},
+        'scalars': {f'scalar_{idx}': np.float32(value)
+                    for idx, value in enumerate(rng.random(values // 10))},
+        'integers': [np.int64(value) for value in range(values // 10)],
+        'model_config': make_model_config()
+    }
+
+@benchmark('json.configs_encoder', [1000, 100000], [1000, 10000])
+def json_configs_encoder(values: int) -> Iterator[Callable]:
+    from deeplearning_logger.json import ConfigsJSONEncoder
+
+    payload = make_numpy_payload(values)
+    yield lambda: json.dumps(payload, cls=ConfigsJSONEncoder)
+
+@benchmark('json.serializer', [1000, 100000], [1000, 10000])
+def json_serializer(values: int) -> Iterator[Callable]:
+    from deeplearning_logger.json import JSONSerializer
+
+    serializer = JSONSerializer()
+    payload = make_numpy_payload(values)
+    yield lambda: serializer.dumps(payload)
+
+@benchmark('experiment.register_experiment', [100, 10000], [100, 1000])
+def register_experiment(epochs: int) -> Iterator[Callable]:
+    from deeplearning_logger.keras.configs import MetricsConfig
+    from deeplearning_logger.keras.project import Project
+
+    folder = tempfile.mkdtemp()
+    project = Project(project_name='bench', project_path=folder)
+    history = make_history(epochs, metrics=8)
+
+    try:
+        # Creates the configs and writes the experiment, end to end
+        yield lambda: project.create_experiment(
+                            'experiment', configs=[MetricsConfig(history)])
+    finally:
+        shutil.rmtree(folder)
+
+@benchmark('pytorch.save', [100, 10000], [100, 1000], number=20)
+def pytorch_save(epochs: int) -> Iterator[Callable]:
+    from deeplearning_logger.pytorch.experiment_data import MetricsData
+    from deeplearning_logger.pytorch.pytorch_logger import ExperimentData, \
+                                                            PytorchLogger
+
+    folder = tempfile.mkdtemp()
+    logger = PytorchLogger(project_folder=folder + '/')
+    rng = np.random.default_rng(0)
+    metrics = MetricsData(
+        train_losses=rng.random(epochs).tolist(),
+        val_losses=rng.random(epochs).tolist(),
+        val_metrics=[{'accuracy': value} for value in rng.random(epochs)])
+    data = ExperimentData(metrics=metrics)
+    # Every save needs a new experiment name
+    names = (f'experiment_{idx}' for idx in itertools.count())
+
+    try:
+        yield lambda: logger.save(data, next(names))
+    finally:
+        shutil.rmtree(folder)
+
+@benchmark('project.list_experiments', [10, 1000, 10000, 100000],
+           [10, 1000])
+def list_experiments(experiments: int) -> Iterator[Callable]:
+    project = get_project(experiments)
+    yield project.list_experiments
+
+@benchmark('project.open_experiment', [10, 1000, 10000, 100000], [10, 1000],
+           number=10)
+def open_experiment(experiments: int) -> Iterator[Callable]:
+    project = get_project(experiments)
+    name = f'experiment_{experiments // 2}'
+    yield lambda: project.open_experiment(name, lazy=False)
+
+@benchmark('sweep.log_trials', [1000, 10000], [1000])
+def sweep_log_trials(trials: int) -> Iterator[Callable]:
+    from deeplearning_logger.keras.project import Project
+
+    folder = tempfile.mkdtemp()
+    project = Project(project_name='bench', project_path=folder)
+    values = np.random.default_rng(0).random(trials).tolist()
+    # Every run needs a new sweep name
+    names = (f'sweep_{idx}' for idx in itertools.count())
+
+    def log_trials():
+        with project.create_sweep(next(names), params={'lr': 0.1}) as sweep:
+            for value in values:
+                sweep.log_trial({'lr': value}, {'val_loss': value})
+
+    try:
+        yield log_trials
+    finally:
+        shutil.rmtree(folder)
@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+
+def make_history(epochs: int, metrics: int = 4, seed: int = 0) -> pd.DataFrame:
+    """
+    Creates a synthetic training history, like `pd.DataFrame(history.history)`.
+
+    Parameters
+    ----------
+    epochs : int
+        Number of rows of the history.
+    metrics : int
+        Number of metric columns. Default is 4.
+    seed : int
+        Random seed. Default is 0.
+
+    Returns
+    -------
+    history : pd.DataFrame
+        DataFrame with one row per epoch and one column per metric.
+    """
+    rng = np.random.default_rng(seed)
+    values = rng.random((epochs, metrics))
+    columns = [f'metric_{idx}' for idx in range(metrics)]
+
+    return pd.DataFrame(values, columns=columns)
+
+def make_project(project_path: str, project_name: str, experiments: int,
+                 epochs: int = 100, metrics: int = 4, **project_options):
+    """
+    Creates a synthetic project whose experiments only contain metrics.
+
+    Parameters
+    ----------
+    project_path : str
+        Path where to create the project.
+    project_name : str
+        Project name.
+    experiments : int
+        Number of experiments.
+    epochs : int
+        Number of epochs of each experiment. Default is 100.
+    metrics : int
+        Number of metrics of each experiment. Default is 4.
+    project_options
+        Extra keyword arguments passed to the Project.
+
+    Returns
+    -------
+    project : Project
+        Project containing the experiments, named 'experiment_N'.
+    """
+    from deeplearning_logger.keras.configs import MetricsConfig
+    from deeplearning_logger.keras.project import Project
+
+    project = Project(project_name=project_name, project_path=project_path,
+                      **project_options)
+
+    for idx in range(experiments):
+        history = make_history(epochs, metrics, seed=idx)
+        project.create_experiment(f'experiment_{idx}',
+                                  configs=[MetricsConfig(history)],
+                                  description=f'Synthetic experiment {idx}')
+
+    return project
+
+def make_model_config(layers: int = 50) -> dict:
+    """
+    Creates a synthetic Keras-like model config.
+
+    Parameters
+    ----------
+    layers : int
+        Number of layers of the model. Default is 50.
+
+    Returns
+    -------
+    config : dict
+        Nested dictionary resembling `model.get_config()`.
+    """
+    return {
+        'name': 'sequential',
+        'layers': [{
+            'class_name': 'Dense',
+            'config': {
+                'name': f'dense_{idx}',
+                'trainable': True,
+                'dtype': 'float32',
+                'units': 64,
+                'activation': 'relu',
+                'use_bias': True,
+                'kernel_initializer': {'class_name': 'GlorotUniform',
+                                       'config': {'seed': None}},
+                'bias_initializer': {'class_name': 'Zeros', 'config': {}},
+                'kernel_regularizer': None,
+                'bias_regularizer': None
+            }
+        } for idx in range(layers)]
+    }
+
+def make_project_files(project_path: str, project_name: str, experiments: int,
+                       epochs: int = 10, metrics: int = 4):
+    """
+    Creates a synthetic project by writing the files of its experiments
+    directly, which is much faster than `make_project` for projects with
+    thousands of experiments.
+
+    Parameters
+    ----------
+    project_path : str
+        Path where to create the project.
+    project_name : str
+        Project name.
+    experiments : int
+        Number of experiments.
+    epochs : int
+        Number of epochs of each experiment. Default is 10.
+    metrics : int
+        Number of metrics of each experiment. Default is 4.
+
+    Returns
+    -------
+    project : Project
+        Project containing the experiments, named 'experiment_N'.
+    """
+    import os
+    from deeplearning_logger.json import JSONSerializer
+    from deeplearning_logger.keras.configs import MetricsConfig
+    from deeplearning_logger.keras.project import Project
+
+    project = Project(project_name=project_name, project_path=project_path)
+    project_folder = os.path.join(project_path, project_name)
+    serializer = JSONSerializer()
+    # Every experiment stores the same metrics
+    data = serializer.dumps({
+        'metrics': MetricsConfig(make_history(epochs, metrics)).config[1]})
+
+    for idx in range(experiments):
+        folder = os.path.join(project_folder, f'experiment_{idx}')
+        os.mkdir(folder)
+
+        with open(os.path.join(folder, 'experiment_config.json'), 'wb') as file:
+            file.write(serializer.dumps({
+                'name': f'experiment_{idx}',
+                'description': f'Synthetic experiment {idx}',
+                'datetime': '2021-01-01T00:00:00'}))
+
+        with open(os.path.join(folder, 'experiment_data.json'), 'wb') as file:
+            file.write(data)
+
+    return project
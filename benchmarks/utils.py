@@ -0,0 +1,59 @@
+import time
+from typing import Callable, Dict, List
+
+def measure(function: Callable, repeat: int = 5, number: int = 1) -> float:
+    """
+    Measures the best wall time of a function.
+
+    Parameters
+    ----------
+    function : Callable
+        Function to measure, called without arguments.
+    repeat : int
+        Number of measurements. Default is 5.
+    number : int
+        Number of calls per measurement. Default is 1.
+
+    Returns
+    -------
+    seconds : float
+        Best time per call, in seconds.
+    """
+    best = float('inf')
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = (time.perf_counter() - start) / number
+        best = min(best, elapsed)
+
+    return best
+
+def print_table(rows: List[Dict]) -> None:
+    """
+    Prints the benchmark results as a table.
+
+    Parameters
+    ----------
+    rows : List[Dict]
+        Results, all of them with the same keys.
+    """
+    if not rows:
+        return
+
+    headers = list(rows[0].keys())
+    cells = [[_format(row[header]) for header in headers] for row in rows]
+    widths = [max(len(header), *(len(row[idx]) for row in cells))
+              for idx, header in enumerate(headers)]
+
+    print('  '.join(header.rjust(width)
+                    for header, width in zip(headers, widths)))
+    for row in cells:
+        print('  '.join(cell.rjust(width) for cell, width in zip(row, widths)))
+
+def _format(value) -> str:
+    if isinstance(value, float):
+        return f'{value:.6f}'
+
+    return str(value)
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import weakref
+from typing import Any, Callable, Hashable, Tuple
+from deeplearning_logger.files import get_temp_path
+from deeplearning_logger.json import ConfigsJSONEncoder, JSONSerializer
+from deeplearning_logger.profiling import track_file
+
+def fingerprint(architecture: Any) -> str:
+    """
+    Computes the content hash of an architecture.
+
+    The hash is computed over the canonical JSON representation, with sorted
+    keys and no whitespace, so equal configs have the same hash whatever the
+    order of their keys or the JSON backend installed.
+
+    Parameters
+    ----------
+    architecture : Any
+        JSON serializable architecture, such as a model config.
+
+    Returns
+    -------
+    digest : str
+        Hexadecimal SHA-256 digest.
+    """
+    canonical = json.dumps(architecture, sort_keys=True,
+                           separators=(',', ':'), cls=ConfigsJSONEncoder)
+
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+class ArchitectureCache():
+    """
+    Cache of the architecture and hash of each model object, so capturing
+    the same model again doesn't serialize and hash it again.
+
+    The entries are removed when the model is garbage collected. A version
+    key, computed cheaply from the model, invalidates the entry when the
+    model changes.
+
+    Attributes
+    ----------
+    _entries : weakref.WeakKeyDictionary
+        Version key, architecture and hash of each model.
+    """
+    def __init__(self) -> None:
+        self._entries = weakref.WeakKeyDictionary()
+
+    def get(self, model: Any, build: Callable[[Any], Any],
+            version: Hashable = None) -> Tuple[str, Any]:
+        """
+        Gets the hash and architecture of a model, building them only if
+        they are not cached.
+
+        Parameters
+        ----------
+        model : Any
+            Model object.
+        build : Callable
+            Function which returns the architecture of the model.
+        version : Hashable
+            Key which changes when the model architecture changes. Default
+            is None.
+
+        Returns
+        -------
+        digest : str
+            Content hash of the architecture.
+        architecture : Any
+            Architecture of the model.
+        """
+        try:
+            entry = self._entries.get(model)
+        except TypeError: # Objects without weak references aren't cached
+            architecture = build(model)
+            return fingerprint(architecture), architecture
+
+        if entry is not None and entry[0] == version:
+            return entry[1], entry[2]
+
+        architecture = build(model)
+        digest = fingerprint(architecture)
+        self._entries[model] = (version, digest, architecture)
+
+        return digest, architecture
+
+    def clear(self) -> None:
+        """
+        Removes every cached architecture.
+        """
+        self._entries = weakref.WeakKeyDictionary()
+
+class ArchitectureStore():
+    """
+    Project-level store of architectures addressed by their content hash.
+
+    Each distinct architecture is written once, into '<hash>.json', and the
+    experiments only keep the hash.
+
+    Parameters
+    ----------
+    folder : str
+        Folder where the architectures are stored.
+
+    Attributes
+    ----------
+    _folder : str
+        Folder where the architectures are stored.
+    _serializer : JSONSerializer
+        Serializer of the architecture files.
+    _stored : set
+        Hashes known to be stored, to avoid checking the file system.
+    """
+    def __init__(self, folder: str) -> None:
+        self._folder = folder
+        self._serializer = JSONSerializer(compact=True)
+        self._stored = set()
+
+    def put(self, architecture: Any, digest: str = None) -> str:
+        """
+        Stores an architecture if it is not already stored.
+
+        Parameters
+        ----------
+        architecture : Any
+            JSON serializable architecture.
+        digest : str
+            Content hash of the architecture, if it is already known.
+            Default is None.
+
+        Returns
+        -------
+        digest : str
+            Content hash of the architecture.
+        """
+        if digest is None:
+            digest = fingerprint(architecture)
+
+        if digest in self._stored:
+            return digest
+
+        path = self._get_path(digest)
+
+        if not os.path.isfile(path):
+            os.makedirs(self._folder, exist_ok=True)
+
+            # Writes to a temporary file so a partial file is never visible
+            temp_path = get_temp_path(path)
+            with open(temp_path, 'wb') as file:
+                self._serializer.dump(architecture, track_file(file))
+            os.replace(temp_path, path)
+
+        self._stored.add(digest)
+
+        return digest
+
+    def get(self, digest: str) -> Any:
+        """
+        Loads a stored architecture.
+
+        Parameters
+        ----------
+        digest : str
+            Content hash of the architecture.
+
+        Returns
+        -------
+        architecture : Any
+            Stored architecture.
+        """
+        with open(self._get_path(digest), 'rb') as file:
+            return self._serializer.load(file)
+
+    def _get_path(self, digest: str) -> str:
+        return os.path.join(self._folder, f'{digest}.json')
@@ -0,0 +1,260 @@
+import functools
+import hashlib
+import os
+import re
+import numpy as np
+from typing import IO, Any, Callable, Dict
+from deeplearning_logger.files import get_temp_path
+from deeplearning_logger.json import JSONSerializer
+from deeplearning_logger.profiling import track_file
+
+# Key of the JSON object that replaces an array stored in a sidecar file
+_REFERENCE_KEY = '__ndarray__'
+# Characters of the keys which are not used in the sidecar filenames
+_UNSAFE_CHARACTERS = re.compile(r'[^A-Za-z0-9_.-]')
+
+class ArrayStore():
+    """
+    Stores large numeric series as sidecar .npy files.
+
+    The JSON files keep a small reference object, {"__ndarray__": path}, in
+    place of each stored series, and the series are memory-mapped back when
+    the JSON file is loaded.
+
+    Parameters
+    ----------
+    root : str
+        Folder containing the JSON file. References are relative to it.
+    threshold : int
+        Minimum number of elements of a series to be stored in a sidecar
+        file. Default is 10000.
+    directory : str
+        Folder, relative to root, where the sidecar files are stored.
+        Default is 'arrays'.
+    mmap : bool
+        Whether to memory-map the sidecar files when loading them. Default is
+        True.
+
+    Attributes
+    ----------
+    _root : str
+        Folder containing the JSON file.
+    _threshold : int
+        Minimum number of elements of a stored series.
+    _directory : str
+        Folder, relative to root, where the sidecar files are stored.
+    _mmap : bool
+        Whether to memory-map the sidecar files when loading them.
+    """
+    def __init__(self, root: str, threshold: int = 10000,
+                 directory: str = 'arrays', mmap: bool = True) -> None:
+        self._root = root
+        self._threshold = threshold
+        self._directory = directory
+        self._mmap = mmap
+
+    def externalize(self, data: Any, key: str = '',
+                    files: Dict[str, Callable[[IO], int]] = None) -> Any:
+        """
+        Replaces the large numeric series of a JSON serializable structure
+        with references to sidecar files, writing those files.
+
+        Parameters
+        ----------
+        data : Any
+            Structure of dicts and lists to store.
+        key : str
+            Path of the structure inside the JSON file, used to name the
+            sidecar files. Default is an empty string.
+        files : Dict[str, Callable]
+            If given, the sidecar files are not written but added to it, by
+            path relative to root, as functions which stream them into the
+            opened file. They can then be committed with `commit_files`
+            together with the JSON file. Default is None, which writes them
+            right away.
+
+        Returns
+        -------
+        data : Any
+            Copy of the structure where the large series are references.
+            Smaller values are returned unchanged.
+        """
+        if isinstance(data, np.ndarray):
+            if data.size >= self._threshold and data.dtype.kind in 'fiu':
+                return self._save(data, key, files)
+        elif isinstance(data, dict):
+            return {name: self.externalize(value, self._join(key, name),
+                                           files)
+                    for name, value in data.items()}
+        elif isinstance(data, (list, tuple)):
+            if len(data) >= self._threshold:
+                array = np.array(data)
+
+                if array.dtype.kind in 'fiu':
+                    return self._save(array, key, files)
+
+            return [self.externalize(value, self._join(key, idx), files)
+                    for idx, value in enumerate(data)]
+
+        return data
+
+    def object_hook(self, obj: Dict) -> Any:
+        """
+        JSON object hook which loads the referenced sidecar files.
+
+        Parameters
+        ----------
+        obj : Dict
+            Decoded JSON object.
+
+        Returns
+        -------
+        obj : Any
+            The stored array if the object is a reference, else the object.
+        """
+        if len(obj) == 1 and _REFERENCE_KEY in obj:
+            path = os.path.join(self._root, obj[_REFERENCE_KEY])
+
+            return np.load(path, mmap_mode='r' if self._mmap else None)
+
+        return obj
+
+    def internalize(self, data: Any) -> Any:
+        """
+        Loads the sidecar files referenced by an already decoded structure.
+        It does the same as `object_hook` for structures decoded without it.
+
+        Parameters
+        ----------
+        data : Any
+            Decoded structure of dicts and lists.
+
+        Returns
+        -------
+        data : Any
+            Structure where the references are replaced by the arrays.
+        """
+        if isinstance(data, dict):
+            data = {name: self.internalize(value)
+                    for name, value in data.items()}
+
+            return self.object_hook(data)
+        elif isinstance(data, list):
+            return [self.internalize(value) for value in data]
+
+        return data
+
+    def decode(self, content: bytes, serializer: JSONSerializer) -> Any:
+        """
+        Decodes a JSON document, loading the referenced sidecar files.
+
+        Parameters
+        ----------
+        content : bytes
+            JSON document.
+        serializer : JSONSerializer
+            Serializer used to decode the document.
+
+        Returns
+        -------
+        data : Any
+            Decoded structure where the references are replaced by the arrays.
+        """
+        data = serializer.loads(content)
+
+        # Only walk the data when it references sidecar files
+        if has_references(content):
+            data = self.internalize(data)
+
+        return data
+
+    def _save(self, array: np.ndarray, key: str,
+              files: Dict[str, Callable[[IO], int]] = None) -> Dict:
+        """
+        Writes an array into its sidecar file.
+
+        Parameters
+        ----------
+        array : np.ndarray
+            Array to store.
+        key : str
+            Path of the array inside the JSON file.
+        files : Dict[str, Callable]
+            If given, the sidecar file is added to it instead of being
+            written. Default is None.
+
+        Returns
+        -------
+        reference : Dict
+            Reference to the sidecar file.
+        """
+        key = key or 'array'
+        filename = _UNSAFE_CHARACTERS.sub('_', key)
+
+        # Keys changed to be valid filenames, such as 'val/loss' and
+        # 'val_loss', are told apart by a hash of the key
+        if filename != key:
+            digest = hashlib.sha256(key.encode('utf-8')).hexdigest()[:8]
+            filename = f'{filename}-{digest}'
+
+        filename += '.npy'
+        reference = os.path.join(self._directory, filename)
+        path = os.path.abspath(os.path.join(self._root, reference))
+
+        # An array mapped from its own file is already stored. Writing it
+        # again would truncate the file while it is mapped.
+        if not (isinstance(array, np.memmap) and array.filename == path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            array = np.ascontiguousarray(array)
+
+            if files is not None:
+                files[reference] = functools.partial(_write_array, array)
+                return {_REFERENCE_KEY: reference}
+
+            # Readers keep mapping the previous file until it is replaced
+            temp_path = get_temp_path(path)
+            with open(temp_path, 'wb') as file:
+                _write_array(array, track_file(file))
+            os.replace(temp_path, path)
+
+        return {_REFERENCE_KEY: reference}
+
+    def _join(self, key: str, name: Any) -> str:
+        return f'{key}.{name}' if key else str(name)
+
+def _write_array(array: np.ndarray, file: IO) -> int:
+    np.save(file, array)
+
+    return file.tell()
+
+def has_references(content: bytes) -> bool:
+    """
+    Checks whether a JSON document references sidecar files.
+
+    Parameters
+    ----------
+    content : bytes
+        JSON document.
+
+    Returns
+    -------
+    has_references : bool
+        True if the document contains any sidecar file reference.
+    """
+    return f'"{_REFERENCE_KEY}"'.encode() in content
+
+def is_reference(obj: Any) -> bool:
+    """
+    Checks whether a decoded value is a reference to a sidecar file.
+
+    Parameters
+    ----------
+    obj : Any
+        Decoded JSON value.
+
+    Returns
+    -------
+    is_reference : bool
+        True if the value is a sidecar file reference.
+    """
+    return isinstance(obj, dict) and len(obj) == 1 and _REFERENCE_KEY in obj
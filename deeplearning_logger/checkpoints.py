@@ -0,0 +1,456 @@
+from __future__ import annotations
+import hashlib
+import os
+import shutil
+import time
+from typing import Dict, List, Tuple
+from deeplearning_logger.files import FileLock, check_fsync_policy, \
+                                      get_temp_path
+from deeplearning_logger.json import JSONSerializer
+from deeplearning_logger.profiling import timed_fsync, track_file
+
+# Registry file of the checkpoints of a Keras experiment, in its folder
+CHECKPOINTS_FILE = 'checkpoints.jsonl'
+
+_CHUNK_SIZE = 1 << 20
+_DEDUP_MODES = ('copy', 'link')
+_MODES = ('min', 'max')
+_SERIALIZER = JSONSerializer(compact=True)
+
+def check_dedup_mode(dedup: str) -> None:
+    """
+    Checks a checkpoint deduplication mode is valid.
+
+    Parameters
+    ----------
+    dedup : str
+        'copy' keeps a copy of each distinct checkpoint in the blob store,
+        so the registered content survives the checkpoint file being
+        overwritten. 'link' hard-links the checkpoint files to the blob
+        store and replaces the duplicated files by links, which takes no
+        extra space but requires the checkpoint files to be written once.
+        None only hashes the files.
+    """
+    if dedup is not None and dedup not in _DEDUP_MODES:
+        raise ValueError(f'The checkpoint deduplication must be one of '
+                         f'{_DEDUP_MODES} or None')
+
+def hash_file(path: str, chunk_size: int = _CHUNK_SIZE) -> Tuple[str, int]:
+    """
+    Computes the content hash of a file, reading it in chunks so large
+    checkpoints are never loaded in memory.
+
+    Parameters
+    ----------
+    path : str
+        File path.
+    chunk_size : int
+        Number of bytes read at a time. Default is 1 MiB.
+
+    Returns
+    -------
+    digest : str
+        Hexadecimal SHA-256 digest.
+    size : int
+        File size in bytes.
+    """
+    digest = hashlib.sha256()
+    size = 0
+
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+            size += len(chunk)
+
+    return digest.hexdigest(), size
+
+class BlobStore():
+    """
+    Project-level store of checkpoint files addressed by their content hash.
+
+    Each distinct content is stored once, into a file named by its hash, so
+    the experiments which saved the same weights share it.
+
+    Parameters
+    ----------
+    folder : str
+        Folder where the blobs are stored.
+    dedup : str
+        'copy' or 'link', see `check_dedup_mode`. Default is 'copy'.
+
+    Attributes
+    ----------
+    _folder : str
+        Folder where the blobs are stored.
+    _dedup : str
+        Deduplication mode.
+    """
+    def __init__(self, folder: str, dedup: str = 'copy') -> None:
+        check_dedup_mode(dedup)
+
+        if dedup is None:
+            raise ValueError('The blob store needs a deduplication mode')
+
+        self._folder = folder
+        self._dedup = dedup
+
+    def put(self, path: str) -> Tuple[str, int]:
+        """
+        Stores the content of a file if it is not already stored.
+
+        With the 'copy' mode the file is hashed and copied in the same pass,
+        so it is read only once. With the 'link' mode a file whose content
+        is already stored is replaced by a link to the blob.
+
+        Parameters
+        ----------
+        path : str
+            File path.
+
+        Returns
+        -------
+        digest : str
+            Content hash of the file.
+        size : int
+            File size in bytes.
+        """
+        os.makedirs(self._folder, exist_ok=True)
+
+        if self._dedup == 'copy':
+            return self._copy(path)
+
+        digest, size = hash_file(path)
+        blob_path = self.get_path(digest)
+
+        if not os.path.isfile(blob_path):
+            self._publish(path, blob_path)
+        elif not os.path.samefile(path, blob_path):
+            # The duplicated file becomes another name of the blob
+            temp_path = _get_temp_path(path)
+
+            try:
+                os.link(blob_path, temp_path)
+            except OSError: # Other device, or links not supported
+                return digest, size
+            os.replace(temp_path, path)
+
+        return digest, size
+
+    def has(self, digest: str) -> bool:
+        """
+        Checks whether a content is stored.
+
+        Parameters
+        ----------
+        digest : str
+            Content hash.
+
+        Returns
+        -------
+        stored : bool
+            True if the blob exists.
+        """
+        return os.path.isfile(self.get_path(digest))
+
+    def get_path(self, digest: str) -> str:
+        """
+        Gets the path of a blob.
+
+        Parameters
+        ----------
+        digest : str
+            Content hash.
+
+        Returns
+        -------
+        path : str
+            Blob path.
+        """
+        return os.path.join(self._folder, digest)
+
+    def _copy(self, path: str) -> Tuple[str, int]:
+        digest = hashlib.sha256()
+        size = 0
+        # The hash is only known once copied. The name is not hidden, so the
+        # copies of dead processes match the recovery patterns
+        temp_path = _get_temp_path(os.path.join(self._folder, 'copy'))
+
+        try:
+            with open(path, 'rb') as source, open(temp_path, 'wb') as target:
+                target = track_file(target)
+
+                for chunk in iter(lambda: source.read(_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    size += len(chunk)
+                    target.write(chunk)
+
+            digest = digest.hexdigest()
+
+            # The copy of a content already stored is discarded
+            if os.path.isfile(self.get_path(digest)):
+                os.remove(temp_path)
+            else:
+                os.replace(temp_path, self.get_path(digest))
+        except BaseException:
+            if os.path.isfile(temp_path):
+                os.remove(temp_path)
+            raise
+
+        return digest, size
+
+    def _publish(self, path: str, blob_path: str) -> None:
+        temp_path = _get_temp_path(blob_path)
+
+        try:
+            os.link(path, temp_path)
+        except OSError: # Other device, or links not supported
+            shutil.copyfile(path, temp_path)
+
+        # Readers never see a partial blob
+        os.replace(temp_path, blob_path)
+
+class CheckpointRegistry():
+    """
+    Registry of the checkpoints saved by an experiment: path, epoch, size,
+    content hash and metrics of each one.
+
+    The entries are appended to a JSON lines file, so registering a
+    checkpoint costs the size of its entry. The best checkpoint of each
+    metric is kept up to date while the entries are added, so it is found
+    without scanning the registry.
+
+    Parameters
+    ----------
+    path : str
+        Registry file path.
+    monitor : str
+        Metric used by `best` when no metric is given, such as 'val_loss'.
+        Default is 'val_loss'.
+    mode : str
+        'min' if lower values of the monitored metric are better, 'max' if
+        higher values are better. Default is 'min'.
+    blob_store : BlobStore
+        Store of the checkpoint contents. Default is None, which only hashes
+        the files.
+    fsync : str
+        fsync policy of the registry file, 'always' or 'never'. Default is
+        'never'.
+
+    Attributes
+    ----------
+    path : str
+        Registry file path.
+    monitor : str
+        Metric used by `best` when no metric is given.
+    mode : str
+        Whether lower or higher values of the monitored metric are better.
+    _blob_store : BlobStore
+        Store of the checkpoint contents, or None.
+    _fsync : str
+        fsync policy of the registry file.
+    _entries : List[Dict]
+        Registered checkpoints, in the order they were added.
+    _best : Dict[str, Dict[str, Dict]]
+        Entry with the lowest and the highest value of each metric.
+    _by_hash : Dict[str, List[Dict]]
+        Entries of each content hash.
+    """
+    def __init__(self, path: str, monitor: str = 'val_loss',
+                 mode: str = 'min', blob_store: BlobStore = None,
+                 fsync: str = 'never') -> None:
+        _check_mode(mode)
+        check_fsync_policy(fsync)
+
+        self.path = path
+        self.monitor = monitor
+        self.mode = mode
+        self._blob_store = blob_store
+        self._fsync = fsync
+        self.refresh()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def entries(self) -> List[Dict]:
+        return list(self._entries)
+
+    def add(self, path: str, epoch: int, metrics: Dict = None) -> Dict:
+        """
+        Registers a checkpoint file. The file is hashed in chunks and, if
+        the registry has a blob store, deduplicated into it.
+
+        Parameters
+        ----------
+        path : str
+            Checkpoint file path.
+        epoch : int
+            Epoch when the checkpoint was saved.
+        metrics : Dict
+            Metrics of the checkpoint, such as the Keras epoch logs. Default
+            is None.
+
+        Returns
+        -------
+        entry : Dict
+            Registered entry.
+        """
+        if not os.path.isfile(path):
+            raise ValueError(f'The checkpoint {path} does not exist')
+
+        if self._blob_store is None:
+            digest, size = hash_file(path)
+        else:
+            digest, size = self._blob_store.put(path)
+
+        entry = {
+            'path': os.path.abspath(path),
+            'epoch': int(epoch),
+            'size': size,
+            'hash': digest,
+            'metrics': {name: float(value)
+                        for name, value in (metrics or {}).items()},
+            'stored': self._blob_store is not None,
+            'time': time.time()
+        }
+        line = _SERIALIZER.dumps(entry) + b'\n'
+
+        # Other processes may be registering checkpoints of the experiment
+        with FileLock(os.path.dirname(os.path.abspath(self.path))):
+            with open(self.path, 'a+b') as file:
+                # A line truncated by a killed process is terminated, so it
+                # doesn't corrupt the new one
+                if file.seek(0, os.SEEK_END):
+                    file.seek(-1, os.SEEK_END)
+                    if file.read(1) != b'\n':
+                        line = b'\n' + line
+
+                file = track_file(file)
+                file.write(line)
+
+                if self._fsync == 'always':
+                    file.flush()
+                    timed_fsync(file.fileno())
+
+        self._add_entry(entry)
+
+        return entry
+
+    def best(self, metric: str = None, mode: str = None) -> Dict:
+        """
+        Gets the best checkpoint by a metric, in constant time.
+
+        Parameters
+        ----------
+        metric : str
+            Metric name. Default is None, which uses the monitored metric.
+        mode : str
+            'min' or 'max'. Default is None, which uses the registry mode.
+
+        Returns
+        -------
+        entry : Dict
+            Entry of the best checkpoint, None if no checkpoint has the
+            metric.
+        """
+        mode = mode or self.mode
+        _check_mode(mode)
+
+        return self._best.get(metric or self.monitor, {}).get(mode)
+
+    def latest(self) -> Dict:
+        """
+        Gets the last registered checkpoint.
+
+        Returns
+        -------
+        entry : Dict
+            Last entry, None if the registry is empty.
+        """
+        return self._entries[-1] if self._entries else None
+
+    def duplicates(self, digest: str) -> List[Dict]:
+        """
+        Gets the checkpoints with the same content.
+
+        Parameters
+        ----------
+        digest : str
+            Content hash.
+
+        Returns
+        -------
+        entries : List[Dict]
+            Entries with the content, in the order they were added.
+        """
+        return list(self._by_hash.get(digest, []))
+
+    def get_file(self, entry: Dict) -> str:
+        """
+        Gets the file with the content of a checkpoint, which is its blob if
+        it is stored, since the checkpoint path may have been overwritten.
+
+        Parameters
+        ----------
+        entry : Dict
+            Registered entry.
+
+        Returns
+        -------
+        path : str
+            Path of the checkpoint content.
+        """
+        if entry['stored'] and self._blob_store is not None and \
+                self._blob_store.has(entry['hash']):
+            return self._blob_store.get_path(entry['hash'])
+
+        return entry['path']
+
+    def refresh(self) -> None:
+        """
+        Reloads the registry file, such as after another process registered
+        checkpoints.
+        """
+        self._entries = []
+        self._best = {}
+        self._by_hash = {}
+
+        try:
+            with open(self.path, 'rb') as file:
+                content = file.read()
+        except FileNotFoundError:
+            return
+
+        for line in content.splitlines():
+            # Lines truncated by a killed process are skipped
+            try:
+                entry = _SERIALIZER.loads(line)
+            except ValueError:
+                continue
+
+            self._add_entry(entry)
+
+    def _add_entry(self, entry: Dict) -> None:
+        self._entries.append(entry)
+        self._by_hash.setdefault(entry['hash'], []).append(entry)
+
+        for name, value in entry['metrics'].items():
+            # NaN is never the best value, and it is reloaded as None from
+            # the JSON backends which write it as null
+            if value is None or value != value:
+                continue
+
+            best = self._best.setdefault(name, {})
+
+            if 'min' not in best or value < best['min']['metrics'][name]:
+                best['min'] = entry
+            if 'max' not in best or value > best['max']['metrics'][name]:
+                best['max'] = entry
+
+def _get_temp_path(path: str) -> str:
+    # The random token keeps the threads of a process apart
+    return get_temp_path(f'{path}.{os.urandom(4).hex()}')
+
+def _check_mode(mode: str) -> None:
+    if mode not in _MODES:
+        raise ValueError(f'The mode must be one of {_MODES}')
@@ -0,0 +1,265 @@
+import numpy as np
+from typing import Dict, List
+from deeplearning_logger.imports import lazy_import, lazy_type
+
+DataFrame = lazy_type('pandas', 'DataFrame')
+
+class MetricComparison():
+    """
+    Values of a metric in several experiments, aligned by epoch.
+
+    The series are stored in a 2-D array with a row per experiment and a
+    column per epoch. Shorter series are padded with NaN, so every reduction
+    runs over the whole array at once.
+
+    Parameters
+    ----------
+    metric : str
+        Name of the compared metric.
+    experiments : List[str]
+        Names of the experiments, one per row.
+    series : List[np.ndarray]
+        Values of the metric in each experiment. An empty series means the
+        experiment doesn't have the metric.
+
+    Attributes
+    ----------
+    metric : str
+        Name of the compared metric.
+    experiments : List[str]
+        Names of the experiments, one per row.
+    values : np.ndarray
+        Aligned values, with shape (experiments, epochs).
+    lengths : np.ndarray
+        Number of epochs of each experiment.
+    """
+    _MODES = ('min', 'max')
+    _REDUCTIONS = ('best', 'final', 'auc')
+
+    def __init__(self, metric: str, experiments: List[str],
+                 series: List[np.ndarray]) -> None:
+        self.metric = metric
+        self.experiments = list(experiments)
+        self.lengths = np.array([len(values) for values in series],
+                                dtype=np.int64)
+        self.values = np.full((len(series), self.lengths.max(initial=0)),
+                              np.nan)
+
+        for row, values in enumerate(series):
+            self.values[row, :len(values)] = values
+
+    def __len__(self) -> int:
+        return len(self.experiments)
+
+    def to_frame(self) -> DataFrame:
+        """
+        Gets the aligned values as a DataFrame.
+
+        Returns
+        -------
+        frame : pd.DataFrame
+            Values with the experiments as index and the epochs as columns.
+        """
+        pd = lazy_import('pandas')
+
+        return pd.DataFrame(self.values, index=pd.Index(self.experiments,
+                                                        name='experiment'))
+
+    def final(self) -> np.ndarray:
+        """
+        Gets the value of the last epoch of each experiment.
+
+        Returns
+        -------
+        final : np.ndarray
+            Last value of each experiment, NaN if it has no epochs.
+        """
+        final = np.full(len(self), np.nan)
+        has_epochs = self.lengths > 0
+        final[has_epochs] = self.values[has_epochs,
+                                        self.lengths[has_epochs] - 1]
+
+        return final
+
+    def best(self, mode: str = 'min') -> np.ndarray:
+        """
+        Gets the best value of each experiment.
+
+        Parameters
+        ----------
+        mode : str
+            'min' if lower values are better, 'max' if higher values are
+            better. Default is 'min'.
+
+        Returns
+        -------
+        best : np.ndarray
+            Best value of each experiment, NaN if it has no values.
+        """
+        self._check_mode(mode)
+        values = self._fill(mode)
+        # The initial value makes the experiments without epochs reduce to
+        # infinity
+        best = values.min(axis=1, initial=np.inf) if mode == 'min' else \
+                values.max(axis=1, initial=-np.inf)
+
+        return np.where(np.isinf(best), np.nan, best)
+
+    def best_epoch(self, mode: str = 'min') -> np.ndarray:
+        """
+        Gets the epoch of the best value of each experiment.
+
+        Parameters
+        ----------
+        mode : str
+            'min' if lower values are better, 'max' if higher values are
+            better. Default is 'min'.
+
+        Returns
+        -------
+        best_epoch : np.ndarray
+            Epoch of the best value of each experiment, -1 if it has no
+            values.
+        """
+        self._check_mode(mode)
+        values = self._fill(mode)
+
+        if values.shape[1] == 0:
+            return np.full(len(self), -1, dtype=np.int64)
+
+        epochs = values.argmin(axis=1) if mode == 'min' else \
+                    values.argmax(axis=1)
+
+        return np.where(np.isnan(self.values).all(axis=1), -1, epochs)
+
+    def auc(self) -> np.ndarray:
+        """
+        Gets the area under the curve of each experiment, using the
+        trapezoidal rule with one unit per epoch. Intervals with a missing
+        value are skipped.
+
+        Returns
+        -------
+        auc : np.ndarray
+            Area under the curve of each experiment, NaN if it has no
+            interval without missing values, such as with less than 2
+            epochs.
+        """
+        if self.values.shape[1] < 2:
+            return np.full(len(self), np.nan)
+
+        areas = (self.values[:, 1:] + self.values[:, :-1]) / 2
+        has_areas = ~np.isnan(areas).all(axis=1)
+
+        return np.where(has_areas, np.nansum(areas, axis=1), np.nan)
+
+    def rank(self, reduction: str = 'best', mode: str = 'min') -> np.ndarray:
+        """
+        Ranks the experiments by a reduction of the metric.
+
+        Parameters
+        ----------
+        reduction : str
+            Value compared: 'best', 'final' or 'auc'. Default is 'best'.
+        mode : str
+            'min' if lower values are better, 'max' if higher values are
+            better. Default is 'min'.
+
+        Returns
+        -------
+        rank : np.ndarray
+            Rank of each experiment, 1 for the best one. The experiments
+            without values are ranked last.
+        """
+        if reduction not in self._REDUCTIONS:
+            raise ValueError(f'The reduction must be one of '
+                             f'{self._REDUCTIONS}')
+        self._check_mode(mode)
+
+        if reduction == 'best':
+            scores = self.best(mode)
+        elif reduction == 'final':
+            scores = self.final()
+        else:
+            scores = self.auc()
+
+        if mode == 'max':
+            scores = -scores
+
+        # NaN is sorted last, and a stable sort keeps the ties in order
+        order = np.argsort(scores, kind='stable')
+        rank = np.empty(len(self), dtype=np.int64)
+        rank[order] = np.arange(1, len(self) + 1)
+
+        return rank
+
+    def summary(self, mode: str = 'min') -> DataFrame:
+        """
+        Gets every reduction of each experiment, sorted by the best value.
+
+        Parameters
+        ----------
+        mode : str
+            'min' if lower values are better, 'max' if higher values are
+            better. Default is 'min'.
+
+        Returns
+        -------
+        summary : pd.DataFrame
+            Best value, best epoch, final value, area under the curve, number
+            of epochs and rank of each experiment.
+        """
+        pd = lazy_import('pandas')
+        summary = pd.DataFrame({
+            'best': self.best(mode),
+            'best_epoch': self.best_epoch(mode),
+            'final': self.final(),
+            'auc': self.auc(),
+            'epochs': self.lengths,
+            'rank': self.rank('best', mode)
+        }, index=pd.Index(self.experiments, name='experiment'))
+
+        return summary.sort_values('rank')
+
+    def _fill(self, mode: str) -> np.ndarray:
+        # Missing values never win a reduction
+        fill = np.inf if mode == 'min' else -np.inf
+
+        return np.where(np.isnan(self.values), fill, self.values)
+
+    def _check_mode(self, mode: str) -> None:
+        if mode not in self._MODES:
+            raise ValueError(f'The mode must be one of {self._MODES}')
+
+def get_metric_series(metrics_data: Dict, metric: str) -> np.ndarray:
+    """
+    Gets the values of a metric from the stored data of a metrics config,
+    without decoding the rest of the metrics.
+
+    Parameters
+    ----------
+    metrics_data : Dict
+        Stored data of the metrics config, with either layout.
+    metric : str
+        Name of the metric.
+
+    Returns
+    -------
+    values : np.ndarray
+        Values of the metric, empty if it is not stored.
+    """
+    if not metrics_data:
+        return np.empty(0)
+
+    first = next(iter(metrics_data.values()))
+
+    # Columns layout, each value is already the metric series
+    if not isinstance(first, Dict):
+        return np.asarray(metrics_data.get(metric, []), dtype=np.float64)
+
+    if metric not in first:
+        return np.empty(0)
+
+    # Missing values may be stored as null
+    return np.array([epoch.get(metric) for epoch in metrics_data.values()],
+                    dtype=np.float64)
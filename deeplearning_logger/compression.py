@@ -0,0 +1,176 @@
+import gzip
+import os
+from contextlib import contextmanager
+from typing import IO, Iterator, List
+
+# Optional Zstandard compression, used when it is installed
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# File extension of each compression
+_EXTENSIONS = {'gzip': '.gz', 'zstd': '.zst'}
+# Default levels, which trade a slightly larger file for much faster writes
+_DEFAULT_LEVELS = {'gzip': 6, 'zstd': 3}
+
+def check_compression(compression: str) -> None:
+    """
+    Checks a compression is valid and available.
+
+    Parameters
+    ----------
+    compression : str
+        'gzip', 'zstd' or None for plain files.
+    """
+    if compression is None:
+        return
+
+    if compression not in _EXTENSIONS:
+        raise ValueError(f'The compression must be one of '
+                         f'{tuple(_EXTENSIONS)} or None')
+    if compression == 'zstd' and zstandard is None:
+        raise ImportError('The zstd compression needs the zstandard package')
+
+def get_extension(compression: str) -> str:
+    """
+    Gets the file extension added by a compression.
+
+    Parameters
+    ----------
+    compression : str
+        'gzip', 'zstd' or None for plain files.
+
+    Returns
+    -------
+    extension : str
+        Extension added to the filename, empty for plain files.
+    """
+    return _EXTENSIONS[compression] if compression is not None else ''
+
+def get_variants(path: str) -> List[str]:
+    """
+    Gets the paths a file may be stored at, plain or compressed.
+
+    Parameters
+    ----------
+    path : str
+        Path of the plain file.
+
+    Returns
+    -------
+    paths : List[str]
+        Path of the plain file followed by the compressed ones.
+    """
+    return [path] + [path + extension for extension in _EXTENSIONS.values()]
+
+def find_file(path: str) -> str:
+    """
+    Finds the stored version of a file, plain or compressed.
+
+    Parameters
+    ----------
+    path : str
+        Path of the plain file.
+
+    Returns
+    -------
+    path : str
+        Path of the stored file, None if there isn't any.
+    """
+    for variant in get_variants(path):
+        if os.path.isfile(variant):
+            return variant
+
+    return None
+
+def read_file(path: str) -> bytes:
+    """
+    Reads the content of a file stored plain or compressed.
+
+    Parameters
+    ----------
+    path : str
+        Path of the plain file.
+
+    Returns
+    -------
+    content : bytes
+        Uncompressed content of the file.
+    """
+    with open_file(path) as file:
+        return file.read()
+
+@contextmanager
+def open_file(path: str) -> Iterator[IO]:
+    """
+    Opens a file stored plain or compressed for reading. Compressed files
+    are decompressed while they are read, so they can be streamed.
+
+    Parameters
+    ----------
+    path : str
+        Path of the plain file.
+
+    Yields
+    ------
+    file : IO
+        Binary stream with the uncompressed content.
+    """
+    stored_path = find_file(path)
+
+    if stored_path is None:
+        raise FileNotFoundError(f'No such file: {path}')
+
+    with open(stored_path, 'rb') as file:
+        if stored_path.endswith(_EXTENSIONS['gzip']):
+            yield gzip.GzipFile(fileobj=file)
+        elif stored_path.endswith(_EXTENSIONS['zstd']):
+            check_compression('zstd')
+            yield zstandard.ZstdDecompressor().stream_reader(file)
+        else:
+            yield file
+
+@contextmanager
+def compress_stream(file: IO, compression: str,
+                    level: int = None) -> Iterator[IO]:
+    """
+    Wraps a binary file in a stream which compresses what is written into
+    it, so the uncompressed content is never held in memory along with the
+    compressed one.
+
+    Parameters
+    ----------
+    file : IO
+        Binary file where the compressed content is written. It is not
+        closed.
+    compression : str
+        'gzip', 'zstd' or None to write the content as it is.
+    level : int
+        Compression level. Default is None, which uses level 6 for gzip and
+        3 for zstd.
+
+    Yields
+    ------
+    stream : IO
+        Binary stream to write the uncompressed content into.
+    """
+    check_compression(compression)
+
+    if compression is None:
+        yield file
+        return
+
+    if level is None:
+        level = _DEFAULT_LEVELS[compression]
+
+    if compression == 'gzip':
+        # A fixed mtime makes equal contents produce equal files
+        with gzip.GzipFile(fileobj=file, mode='wb', compresslevel=level,
+                           mtime=0) as stream:
+            yield stream
+    else:
+        compressor = zstandard.ZstdCompressor(level=level)
+
+        with compressor.stream_writer(file, closefd=False) as stream:
+            yield stream
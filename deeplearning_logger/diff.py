@@ -0,0 +1,379 @@
+import hashlib
+import numpy as np
+from typing import Any, Dict, List
+from deeplearning_logger.architectures import fingerprint
+from deeplearning_logger.json import encode_numpy, orjson
+from deeplearning_logger.imports import lazy_import, lazy_type
+from deeplearning_logger.comparison import MetricComparison
+
+DataFrame = lazy_type('pandas', 'DataFrame')
+
+# Keys holding the content hash of a sibling subtree. Subtrees with the same
+# hash are equal, so they are skipped without being walked.
+_HASHED_SUBTREES = {
+    'model_hash': 'model_config',
+    'architecture_hash': 'architecture'
+}
+
+class ExperimentDiff():
+    """
+    Differences between two experiments: the changed values of their
+    configs and statistics of the differences of their metrics.
+
+    Parameters
+    ----------
+    experiments : List[str]
+        Names of the old and the new experiment.
+    changes : List[Dict]
+        Changed values, see `diff_trees`.
+    metrics : Dict[str, Dict]
+        Statistics of each metric, see `diff_metrics`.
+
+    Attributes
+    ----------
+    experiments : List[str]
+        Names of the old and the new experiment.
+    changes : List[Dict]
+        Changed values, each with its 'path', 'change', 'old' and 'new'.
+    metrics : Dict[str, Dict]
+        Statistics of each metric.
+    """
+    def __init__(self, experiments: List[str], changes: List[Dict],
+                 metrics: Dict[str, Dict]) -> None:
+        self.experiments = list(experiments)
+        self.changes = changes
+        self.metrics = metrics
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+    @property
+    def identical(self) -> bool:
+        """
+        Whether the configs and the metrics of the experiments are equal.
+        """
+        return not self.changes and \
+                all(stats['equal'] for stats in self.metrics.values())
+
+    def to_frame(self) -> DataFrame:
+        """
+        Gets the changed values as a DataFrame.
+
+        Returns
+        -------
+        frame : pd.DataFrame
+            Change, old and new value of each changed path.
+        """
+        pd = lazy_import('pandas')
+
+        return pd.DataFrame(self.changes,
+                            columns=['path', 'change', 'old', 'new']
+                            ).set_index('path')
+
+class ExperimentsDiff():
+    """
+    Differences between several experiments: the config values which are
+    not equal in all of them, and reductions of their metrics.
+
+    Parameters
+    ----------
+    experiments : List[str]
+        Names of the experiments.
+    values : Dict[str, List]
+        Value of each differing path in each experiment.
+    metrics : Dict[str, Dict[str, np.ndarray]]
+        Reductions of each metric in each experiment.
+
+    Attributes
+    ----------
+    experiments : List[str]
+        Names of the experiments.
+    values : Dict[str, List]
+        Value of each differing path in each experiment, in the order of the
+        experiments. None if an experiment doesn't have the path.
+    metrics : Dict[str, Dict[str, np.ndarray]]
+        Number of epochs, final, minimum and maximum value of each metric in
+        each experiment, NaN if an experiment doesn't have the metric.
+    """
+    def __init__(self, experiments: List[str], values: Dict[str, List],
+                 metrics: Dict[str, Dict[str, np.ndarray]]) -> None:
+        self.experiments = list(experiments)
+        self.values = values
+        self.metrics = metrics
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def to_frame(self) -> DataFrame:
+        """
+        Gets the differing values as a DataFrame.
+
+        Returns
+        -------
+        frame : pd.DataFrame
+            Values with the paths as index and the experiments as columns.
+        """
+        pd = lazy_import('pandas')
+
+        return pd.DataFrame.from_dict(self.values, orient='index',
+                                      columns=self.experiments)
+
+def diff_trees(old: Any, new: Any, path: str = '') -> List[Dict]:
+    """
+    Compares two structures of dicts and lists.
+
+    Equal subtrees are skipped by a single comparison, run by the
+    interpreter without walking them in Python, and architectures with the
+    same content hash are skipped without being compared at all. Only the
+    subtrees with differences are walked.
+
+    Parameters
+    ----------
+    old : Any
+        Old structure, such as the data of a config.
+    new : Any
+        New structure.
+    path : str
+        Path of the structures, prefixed to the changed paths. Default is an
+        empty string.
+
+    Returns
+    -------
+    changes : List[Dict]
+        Changed values, with their dotted 'path', the 'change' ('added',
+        'removed' or 'changed') and the 'old' and 'new' values. The value
+        missing from a structure is None.
+    """
+    changes = []
+    _diff(old, new, path, changes)
+
+    return changes
+
+def diff_metrics(old: Dict[str, np.ndarray],
+                 new: Dict[str, np.ndarray]) -> Dict[str, Dict]:
+    """
+    Summarizes the differences of the metrics of two experiments, aligned by
+    epoch. The statistics are computed over whole arrays.
+
+    Parameters
+    ----------
+    old : Dict[str, np.ndarray]
+        Values of each metric of the old experiment.
+    new : Dict[str, np.ndarray]
+        Values of each metric of the new experiment.
+
+    Returns
+    -------
+    metrics : Dict[str, Dict]
+        For each metric of either experiment: whether the series are
+        'equal', the number of epochs, final and minimum value of each one,
+        the mean and maximum absolute difference over the common epochs, and
+        the first epoch whose values differ, or None.
+    """
+    metrics = {}
+
+    for metric in list(old) + [metric for metric in new if metric not in old]:
+        old_values = np.asarray(old.get(metric, []), dtype=np.float64)
+        new_values = np.asarray(new.get(metric, []), dtype=np.float64)
+        epochs = min(len(old_values), len(new_values))
+
+        # NaN values in the same epoch are equal
+        close = np.isclose(old_values[:epochs], new_values[:epochs],
+                           equal_nan=True)
+        differences = np.abs(new_values[:epochs] - old_values[:epochs])
+        divergent = np.flatnonzero(~close)
+
+        if divergent.size:
+            first_divergence = int(divergent[0])
+        elif len(old_values) != len(new_values):
+            first_divergence = epochs
+        else:
+            first_divergence = None
+
+        metrics[metric] = {
+            'equal': first_divergence is None,
+            'old_epochs': len(old_values),
+            'new_epochs': len(new_values),
+            'old_final': _final(old_values),
+            'new_final': _final(new_values),
+            'final_delta': _final(new_values) - _final(old_values),
+            'old_min': _nanreduce(np.nanmin, old_values),
+            'new_min': _nanreduce(np.nanmin, new_values),
+            'mean_abs_diff': _nanreduce(np.nanmean, differences),
+            'max_abs_diff': _nanreduce(np.nanmax, differences),
+            'first_divergence': first_divergence
+        }
+
+    return metrics
+
+def diff_many(trees: Dict[str, Any],
+              columns: Dict[str, Dict[str, np.ndarray]] = None
+              ) -> ExperimentsDiff:
+    """
+    Compares several structures, such as the configs of many experiments.
+
+    Each structure is hashed once, and only the distinct ones are compared
+    with the first structure, so experiments sharing their configs cost a
+    hash each.
+
+    Parameters
+    ----------
+    trees : Dict[str, Any]
+        Structure of each experiment, by name.
+    columns : Dict[str, Dict[str, np.ndarray]]
+        Values of each metric of each experiment, by name. Default is None.
+
+    Returns
+    -------
+    diff : ExperimentsDiff
+        Values which differ and reductions of the metrics.
+    """
+    names = list(trees)
+    values = {}
+
+    if names:
+        reference = trees[names[0]]
+        # Changes of each distinct structure, by content hash
+        distinct = {_digest(reference): []}
+
+        for idx, name in enumerate(names[1:], 1):
+            digest = _digest(trees[name])
+
+            if digest not in distinct:
+                distinct[digest] = diff_trees(reference, trees[name])
+
+            for change in distinct[digest]:
+                row = values.get(change['path'])
+
+                if row is None:
+                    row = values[change['path']] = [change['old']] * len(names)
+
+                row[idx] = change['new']
+
+    return ExperimentsDiff(names, values,
+                           _reduce_metrics(names, columns or {}))
+
+def _digest(tree: Any) -> bytes:
+    """
+    Computes a content hash of a structure, only compared within a diff.
+    """
+    if orjson is None:
+        return fingerprint(tree).encode()
+
+    # Several times faster than the canonical JSON of `fingerprint`
+    return hashlib.blake2b(orjson.dumps(
+                tree, default=encode_numpy,
+                option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY |
+                       orjson.OPT_NON_STR_KEYS)).digest()
+
+def _diff(old: Any, new: Any, path: str, changes: List[Dict]) -> None:
+    if old is new:
+        return
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        _diff_dicts(old, new, path, changes)
+    elif isinstance(old, (list, tuple)) and isinstance(new, (list, tuple)):
+        _diff_sequences(old, new, path, changes)
+    else:
+        _diff_leaves(old, new, path, changes)
+
+def _diff_dicts(old: Dict, new: Dict, path: str, changes: List[Dict]) -> None:
+    skipped = {tree_key for hash_key, tree_key in _HASHED_SUBTREES.items()
+               if old.get(hash_key) and old.get(hash_key) == new.get(hash_key)}
+
+    if not skipped and _equal(old, new):
+        return
+
+    for key, value in old.items():
+        if key in skipped:
+            continue
+
+        child_path = _join(path, key)
+
+        if key in new:
+            _diff(value, new[key], child_path, changes)
+        else:
+            changes.append(_change(child_path, 'removed', value, None))
+
+    for key, value in new.items():
+        if key not in old:
+            changes.append(_change(_join(path, key), 'added', None, value))
+
+def _diff_sequences(old: List, new: List, path: str,
+                    changes: List[Dict]) -> None:
+    if _equal(old, new):
+        return
+
+    for idx, (old_value, new_value) in enumerate(zip(old, new)):
+        _diff(old_value, new_value, _join(path, idx), changes)
+
+    for idx in range(len(new), len(old)):
+        changes.append(_change(_join(path, idx), 'removed', old[idx], None))
+    for idx in range(len(old), len(new)):
+        changes.append(_change(_join(path, idx), 'added', None, new[idx]))
+
+def _diff_leaves(old: Any, new: Any, path: str, changes: List[Dict]) -> None:
+    if not _equal(old, new):
+        changes.append(_change(path, 'changed', old, new))
+
+def _equal(old: Any, new: Any) -> bool:
+    """
+    Compares two values, including arrays and NaN.
+    """
+    if isinstance(old, np.ndarray) or isinstance(new, np.ndarray):
+        try:
+            return np.array_equal(old, new, equal_nan=True)
+        except TypeError: # Arrays which aren't numeric
+            return np.array_equal(old, new)
+
+    try:
+        if old == new:
+            return True
+    except ValueError: # Structures containing arrays
+        return False
+
+    # NaN is stored as null by some JSON backends
+    return _is_nan(old) and _is_nan(new)
+
+def _is_nan(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and value != value)
+
+def _change(path: str, change: str, old: Any, new: Any) -> Dict:
+    return {'path': path, 'change': change, 'old': old, 'new': new}
+
+def _join(path: str, key: Any) -> str:
+    return f'{path}.{key}' if path else str(key)
+
+def _final(values: np.ndarray) -> float:
+    return float(values[-1]) if len(values) else np.nan
+
+def _nanreduce(reduction, values: np.ndarray) -> float:
+    if not len(values) or np.isnan(values).all():
+        return np.nan
+
+    return float(reduction(values))
+
+def _reduce_metrics(names: List[str], columns: Dict[str, Dict[str, np.ndarray]]
+                    ) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Reduces each metric of several experiments, aligned by epoch so each
+    reduction runs once over all of them.
+    """
+    metrics = {}
+
+    for name in names:
+        for metric in columns.get(name, {}):
+            metrics.setdefault(metric, None)
+
+    for metric in metrics:
+        comparison = MetricComparison(metric, names, [
+                        np.asarray(columns.get(name, {}).get(metric, []),
+                                   dtype=np.float64) for name in names])
+        metrics[metric] = {
+            'epochs': comparison.lengths,
+            'final': comparison.final(),
+            'min': comparison.best('min'),
+            'max': comparison.best('max')
+        }
+
+    return metrics
@@ -0,0 +1,24 @@
+import os
+
+# Environment variable set by torchrun and most distributed launchers
+_RANK_VARIABLE = 'RANK'
+
+def get_rank(rank: int = None) -> int:
+    """
+    Gets the rank of the current process in a distributed training.
+
+    Parameters
+    ----------
+    rank : int
+        Rank of the process, if it is already known. Default is None, which
+        reads the RANK environment variable.
+
+    Returns
+    -------
+    rank : int
+        Rank of the process, 0 if it is not a distributed training.
+    """
+    if rank is not None:
+        return rank
+
+    return int(os.environ.get(_RANK_VARIABLE, 0))
@@ -0,0 +1,402 @@
+from __future__ import annotations
+import glob
+import json
+import os
+import re
+import socket
+import time
+from typing import IO, Callable, Dict, List, Tuple, Union
+from deeplearning_logger.profiling import timed_fsync, track_file
+
+# File locks use fcntl on POSIX systems and msvcrt on Windows
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+# Journal listing the files of a commit whose renames may be pending
+_JOURNAL = '.commit'
+_TEMP_SUFFIX = '.tmp'
+_FSYNC_POLICIES = ('always', 'never')
+# Lock file of folders which can't be locked directly, on Windows
+_LOCK_FILE = '.lock'
+# Host of the writers, without the dots which separate the temporary
+# filename parts
+_HOST = re.sub(r'[^A-Za-z0-9-]', '_', socket.gethostname())
+
+def check_fsync_policy(fsync: str) -> None:
+    """
+    Checks an fsync policy is valid.
+
+    Parameters
+    ----------
+    fsync : str
+        'always' flushes every file and folder to disk before it becomes
+        visible, which survives power losses and kernel crashes. 'never'
+        relies on the atomic renames only, which survives killed processes
+        and is much faster.
+    """
+    if fsync not in _FSYNC_POLICIES:
+        raise ValueError(f'The fsync policy must be one of {_FSYNC_POLICIES}')
+
+def atomic_write(path: str, content: Union[bytes, Callable[[IO], int]],
+                 fsync: str = 'never') -> int:
+    """
+    Writes a file atomically: the content is written into a temporary file
+    which is renamed to the target path, so the file is either the previous
+    one or the new one, never a partial one.
+
+    Parameters
+    ----------
+    path : str
+        Target file path.
+    content : bytes or Callable
+        File content, or a function which streams it into the opened file
+        and returns the number of bytes written.
+    fsync : str
+        fsync policy, 'always' or 'never'. Default is 'never'.
+
+    Returns
+    -------
+    size : int
+        Number of bytes written.
+    """
+    check_fsync_policy(fsync)
+
+    temp_path = get_temp_path(path)
+    size = _write_file(temp_path, content, fsync)
+    os.replace(temp_path, path)
+
+    if fsync == 'always':
+        _fsync_folder(os.path.dirname(path))
+
+    return size
+
+def get_temp_path(path: str) -> str:
+    """
+    Gets the path of a temporary file written before it replaces a file.
+
+    The host and process id of the writer are part of the filename, so the
+    recovery of a project only removes the temporary files of dead
+    processes of the same host.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file replaced.
+
+    Returns
+    -------
+    temp_path : str
+        Path of the temporary file.
+    """
+    return f'{path}.{_HOST}-{os.getpid()}{_TEMP_SUFFIX}'
+
+def commit_files(folder: str,
+                 files: Dict[str, Union[bytes, Callable[[IO], int]]],
+                 fsync: str = 'never', remove: List[str] = None) -> int:
+    """
+    Writes several files of a folder as a single unit.
+
+    The files are written into temporary files, then a journal listing them
+    is written and the temporary files are renamed. If the process dies
+    before the journal is written, `recover_folder` removes the temporary
+    files and the previous files are kept. If it dies after, it finishes the
+    renames. A commit of a single file is only renamed, without a journal.
+
+    Parameters
+    ----------
+    folder : str
+        Folder containing the files.
+    files : Dict[str, bytes or Callable]
+        Content of each file, by path relative to the folder, or a function
+        which streams it into the opened file and returns the number of bytes
+        written. Files in subfolders, such as sidecar files, are committed
+        with the others.
+    fsync : str
+        fsync policy, 'always' or 'never'. Default is 'never'.
+    remove : List[str]
+        Filenames removed by the commit, such as previous versions of the
+        files stored in another format. Default is None.
+
+    Returns
+    -------
+    size : int
+        Number of bytes written.
+    """
+    check_fsync_policy(fsync)
+
+    renames = []
+    size = 0
+
+    for filename, content in files.items():
+        path = os.path.join(folder, filename)
+        temp_path = get_temp_path(path)
+        size += _write_file(temp_path, content, fsync)
+        renames.append((os.path.relpath(temp_path, folder), filename))
+
+    # Removals are journaled as renames without a temporary file
+    renames.extend((None, filename) for filename in remove or []
+                   if filename not in files)
+
+    # A single rename is atomic by itself and doesn't need a journal
+    if len(renames) == 1:
+        _apply_renames(folder, renames)
+
+        if fsync == 'always':
+            _fsync_folder(folder)
+
+        return size
+
+    # The writer is recorded so recovery never replays a live commit
+    journal = json.dumps({'host': _HOST, 'pid': os.getpid(),
+                          'renames': renames}).encode('utf-8')
+    atomic_write(os.path.join(folder, _JOURNAL), journal, fsync)
+
+    _apply_renames(folder, renames)
+    os.remove(os.path.join(folder, _JOURNAL))
+
+    if fsync == 'always':
+        _fsync_folder(folder)
+
+    return size
+
+def recover_folder(folder: str) -> str:
+    """
+    Repairs a folder whose files were being written by a process that died.
+
+    The commits and temporary files of the processes of other hosts, whose
+    state can't be checked, are assumed to be in progress and are kept, as
+    are those of an unknown writer.
+
+    Parameters
+    ----------
+    folder : str
+        Folder to repair.
+
+    Returns
+    -------
+    status : str
+        'committed' if a pending commit was finished, 'rolled_back' if
+        temporary files were removed, 'removed' if the folder was left empty
+        and removed, or 'clean' if nothing was done.
+    """
+    journal_path = os.path.join(folder, _JOURNAL)
+    status = 'clean'
+
+    if os.path.isfile(journal_path):
+        with open(journal_path, 'rb') as file:
+            journal = json.loads(file.read())
+
+        # Journals without a writer are left to the process that wrote them
+        if isinstance(journal, dict) and \
+                not _is_writer_alive(journal['host'], journal['pid']):
+            _apply_renames(folder, journal['renames'])
+            os.remove(journal_path)
+            status = 'committed'
+
+    # Files committed in subfolders are rolled back with the folder, after
+    # the journal which may still rename them
+    patterns = ['*' + _TEMP_SUFFIX, '.*' + _TEMP_SUFFIX,
+                os.path.join('*', '*' + _TEMP_SUFFIX)]
+
+    for temp_path in [path for pattern in patterns
+                      for path in glob.glob(os.path.join(folder, pattern))]:
+        # Files of a live process may still be in progress
+        if not _is_writer_alive(*_get_writer(temp_path)):
+            os.remove(temp_path)
+            status = 'rolled_back' if status == 'clean' else status
+
+    if status == 'rolled_back' and \
+            not set(os.listdir(folder)) - {_LOCK_FILE}:
+        if os.path.isfile(os.path.join(folder, _LOCK_FILE)):
+            os.remove(os.path.join(folder, _LOCK_FILE))
+        os.rmdir(folder)
+        status = 'removed'
+
+    return status
+
+class FileLock():
+    """
+    Exclusive lock held on a file or folder, which coordinates the threads
+    and processes writing the same experiment.
+
+    Folders are locked directly on POSIX systems, without creating any
+    file. The lock is released by the operating system if the process dies,
+    so a killed writer never leaves a stale lock.
+
+    Parameters
+    ----------
+    path : str
+        Path of the folder or lock file to lock. A lock file is created if
+        it doesn't exist.
+    timeout : float
+        Maximum number of seconds waiting for the lock. Default is None,
+        which waits forever.
+
+    Attributes
+    ----------
+    path : str
+        Path of the locked folder or file.
+    _timeout : float
+        Maximum number of seconds waiting for the lock.
+    _descriptor : int
+        Descriptor of the locked folder or file, None while the lock is not
+        held.
+    """
+    def __init__(self, path: str, timeout: float = None) -> None:
+        self.path = path
+        self._timeout = timeout
+        self._descriptor = None
+
+    def acquire(self) -> None:
+        """
+        Waits until the lock is held.
+        """
+        if self._descriptor is not None:
+            raise ValueError('The lock is already held')
+
+        descriptor = self._open()
+        deadline = None if self._timeout is None else \
+                    time.monotonic() + self._timeout
+
+        try:
+            while not _try_lock(descriptor, blocking=deadline is None):
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f'Could not lock {self.path}')
+                time.sleep(0.01)
+        except BaseException:
+            os.close(descriptor)
+            raise
+
+        self._descriptor = descriptor
+
+    def release(self) -> None:
+        """
+        Releases the lock.
+        """
+        if self._descriptor is None:
+            return
+
+        try:
+            _unlock(self._descriptor)
+        finally:
+            os.close(self._descriptor)
+            self._descriptor = None
+
+    def _open(self) -> int:
+        path = self.path
+
+        if os.path.isdir(path):
+            if fcntl is not None:
+                return os.open(path, os.O_RDONLY)
+
+            # Windows can't open folders
+            path = os.path.join(path, _LOCK_FILE)
+
+        return os.open(path, os.O_RDWR | os.O_CREAT)
+
+    def __enter__(self) -> FileLock:
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+def _try_lock(descriptor: int, blocking: bool) -> bool:
+    if fcntl is not None:
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+
+        try:
+            fcntl.flock(descriptor, flags)
+        except BlockingIOError:
+            return False
+
+        return True
+
+    # msvcrt only locks without blocking, so blocking locks retry
+    os.lseek(descriptor, 0, os.SEEK_SET)
+
+    while True:
+        try:
+            msvcrt.locking(descriptor, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            if not blocking:
+                return False
+            time.sleep(0.01)
+        else:
+            return True
+
+def _unlock(descriptor: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(descriptor, fcntl.LOCK_UN)
+    else:
+        os.lseek(descriptor, 0, os.SEEK_SET)
+        msvcrt.locking(descriptor, msvcrt.LK_UNLCK, 1)
+
+def _apply_renames(folder: str, renames: list) -> None:
+    for temp_name, filename in renames:
+        if temp_name is None:
+            if os.path.isfile(os.path.join(folder, filename)):
+                os.remove(os.path.join(folder, filename))
+            continue
+
+        temp_path = os.path.join(folder, temp_name)
+
+        # Renames already done before a crash are skipped
+        if os.path.isfile(temp_path):
+            os.replace(temp_path, os.path.join(folder, filename))
+
+def _write_file(path: str, content: Union[bytes, Callable[[IO], int]],
+                fsync: str) -> int:
+    with open(path, 'wb') as file:
+        file = track_file(file)
+        size = content(file) if callable(content) else file.write(content)
+
+        if fsync == 'always':
+            file.flush()
+            timed_fsync(file.fileno())
+
+    return size
+
+def _fsync_folder(folder: str) -> None:
+    # Directories can't be opened on Windows, where renames are durable
+    try:
+        descriptor = os.open(folder or '.', os.O_RDONLY)
+    except OSError:
+        return
+
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+def _get_writer(temp_path: str) -> Tuple[str, int]:
+    writer = temp_path[:-len(_TEMP_SUFFIX)].rsplit('.', 1)[-1]
+    host, _, pid = writer.rpartition('-')
+
+    if not host or not pid.isdigit():
+        return None, None
+
+    return host, int(pid)
+
+def _is_writer_alive(host: str, pid: int) -> bool:
+    # Processes of other hosts can't be checked, nor unknown writers
+    if host != _HOST or pid is None:
+        return True
+    # The files of this process may be written by another thread
+    if pid == os.getpid():
+        return True
+    # os.kill terminates the process on Windows instead of checking it
+    if os.name == 'nt':
+        return True
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+
+    return True
@@ -0,0 +1,74 @@
+import importlib
+import sys
+from abc import ABCMeta
+from typing import Any
+
+def lazy_import(module: str) -> Any:
+    """
+    Imports a module the first time it is needed, instead of when the
+    package is imported.
+
+    Parameters
+    ----------
+    module : str
+        Module name, such as 'pandas'.
+
+    Returns
+    -------
+    module : module
+        Imported module.
+    """
+    return importlib.import_module(module)
+
+def lazy_type(module: str, name: str) -> type:
+    """
+    Creates a type which stands for a class of a heavy library, such as a
+    TensorFlow or PyTorch class, without importing the library.
+
+    `isinstance` checks against the type only import the class if its
+    library is already imported. If it isn't, or the installed version of
+    the library doesn't have the class, no object can be an instance of the
+    class and the check is False without importing anything. The type
+    can be used in annotations checked with `typing.get_type_hints`.
+
+    Parameters
+    ----------
+    module : str
+        Module which defines the class, such as 'torch.nn'.
+    name : str
+        Class name, such as 'Module'.
+
+    Returns
+    -------
+    lazy_type : type
+        Type whose instances are the instances of the class.
+    """
+    package = module.split('.')[0]
+
+    def resolve(cls) -> type:
+        if package not in sys.modules:
+            return None
+
+        # Classes missing from the installed version, such as the Variable
+        # of Keras 2, are absent types
+        try:
+            return getattr(importlib.import_module(module), name)
+        except (AttributeError, ImportError):
+            return None
+
+    def instancecheck(cls, instance: Any) -> bool:
+        resolved = resolve(cls)
+
+        return resolved is not None and isinstance(instance, resolved)
+
+    def subclasscheck(cls, subclass: type) -> bool:
+        resolved = resolve(cls)
+
+        return resolved is not None and issubclass(subclass, resolved)
+
+    metaclass = type(f'Lazy{name}Meta', (ABCMeta,), {
+        '__instancecheck__': instancecheck,
+        '__subclasscheck__': subclasscheck
+    })
+
+    return metaclass(name, (), {})
@@ -1,17 +1,190 @@
 import json
 import numpy as np
-from typing import Any
+from typing import Any, IO, Union
+
+# Optional faster JSON libraries, used when they are installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
 
 class ConfigsJSONEncoder(json.JSONEncoder):
     """
     JSON encoder to allow serialize numpy data types
     """
     def default(self, o: Any) -> Any:
-        if isinstance(o, np.ndarray):
-            return o.tolist()
-        elif isinstance(o, np.integer):
-            return int(o)
-        elif isinstance(o, np.floating):
-            return float(o)
-        
-        return json.JSONEncoder.default(self, o)
\ No newline at end of file
+        try:
+            return encode_numpy(o)
+        except TypeError:
+            return json.JSONEncoder.default(self, o)
+
+def encode_numpy(o: Any) -> Any:
+    """
+    Converts a numpy data type into a JSON serializable value.
+
+    Parameters
+    ----------
+    o : Any
+        Object to convert.
+
+    Returns
+    -------
+    value : Any
+        Python list or number equivalent to the object.
+    """
+    if isinstance(o, np.ndarray):
+        return o.tolist()
+    elif isinstance(o, np.integer):
+        return int(o)
+    elif isinstance(o, np.floating):
+        return float(o)
+
+    raise TypeError(f'Object of type {o.__class__.__name__} '
+                    'is not JSON serializable')
+
+class JSONSerializer():
+    """
+    JSON serializer with a choice of JSON library.
+
+    The standard library json module with the ConfigsJSONEncoder is used by
+    default, so the files keep the same format whatever is installed: NaN
+    and infinite values are written as NaN and Infinity. orjson and ujson
+    are faster but opt-in, since they change the format. orjson serializes
+    the numpy arrays natively and writes NaN and infinite values as null,
+    which the metric series read back as NaN but other values read as None.
+
+    The documents are decoded by orjson when it is installed, whatever the
+    backend, and by the json module if orjson rejects them, such as the
+    documents with NaN. Both decode a document into the same values.
+
+    Parameters
+    ----------
+    backend : str
+        JSON library to use: 'orjson', 'ujson' or 'json'. Default is None,
+        which uses 'json'.
+    compact : bool
+        If True, the output has no indentation or whitespace, which is
+        smaller and faster for files only read by programs. Default is False.
+
+    Attributes
+    ----------
+    backend : str
+        JSON library used.
+    compact : bool
+        Whether the output has no indentation.
+    """
+    _BACKENDS = {
+        'orjson': orjson,
+        'ujson': ujson,
+        'json': json
+    }
+
+    def __init__(self, backend: str = None, compact: bool = False) -> None:
+        if backend is None:
+            backend = 'json'
+        elif backend not in self._BACKENDS:
+            raise ValueError(f'The backend must be one of '
+                             f'{tuple(self._BACKENDS)}')
+        elif self._BACKENDS[backend] is None:
+            raise ImportError(f'The {backend} backend is not installed')
+
+        self.backend = backend
+        self.compact = compact
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Serializes an object.
+
+        Parameters
+        ----------
+        obj : Any
+            Object to serialize.
+
+        Returns
+        -------
+        content : bytes
+            UTF-8 encoded JSON document.
+        """
+        if self.backend == 'orjson':
+            option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            if not self.compact:
+                option |= orjson.OPT_INDENT_2
+
+            return orjson.dumps(obj, default=encode_numpy, option=option)
+        elif self.backend == 'ujson':
+            content = ujson.dumps(obj, default=encode_numpy,
+                                  indent=0 if self.compact else 4,
+                                  ensure_ascii=False)
+        elif self.compact:
+            content = json.dumps(obj, separators=(',', ':'),
+                                 cls=ConfigsJSONEncoder)
+        else:
+            content = json.dumps(obj, indent=4, cls=ConfigsJSONEncoder)
+
+        return content.encode('utf-8')
+
+    def loads(self, content: Union[bytes, str]) -> Any:
+        """
+        Deserializes a JSON document.
+
+        Parameters
+        ----------
+        content : bytes or str
+            JSON document.
+
+        Returns
+        -------
+        obj : Any
+            Deserialized object.
+        """
+        if self.backend == 'ujson':
+            return ujson.loads(content)
+
+        if orjson is not None:
+            try:
+                return orjson.loads(content)
+            except orjson.JSONDecodeError:
+                # NaN, infinite values or integers longer than 64 bits are
+                # decoded by the json module
+                pass
+
+        return json.loads(content)
+
+    def dump(self, obj: Any, file: IO[bytes]) -> int:
+        """
+        Serializes an object into a binary file.
+
+        Parameters
+        ----------
+        obj : Any
+            Object to serialize.
+        file : IO[bytes]
+            File opened in binary mode.
+
+        Returns
+        -------
+        size : int
+            Number of bytes written.
+        """
+        return file.write(self.dumps(obj))
+
+    def load(self, file: IO[bytes]) -> Any:
+        """
+        Deserializes the JSON document of a binary file.
+
+        Parameters
+        ----------
+        file : IO[bytes]
+            File opened in binary mode.
+
+        Returns
+        -------
+        obj : Any
+            Deserialized object.
+        """
+        return self.loads(file.read())
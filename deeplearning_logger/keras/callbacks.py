@@ -0,0 +1,277 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+from tensorflow.keras.callbacks import Callback
+
+from deeplearning_logger.keras.configs import BatchMetricsConfig, Config, \
+                                              MetricsConfig, ModelConfig
+from deeplearning_logger.keras.project import Project
+from deeplearning_logger.checkpoints import CheckpointRegistry
+
+class MetricsBuffer():
+    """
+    Preallocated buffer storing the values of each metric in a NumPy array.
+
+    The arrays double their size when they are full, so appending a row
+    doesn't allocate memory in most calls.
+
+    Parameters
+    ----------
+    capacity : int
+        Initial number of rows of the buffer. Default is 1024.
+
+    Attributes
+    ----------
+    _columns : Dict[str, np.ndarray]
+        Preallocated array of each metric.
+    _capacity : int
+        Number of rows of the arrays.
+    _size : int
+        Number of rows appended.
+    """
+    def __init__(self, capacity: int = 1024) -> None:
+        self._columns = {}
+        self._capacity = capacity
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, values: Dict) -> None:
+        """
+        Appends a row of metric values.
+
+        Parameters
+        ----------
+        values : Dict
+            Value of each metric. Metrics missing in a row are stored as NaN.
+        """
+        if self._size == self._capacity:
+            self._grow()
+
+        for name, value in values.items():
+            column = self._columns.get(name)
+
+            if column is None:
+                column = np.full(self._capacity, np.nan)
+                self._columns[name] = column
+
+            column[self._size] = value
+
+        self._size += 1
+
+    def get_columns(self) -> Dict[str, np.ndarray]:
+        """
+        Gets the values appended to each metric.
+
+        Returns
+        -------
+        columns : Dict[str, np.ndarray]
+            Views of the filled part of each array.
+        """
+        return {name: column[:self._size]
+                for name, column in self._columns.items()}
+
+    def _grow(self) -> None:
+        self._capacity *= 2
+
+        for name, column in self._columns.items():
+            grown = np.full(self._capacity, np.nan)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+class ExperimentCallback(Callback):
+    """
+    Keras callback which logs the training metrics into a project
+    experiment while the model is trained.
+
+    The metrics are buffered in memory. The experiment files are written
+    when the first epoch ends and when the training ends, and in between the
+    new epochs are appended every few epochs or seconds, so a periodic write
+    costs the size of the new epochs. The experiment
+    stores the epoch metrics with the 'columns' layout, the model config and
+    optionally the metrics of each batch, and it can be opened with
+    `Project.open_experiment`.
+
+    Parameters
+    ----------
+    project : Project
+        Project where the experiment is created.
+    experiment_name : str
+        Experiment's name.
+    description : str
+        Experiment's description. Default is an empty string.
+    configs : List[Config]
+        Other configs stored in the experiment. Default is None.
+    log_batches : bool
+        Whether to log the metrics of each training batch. Default is False.
+    flush_every_epochs : int
+        Number of epochs between writes of the experiment files. Default is
+        1.
+    flush_every_seconds : float
+        Maximum number of seconds between writes of the experiment files,
+        also checked after each batch when the batches are logged. Default
+        is None.
+    log_model : bool
+        Whether to store the model config. Default is True.
+
+    Attributes
+    ----------
+    experiment : Experiment
+        Experiment created in the project, None until the first write.
+    """
+    def __init__(self, project: Project, experiment_name: str,
+                 description: str = '', configs: List[Config] = None,
+                 log_batches: bool = False, flush_every_epochs: int = 1,
+                 flush_every_seconds: float = None,
+                 log_model: bool = True) -> None:
+        super().__init__()
+
+        if not experiment_name:
+            raise ValueError('Must use a non empty experiment name')
+
+        self.experiment = None
+        self._project = project
+        self._experiment_name = experiment_name
+        self._description = description
+        self._configs = list(configs) if configs else []
+        self._log_batches = log_batches
+        self._flush_every_epochs = flush_every_epochs
+        self._flush_every_seconds = flush_every_seconds
+        self._log_model = log_model
+        self._epochs = MetricsBuffer()
+        self._batches = MetricsBuffer()
+        self._model_config = None
+        self._pending_epochs = 0
+        self._flushed_epochs = 0
+        self._flushed_batches = 0
+        self._last_flush = time.monotonic()
+
+    def on_epoch_end(self, epoch: int, logs: Dict = None) -> None:
+        self._epochs.append(logs or {})
+        self._pending_epochs += 1
+
+        if self._pending_epochs >= self._flush_every_epochs or \
+                self._is_flush_time():
+            self._append()
+
+    def on_train_batch_end(self, batch: int, logs: Dict = None) -> None:
+        if not self._log_batches:
+            return
+
+        self._batches.append(logs or {})
+
+        if self._is_flush_time():
+            self._append()
+
+    def on_train_end(self, logs: Dict = None) -> None:
+        self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes the experiment files with the metrics logged so far, merging
+        the epochs appended since the last write.
+        """
+        configs = [MetricsConfig(self._epochs.get_columns())]
+
+        if self._log_batches:
+            configs.append(BatchMetricsConfig(self._batches.get_columns()))
+
+        if self._log_model and self.model is not None:
+            # The architecture doesn't change while training
+            if self._model_config is None:
+                self._model_config = ModelConfig(self.model)
+            configs.append(self._model_config)
+
+        configs.extend(self._configs)
+
+        if self.experiment is None:
+            self.experiment = self._project.create_experiment(
+                                    self._experiment_name, configs=configs,
+                                    description=self._description)
+        else:
+            self.experiment.configs = configs
+            self._project.update_experiment(self.experiment)
+
+        self._flushed_epochs = len(self._epochs)
+        self._flushed_batches = len(self._batches)
+        self._pending_epochs = 0
+        self._last_flush = time.monotonic()
+
+    def _append(self) -> None:
+        """
+        Appends the metrics logged since the last write to the experiment,
+        or writes the experiment files if they are not written yet.
+        """
+        if self.experiment is None:
+            self.flush()
+            return
+
+        self._extend('metrics', self._epochs, self._flushed_epochs)
+        self._flushed_epochs = len(self._epochs)
+
+        if self._log_batches:
+            self._extend('batch_metrics', self._batches,
+                         self._flushed_batches)
+            self._flushed_batches = len(self._batches)
+
+        self._pending_epochs = 0
+        self._last_flush = time.monotonic()
+
+    def _extend(self, name: str, buffer: MetricsBuffer, start: int) -> None:
+        if len(buffer) == start:
+            return
+
+        rows = pd.DataFrame({metric: values[start:] for metric, values
+                             in buffer.get_columns().items()})
+        self.experiment.extend_metrics(rows, initial_epoch=start, name=name)
+
+    def _is_flush_time(self) -> bool:
+        return self._flush_every_seconds is not None and \
+                time.monotonic() - self._last_flush >= self._flush_every_seconds
+
+class CheckpointCallback(Callback):
+    """
+    Keras callback which registers the files saved by a `ModelCheckpoint`
+    callback into a checkpoint registry, with the epoch metrics.
+
+    It must be placed after the `ModelCheckpoint` in the callbacks list, so
+    the file of an epoch is saved when it is registered. Epochs which don't
+    save a file, such as with `save_best_only`, aren't registered.
+
+    Parameters
+    ----------
+    registry : CheckpointRegistry
+        Registry of the experiment, from `Project.get_checkpoints`.
+    filepath : str
+        Path of the checkpoint files, the same as in `ModelCheckpoint`. It
+        may contain the epoch and the metrics as formatting options, such as
+        'model_{epoch:02d}.keras'.
+    """
+    def __init__(self, registry: CheckpointRegistry, filepath: str) -> None:
+        super().__init__()
+
+        self.registry = registry
+        self._filepath = filepath
+        # Path, modification time and size of the last registered file
+        self._last = None
+
+    def on_epoch_end(self, epoch: int, logs: Dict = None) -> None:
+        logs = logs or {}
+        # ModelCheckpoint numbers the epochs from 1
+        path = self._filepath.format(epoch=epoch + 1, **logs)
+
+        if not os.path.isfile(path) or self._get_version(path) == self._last:
+            return
+
+        self.registry.add(path, epoch, {name: value for name, value
+                                        in logs.items()
+                                        if np.isscalar(value)})
+        self._last = self._get_version(path)
+
+    def _get_version(self, path: str) -> tuple:
+        stat = os.stat(path)
+
+        return (path, stat.st_mtime_ns, stat.st_size)
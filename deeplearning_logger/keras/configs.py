@@ -1,10 +1,19 @@
 from abc import ABC, abstractmethod
 from typing import Callable, Any, Dict, Tuple, Union
 import numpy as np
-from typeguard import typechecked
-from tensorflow.keras.models import Model
-from tensorflow.keras.callbacks import Callback
-import pandas as pd
+from deeplearning_logger.architectures import ArchitectureCache
+from deeplearning_logger.imports import lazy_type
+from deeplearning_logger.validation import is_validation_enabled
+from deeplearning_logger.profiling import profiled
+
+# The frameworks are only imported by the user code creating their objects,
+# so reading experiments doesn't import them
+DataFrame = lazy_type('pandas', 'DataFrame')
+Model = lazy_type('tensorflow.keras.models', 'Model')
+Callback = lazy_type('tensorflow.keras.callbacks', 'Callback')
+
+# Architecture and hash of the models already captured
+_ARCHITECTURES = ArchitectureCache()
 
 class Config(ABC):
     """
@@ -20,12 +29,34 @@ class Config(ABC):
     _data : Any
         Data to be stored in an experiment.
     """
+    # Name of the config inside the experiment data
+    _NAME = ''
+
+    # Types of the data the config is created from besides a dictionary,
+    # empty to accept any data
+    _TYPES = ()
+
     def __init__(self, data: Any) -> None:
+        if self._TYPES and is_validation_enabled() and \
+                not isinstance(data, (dict,) + self._TYPES):
+            names = ', '.join(['dict'] + [data_type.__name__
+                                          for data_type in self._TYPES])
+            raise TypeError(f'The data of {self.__class__.__name__} must be '
+                            f'one of {names}, not {type(data).__name__}')
+
         if isinstance(data, Dict): # Creation from a config dictionary
-            self._config = data
+            self._config = (self._NAME, data)
         else:
             self._config = self.get_config(data)
 
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+
+        # The creation of each config type is counted by the profiler
+        if 'get_config' in cls.__dict__:
+            cls.get_config = profiled(f'{cls.__name__}.get_config')(
+                                                cls.__dict__['get_config'])
+
     @abstractmethod
     def get_config(self, data) -> Tuple[str, Dict]:
         pass
@@ -42,61 +73,303 @@ class MetricsConfig(Config):
     ----------
     data : pd.DataFrame
         DataFrame containing the model metrics
+    layout : str
+        Stored layout of the metrics. 'epochs' stores a dictionary for each
+        epoch, named 'epoch_N', while 'columns' stores a list of values for
+        each metric. Default is 'epochs'.
 
     Attributes
     ----------
     _data : pd.DataFrame
         DataFrame containing the model metrics
+    _layout : str
+        Stored layout of the metrics
     """
-    @typechecked
-    def __init__(self, data: Union[pd.DataFrame, Dict]) -> None:
+    _NAME = 'metrics'
+    _TYPES = (DataFrame,)
+    _LAYOUTS = ('epochs', 'columns')
+
+    def __init__(self, data: Union[DataFrame, Dict],
+                 layout: str = 'epochs') -> None:
+        if layout not in self._LAYOUTS:
+            raise ValueError(f'The layout must be one of {self._LAYOUTS}')
+
+        self._layout = layout
         super().__init__(data)
 
     def get_config(self, data):
-        config = {}
+        # Converts the whole DataFrame at once instead of row by row
+        values = data.to_numpy(dtype=np.float64)
+        columns = list(data.columns)
+
+        if self._layout == 'columns':
+            config = {column: values[:, idx].copy()
+                      for idx, column in enumerate(columns)}
+        else:
+            config = {f'epoch_{idx}': dict(zip(columns, row))
+                      for idx, row in zip(data.index, values.tolist())}
 
-        for idx, row in data.iterrows():
-            config[f'epoch_{idx}'] = {}
-            for column in data.columns:
-                config[f'epoch_{idx}'][column] = float(row.loc[column])
-        
         return ('metrics', config)
 
+    def get_columns(self) -> Dict[str, np.ndarray]:
+        """
+        Gets the metrics as one array per metric, whatever the stored layout.
+
+        Returns
+        -------
+        columns : Dict[str, np.ndarray]
+            Dictionary containing the values of each metric
+        """
+        _, config = self._config
+
+        if not config:
+            return {}
+
+        first = next(iter(config.values()))
+
+        # Columns layout, each value is already the metric series
+        if not isinstance(first, Dict):
+            return {metric: np.asarray(values, dtype=np.float64)
+                    for metric, values in config.items()}
+
+        epochs = list(config.values())
+        columns = {}
+
+        for metric in first:
+            # Missing values may be stored as null
+            columns[metric] = np.array([epoch[metric] for epoch in epochs],
+                                       dtype=np.float64)
+
+        return columns
+
+class BatchMetricsConfig(MetricsConfig):
+    """
+    MetricsConfig subclass to store the metrics of each training batch.
+    """
+    _NAME = 'batch_metrics'
+
+    def get_config(self, data):
+        _, config = super().get_config(data)
+
+        return ('batch_metrics', config)
+
 class ModelConfig(Config):
-    @typechecked
+    _NAME = 'model'
+    _TYPES = (Model,)
+
     def __init__(self, model: Union[Model, Dict]) -> None:
         super().__init__(model)
 
     def get_config(self, data):
-        model_architecture = data.get_config()
+        # The architecture of a model is serialized and hashed only once
+        model_hash, model_architecture = _ARCHITECTURES.get(
+                                data, lambda model: model.get_config(),
+                                version=_get_model_version(data))
         optimizer_config = data.optimizer.get_config()
 
         config = {
             'model_config': model_architecture,
-            'optimizer_config': optimizer_config
+            'optimizer_config': optimizer_config,
+            'model_hash': model_hash
         }
 
         return ('model', config)
 
+def _get_model_version(model: Model) -> Tuple:
+    """
+    Computes a key which changes when the architecture of a model changes,
+    without serializing it.
+
+    Parameters
+    ----------
+    model : Model
+        Keras model.
+
+    Returns
+    -------
+    version : Tuple
+        Whether the model is built, and the identity, name, trainable flag
+        and dtype of each layer, including the layers of nested models.
+    """
+    layers = []
+    pending = list(model.layers)
+
+    while pending:
+        layer = pending.pop()
+        layers.append((id(layer), layer.name, layer.trainable,
+                       str(getattr(layer, 'dtype', None))))
+        pending.extend(getattr(layer, 'layers', ()))
+
+    return (model.built, model.trainable, tuple(layers))
+
+def _encode_array(value: np.ndarray) -> Any:
+    # Arrays are kept whole, so the serializer writes them natively or the
+    # array store moves the large ones to sidecar files
+    return value.item() if value.ndim == 0 else value.copy()
+
+def _encode_tensor(value: Any) -> Any:
+    return _encode_array(np.asarray(value.numpy()))
+
+def _encode_torch_tensor(value: Any) -> Any:
+    return _encode_array(value.detach().cpu().numpy())
+
+# Handlers of the callback attributes by type, see `register_callback_handler`.
+# The last registered handler matching a type wins.
+_CALLBACK_HANDLERS = [
+    (object, str, None),
+    (Callable, None, None),
+    ((str, int, float, bool, type(None)), lambda value: value, None),
+    (np.generic, lambda value: value.item(), None),
+    (np.ndarray, _encode_array, None),
+    (lazy_type('tensorflow', 'Tensor'), _encode_tensor, None),
+    (lazy_type('tensorflow', 'Variable'), _encode_tensor, None),
+    (lazy_type('keras', 'Variable'), _encode_tensor, None),
+    (lazy_type('torch', 'Tensor'), _encode_torch_tensor, None)
+]
+# Handlers of each callback class, by attribute type
+_CALLBACK_DISPATCH = {}
+# Types whose lists are stored without converting their elements
+_JSON_SCALARS = {str, int, float, bool, type(None)}
+# Value of the attributes skipped by their handler
+_SKIPPED = object()
+
+def register_callback_handler(value_type: Union[type, Tuple[type]],
+                              handler: Callable[[Any], Any],
+                              callback_type: type = None) -> None:
+    """
+    Registers how CallbackConfig stores the callback attributes of a type.
+
+    Parameters
+    ----------
+    value_type : type or Tuple[type]
+        Type of the attributes, its subclasses included.
+    handler : Callable
+        Function which converts an attribute into a JSON serializable value
+        or a numpy array. None skips the attributes of the type.
+    callback_type : type
+        Callback class whose attributes are handled, its subclasses
+        included. Default is None, which handles the attributes of every
+        callback.
+    """
+    if handler is not None and not callable(handler):
+        raise TypeError('The handler must be callable or None')
+
+    _CALLBACK_HANDLERS.append((value_type, handler, callback_type))
+    # The handlers of every callback class are resolved again
+    _CALLBACK_DISPATCH.clear()
+
+def _resolve_callback_handler(callback_type: type,
+                              value_type: type) -> Callable[[Any], Any]:
+    for handled_type, handler, handled_callback in reversed(
+                                                        _CALLBACK_HANDLERS):
+        if handled_callback is not None and \
+                not issubclass(callback_type, handled_callback):
+            continue
+        if issubclass(value_type, handled_type):
+            # Subclasses of the containers without a handler of their own,
+            # such as OrderedDict or named tuples, are walked like them
+            if handled_type is object and issubclass(value_type, dict):
+                return _encode_mapping
+            if handled_type is object and \
+                    issubclass(value_type, (list, tuple)):
+                return _encode_sequence
+
+            return handler
+
 class CallbackConfig(Config):
-    @typechecked
+    """
+    Config subclass to store the public attributes of a callback.
+
+    Each attribute is converted by the handler of its type: numpy scalars
+    become numbers, arrays are kept whole and tensors are converted to
+    arrays, and objects without a handler are stored as their string. The
+    handlers of each callback class are resolved once per attribute type.
+    """
+    _NAME = 'callbacks'
+    _TYPES = (Callback,)
+
     def __init__(self, data: Union[Callback, Dict]) -> None:
         super().__init__(data)
 
     def get_config(self, data):
-        callback_attributes = data.__dict__
+        callback_type = type(data)
+        dispatch = _CALLBACK_DISPATCH.setdefault(callback_type, {})
         public_attributes = {}
 
-        for key,value in callback_attributes.items():
-            # We don't want to serialize public attributes. Also, Callables
-            # are not JSON serializable
-            if key[0] != '_' and not isinstance(value, Callable):
-                public_attributes[key] = value
+        for key, value in data.__dict__.items():
+            # Private attributes are not serialized
+            if key[0] == '_':
+                continue
+
+            value = _encode_attribute(value, callback_type, dispatch)
 
-        callback_name = data.__class__.__name__
+            if value is not _SKIPPED:
+                public_attributes[key] = value
 
         config = {
-            callback_name: public_attributes
+            callback_type.__name__: public_attributes
         }
 
-        return ('callbacks', config)
\ No newline at end of file
+        return ('callbacks', config)
+
+def _encode_attribute(value: Any, callback_type: type,
+                      dispatch: Dict[type, Callable]) -> Any:
+    """
+    Converts a callback attribute with the handler of its type.
+
+    Parameters
+    ----------
+    value : Any
+        Attribute value.
+    callback_type : type
+        Callback class.
+    dispatch : Dict[type, Callable]
+        Handlers of the callback class already resolved, by type. It is
+        updated with the handlers resolved.
+
+    Returns
+    -------
+    value : Any
+        Converted value, or `_SKIPPED` if the attribute is skipped.
+    """
+    value_type = type(value)
+
+    # The exact container types are checked first, as they are the most
+    # common attributes
+    if value_type is dict:
+        return _encode_mapping(value, callback_type, dispatch)
+    if value_type is list or value_type is tuple:
+        return _encode_sequence(value, callback_type, dispatch)
+
+    if value_type in dispatch:
+        handler = dispatch[value_type]
+    else:
+        handler = dispatch[value_type] = _resolve_callback_handler(
+                                                    callback_type, value_type)
+
+    if handler is _encode_mapping or handler is _encode_sequence:
+        return handler(value, callback_type, dispatch)
+
+    return _SKIPPED if handler is None else handler(value)
+
+def _encode_mapping(value: Dict, callback_type: type,
+                    dispatch: Dict[type, Callable]) -> Dict:
+    encoded = {}
+
+    for key, item in value.items():
+        item = _encode_attribute(item, callback_type, dispatch)
+
+        if item is not _SKIPPED:
+            encoded[key] = item
+
+    return encoded
+
+def _encode_sequence(value: Union[list, tuple], callback_type: type,
+                     dispatch: Dict[type, Callable]) -> Any:
+    # Lists of plain values, such as histories, are not copied
+    if all(type(item) in _JSON_SCALARS for item in value):
+        return value
+
+    return [item for item in (_encode_attribute(item, callback_type, dispatch)
+                              for item in value)
+            if item is not _SKIPPED]
\ No newline at end of file
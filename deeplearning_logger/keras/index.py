@@ -0,0 +1,230 @@
+import os
+import sqlite3
+import numpy as np
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple, Union
+
+class ProjectIndex():
+    """
+    SQLite index of the experiments inside a project.
+
+    The index holds the experiment summary fields and a few scalar values of
+    each metric, so listing and filtering experiments doesn't need to open
+    their files.
+
+    Parameters
+    ----------
+    project_folder_path : str
+        Path to the project folder.
+
+    Attributes
+    ----------
+    _path : str
+        Path to the index file.
+    _connection : sqlite3.Connection
+        Connection to the index database.
+    """
+    _FILENAME = 'project_index.sqlite'
+    _DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+    _REDUCTIONS = ('final', 'min', 'max')
+
+    def __init__(self, project_folder_path: str) -> None:
+        self._path = os.path.join(project_folder_path, self._FILENAME)
+        self._connection = sqlite3.connect(self._path, timeout=30)
+        self._create_tables()
+
+    def _create_tables(self) -> None:
+        with self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS experiments ('
+                'name TEXT PRIMARY KEY, description TEXT, datetime TEXT)')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS metrics ('
+                'experiment TEXT, metric TEXT, final REAL, min REAL, '
+                'max REAL, epochs INTEGER, PRIMARY KEY (experiment, metric))')
+            self._connection.execute(
+                'CREATE INDEX IF NOT EXISTS metrics_by_name '
+                'ON metrics (metric)')
+
+    def add(self, name: str, description: str, experiment_datetime: datetime,
+            metrics: Dict[str, np.ndarray]) -> None:
+        """
+        Adds an experiment to the index, replacing it if it already exists.
+
+        Parameters
+        ----------
+        name : str
+            Experiment name.
+        description : str
+            Experiment description.
+        experiment_datetime : datetime
+            Datetime the experiment was performed.
+        metrics : Dict[str, np.ndarray]
+            Values of each metric to index.
+        """
+        self.add_many([(name, description, experiment_datetime, metrics)])
+
+    def add_many(self, experiments: Iterable[Tuple]) -> None:
+        """
+        Adds several experiments to the index in a single transaction.
+
+        Parameters
+        ----------
+        experiments : Iterable[Tuple]
+            Tuples of name, description, datetime and metrics, as the `add`
+            arguments.
+        """
+        with self._connection:
+            for name, description, experiment_datetime, metrics in experiments:
+                self._connection.execute(
+                    'INSERT OR REPLACE INTO experiments VALUES (?, ?, ?)',
+                    (name, description,
+                     experiment_datetime.strftime(self._DATETIME_FORMAT)))
+                self._connection.execute(
+                    'DELETE FROM metrics WHERE experiment = ?', (name,))
+                self._connection.executemany(
+                    'INSERT INTO metrics VALUES (?, ?, ?, ?, ?, ?)',
+                    [(name, metric) + self._summarize(values)
+                     for metric, values in metrics.items() if len(values)])
+
+    def _summarize(self, values: np.ndarray) -> Tuple:
+        values = np.asarray(values, dtype=np.float64)
+
+        # A diverged run has no finite value, stored as NULL
+        if np.isnan(values).all():
+            return float(values[-1]), None, None, len(values)
+
+        return (float(values[-1]), float(np.nanmin(values)),
+                float(np.nanmax(values)), len(values))
+
+    def clear(self) -> None:
+        """
+        Removes every experiment from the index.
+        """
+        with self._connection:
+            self._connection.execute('DELETE FROM experiments')
+            self._connection.execute('DELETE FROM metrics')
+
+    def find(self, after: Union[datetime, str] = None,
+             before: Union[datetime, str] = None, description: str = None,
+             metric: str = None, top_k: int = None, mode: str = 'min',
+             reduction: str = 'final') -> List[str]:
+        """
+        Finds experiments using only the index.
+
+        Parameters
+        ----------
+        after : datetime or str
+            Only experiments performed at or after this datetime. Default is
+            None.
+        before : datetime or str
+            Only experiments performed before this datetime. Default is None.
+        description : str
+            Only experiments whose description contains this text. Default is
+            None.
+        metric : str
+            Only experiments with this metric, sorted by its value. Default
+            is None, which sorts the experiments by datetime.
+        top_k : int
+            Maximum number of experiments returned. Default is None.
+        mode : str
+            'min' sorts the metric in ascending order, 'max' in descending
+            order. Default is 'min'.
+        reduction : str
+            Metric value used to sort: 'final', 'min' or 'max'. Default is
+            'final'.
+
+        Returns
+        -------
+        experiment_names : List[str]
+            Names of the experiments found
+        """
+        if mode not in ('min', 'max'):
+            raise ValueError("The mode must be 'min' or 'max'")
+        if reduction not in self._REDUCTIONS:
+            raise ValueError(f'The reduction must be one of {self._REDUCTIONS}')
+
+        query = 'SELECT e.name FROM experiments e'
+        conditions, parameters = [], []
+
+        if metric is not None:
+            query += ' JOIN metrics m ON m.experiment = e.name'
+            conditions.append('m.metric = ?')
+            parameters.append(metric)
+        if after is not None:
+            conditions.append('e.datetime >= ?')
+            parameters.append(self._format_datetime(after))
+        if before is not None:
+            conditions.append('e.datetime < ?')
+            parameters.append(self._format_datetime(before))
+        if description is not None:
+            conditions.append("e.description LIKE ? ESCAPE '\\'")
+            escaped = description.replace('\\', '\\\\').replace('%', '\\%')\
+                                 .replace('_', '\\_')
+            parameters.append(f'%{escaped}%')
+
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+
+        if metric is not None:
+            order = 'ASC' if mode == 'min' else 'DESC'
+            # NaN values are stored as NULL, sorted last in both orders
+            query += f' ORDER BY m.{reduction} IS NULL, m.{reduction} {order}'
+        else:
+            query += ' ORDER BY e.datetime, e.name'
+
+        if top_k is not None:
+            query += ' LIMIT ?'
+            parameters.append(top_k)
+
+        cursor = self._connection.execute(query, parameters)
+
+        return [row[0] for row in cursor.fetchall()]
+
+    def summary(self, name: str) -> Dict:
+        """
+        Gets the indexed data of an experiment.
+
+        Parameters
+        ----------
+        name : str
+            Experiment name.
+
+        Returns
+        -------
+        summary : Dict
+            Dictionary containing the experiment summary fields and the
+            indexed values of each metric.
+        """
+        row = self._connection.execute(
+                'SELECT description, datetime FROM experiments WHERE name = ?',
+                (name,)).fetchone()
+
+        if row is None:
+            raise KeyError(f'The experiment {name} is not indexed')
+
+        metrics = self._connection.execute(
+                'SELECT metric, final, min, max, epochs FROM metrics '
+                'WHERE experiment = ?', (name,)).fetchall()
+
+        return {
+            'name': name,
+            'description': row[0],
+            'datetime': row[1],
+            'metrics': {metric: {'final': final, 'min': min_value,
+                                 'max': max_value, 'epochs': epochs}
+                        for metric, final, min_value, max_value, epochs
+                        in metrics}
+        }
+
+    def close(self) -> None:
+        """
+        Closes the connection to the index.
+        """
+        self._connection.close()
+
+    def _format_datetime(self, value: Union[datetime, str]) -> str:
+        if isinstance(value, datetime):
+            return value.strftime(self._DATETIME_FORMAT)
+
+        return value
@@ -1,9 +1,23 @@
-import json
-
 from datetime import date, datetime
-from typing import Dict, List
+from typing import Callable, Dict, List
 from deeplearning_logger.keras.configs import *
-from deeplearning_logger.json import ConfigsJSONEncoder
+from deeplearning_logger.keras.segments import SEGMENTS_FILE, \
+                                               append_segment, \
+                                               apply_segments, \
+                                               config_segment, \
+                                               extend_metrics_data, \
+                                               extend_segment, read_segments
+from deeplearning_logger.json import JSONSerializer
+from deeplearning_logger.arrays import ArrayStore
+from deeplearning_logger.architectures import ArchitectureStore
+from deeplearning_logger.files import FileLock, atomic_write, \
+                                      check_fsync_policy, commit_files
+from deeplearning_logger.writer import BackgroundWriter, snapshot
+from deeplearning_logger.profiling import profiled
+from deeplearning_logger.compression import check_compression, \
+                                            compress_stream, find_file, \
+                                            get_extension, get_variants, \
+                                            read_file
 
 class Experiment():
     """
@@ -17,6 +31,34 @@ class Experiment():
         Experiment name.
     configs : List
         Configurations list.
+    array_threshold : int
+        Minimum number of elements of a numeric series to be stored in a
+        sidecar .npy file instead of inline. Default is None, which stores
+        every series inline.
+    writer : BackgroundWriter
+        Writer running the serialization and writing of the experiment
+        files in a background thread. Default is None, which writes them in
+        the caller's thread.
+    serializer : JSONSerializer
+        Serializer of the experiment files. Default is None, which uses the
+        standard library json module with indentation.
+    architecture_store : ArchitectureStore
+        Store where the model architectures are written once, keeping only
+        their hash in the experiment. Default is None, which stores the
+        architecture inline.
+    fsync : str
+        'always' flushes the experiment files to disk before they become
+        visible, 'never' relies on atomic renames only. Default is 'never'.
+    compression : str
+        Compression of the experiment data file, 'gzip' or 'zstd'. Default
+        is None, which writes a plain JSON file.
+    enabled : bool
+        Whether this process writes the experiment files, False on the
+        ranks which don't log in the rank zero only mode. Default is True.
+    on_metrics_update : Callable
+        Function called with the experiment after its epoch metrics are
+        changed by add_config or extend_metrics, such as the update of the
+        project index. Default is None.
 
     Attributes
     ----------
@@ -30,16 +72,54 @@ class Experiment():
         Path which contains the experiment files.
     _configs : List
         Configurations list.
+    _array_threshold : int
+        Minimum number of elements of a series stored in a sidecar file.
+    _serializer : JSONSerializer
+        Serializer of the experiment files.
+    _architecture_store : ArchitectureStore
+        Store of the model architectures, or None to store them inline.
+    _writer : BackgroundWriter
+        Writer of the experiment files, or None to write them synchronously.
+    _fsync : str
+        fsync policy of the experiment files.
+    _compression : str
+        Compression of the experiment data file, or None.
+    _enabled : bool
+        Whether this process writes the experiment files.
+    _on_metrics_update : Callable
+        Function called after the epoch metrics change, or None.
+    _config_info_file : str
+        Experiment config file of a lazy experiment not loaded yet.
+    _config_data_file : str
+        Experiment data file of a lazy experiment not loaded yet.
+    _sections : Dict
+        Raw data of each config of a lazy experiment, or None if the data
+        file is not loaded yet.
+    _decoded : Dict
+        Configs of a lazy experiment already decoded, by name.
     """
 
+    # Attributes loaded from the experiment config file of lazy experiments
+    _INFO_ATTRIBUTES = ('_name', '_description', '_datetime')
+
     _CONFIGS_EQUIVALENCES = {
         'metrics': MetricsConfig,
+        'batch_metrics': BatchMetricsConfig,
         'model': ModelConfig,
         'callbacks': CallbackConfig
     }
 
     def __init__(self, experiment_path: str, name: str, configs: List[Config],
-                 description: str='', experiment_datetime : date = None) -> None:
+                 description: str='', experiment_datetime : date = None,
+                 array_threshold: int = None,
+                 writer: BackgroundWriter = None,
+                 serializer: JSONSerializer = None,
+                 architecture_store: ArchitectureStore = None,
+                 fsync: str = 'never', compression: str = None,
+                 enabled: bool = True,
+                 on_metrics_update: Callable = None) -> None:
+        check_fsync_policy(fsync)
+        check_compression(compression)
         self._description = description
 
         if experiment_datetime is None:
@@ -50,28 +130,260 @@ class Experiment():
         self._name = name
         self._experiment_path = experiment_path
         self._configs = configs
+        self._array_threshold = array_threshold
+        self._writer = writer
+        self._serializer = serializer or JSONSerializer()
+        self._architecture_store = architecture_store
+        self._fsync = fsync
+        self._compression = compression
+        self._enabled = enabled
+        self._on_metrics_update = on_metrics_update
+        self._config_info_file = None
+        self._config_data_file = None
+        self._sections = None
+        self._decoded = {}
+
+    def __getattr__(self, name: str):
+        # Only called for missing attributes, which are the ones of a lazy
+        # experiment whose files are not loaded yet
+        if name in self._INFO_ATTRIBUTES and \
+                self.__dict__.get('_config_info_file'):
+            self._load_experiment_config()
+            return self.__dict__[name]
+
+        if name == '_configs' and self.__dict__.get('_config_data_file'):
+            self._configs = [self.get_config(section)
+                             for section in self._get_sections()]
+            return self._configs
+
+        raise AttributeError(f'{self.__class__.__name__} object has no '
+                             f'attribute {name}')
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return self._description
+
+    @property
+    def datetime(self) -> datetime:
+        return self._datetime
+
+    @property
+    def configs(self) -> List[Config]:
+        return self._configs
+
+    @configs.setter
+    def configs(self, configs: List[Config]) -> None:
+        self._configs = configs
+        self._config_data_file = None
+        self._sections = None
+        self._decoded = {}
 
     @classmethod
     def by_config_files(cls, path: str, config_info_file: str,
-                        config_data_file: str):
-        print(config_data_file)
-        print(config_info_file)
-        experiment_data = cls._parse_config_file(config_data_file)
+                        config_data_file: str, array_threshold: int = None,
+                        lazy: bool = True,
+                        architecture_store: ArchitectureStore = None,
+                        writer: BackgroundWriter = None,
+                        serializer: JSONSerializer = None,
+                        fsync: str = 'never', compression: str = None,
+                        enabled: bool = True,
+                        on_metrics_update: Callable = None):
+        """
+        Creates an experiment from its config files.
+
+        Parameters
+        ----------
+        path : str
+            Path which contains the experiment files.
+        config_info_file : str
+            Path of the experiment config file.
+        config_data_file : str
+            Path of the experiment data file.
+        array_threshold : int
+            Minimum number of elements of a series stored in a sidecar file.
+            Default is None.
+        lazy : bool
+            If True, the experiment config file is loaded on the first
+            access to the name, description or datetime, and the data file
+            when the configs are accessed. Each config is decoded only when
+            it is requested. Default is True.
+        architecture_store : ArchitectureStore
+            Store of the model architectures referenced by their hash.
+            Default is None.
+        writer : BackgroundWriter
+            Writer of the experiment files when they are updated. Default is
+            None.
+        serializer : JSONSerializer
+            Serializer of the experiment files when they are updated.
+            Default is None.
+        fsync : str
+            fsync policy of the experiment files when they are updated.
+            Default is 'never'.
+        compression : str
+            Compression of the experiment data file when it is updated.
+            Default is None.
+        enabled : bool
+            Whether this process writes the experiment files when it is
+            updated. Default is True.
+        on_metrics_update : Callable
+            Function called with the experiment after its epoch metrics
+            change. Default is None.
+
+        Returns
+        -------
+        experiment : Experiment
+            Experiment stored in the files
+        """
+        check_fsync_policy(fsync)
+        check_compression(compression)
+
+        if lazy:
+            # A missing experiment is reported when it is opened, as the
+            # files are only read later
+            for config_file in (config_info_file, config_data_file):
+                if find_file(config_file) is None:
+                    raise FileNotFoundError(f'No such file: {config_file}')
+
+            experiment = cls.__new__(cls)
+            experiment._experiment_path = path
+            experiment._array_threshold = array_threshold
+            experiment._writer = writer
+            experiment._serializer = serializer or JSONSerializer()
+            experiment._architecture_store = architecture_store
+            experiment._fsync = fsync
+            experiment._compression = compression
+            experiment._enabled = enabled
+            experiment._on_metrics_update = on_metrics_update
+            experiment._config_info_file = config_info_file
+            experiment._config_data_file = config_data_file
+            experiment._sections = None
+            experiment._decoded = {}
+
+            return experiment
+
+        # Series stored in sidecar files are memory-mapped
+        array_store = ArrayStore(path)
+        experiment_data = cls._parse_config_file(config_data_file,
+                                                 array_store)
+        experiment_data = apply_segments(experiment_data, read_segments(path))
         experiment_config = cls._parse_config_file(config_info_file)
 
+        return cls.by_config_dicts(path, experiment_config, experiment_data,
+                                   array_threshold, architecture_store,
+                                   writer=writer, serializer=serializer,
+                                   fsync=fsync, compression=compression,
+                                   enabled=enabled,
+                                   on_metrics_update=on_metrics_update)
+
+    @classmethod
+    def by_config_dicts(cls, path: str, experiment_config: Dict,
+                        experiment_data: Dict, array_threshold: int = None,
+                        architecture_store: ArchitectureStore = None,
+                        writer: BackgroundWriter = None,
+                        serializer: JSONSerializer = None,
+                        fsync: str = 'never', compression: str = None,
+                        enabled: bool = True,
+                        on_metrics_update: Callable = None):
+        """
+        Creates an experiment from the decoded content of its config files.
+
+        Parameters
+        ----------
+        path : str
+            Path which contains the experiment files.
+        experiment_config : Dict
+            Content of the experiment config file.
+        experiment_data : Dict
+            Content of the experiment data file.
+        array_threshold : int
+            Minimum number of elements of a series stored in a sidecar file.
+            Default is None.
+        architecture_store : ArchitectureStore
+            Store of the model architectures referenced by their hash.
+            Default is None.
+        writer : BackgroundWriter
+            Writer of the experiment files when they are updated. Default is
+            None.
+        serializer : JSONSerializer
+            Serializer of the experiment files when they are updated.
+            Default is None.
+        fsync : str
+            fsync policy of the experiment files when they are updated.
+            Default is 'never'.
+        compression : str
+            Compression of the experiment data file when it is updated.
+            Default is None.
+        enabled : bool
+            Whether this process writes the experiment files when it is
+            updated. Default is True.
+        on_metrics_update : Callable
+            Function called with the experiment after its epoch metrics
+            change. Default is None.
+
+        Returns
+        -------
+        experiment : Experiment
+            Experiment described by the dictionaries
+        """
         name, description, datetime = cls._parse_experiment_config(
                                                             experiment_config)
+
+        if 'model' in experiment_data:
+            experiment_data = dict(experiment_data)
+            experiment_data['model'] = cls._load_architecture(
+                                    experiment_data['model'], architecture_store)
+
         configs = cls._parse_experiment_data(experiment_data)
 
         return cls(experiment_path=path, name=name,
                    description=description, experiment_datetime=datetime,
-                   configs=configs)
+                   configs=configs, array_threshold=array_threshold,
+                   writer=writer, serializer=serializer,
+                   architecture_store=architecture_store,
+                   fsync=fsync, compression=compression, enabled=enabled,
+                   on_metrics_update=on_metrics_update)
+
     @classmethod
-    def _parse_config_file(cls, config_file):
-        with open(config_file, 'r') as file:
-            config = json.load(file)
+    def _load_architecture(cls, model_data: Dict,
+                           architecture_store: ArchitectureStore) -> Dict:
+        """
+        Loads the model architecture referenced by its hash from the store.
+
+        Parameters
+        ----------
+        model_data : Dict
+            Data of the model config.
+        architecture_store : ArchitectureStore
+            Store of the model architectures.
+
+        Returns
+        -------
+        model_data : Dict
+            Data of the model config including the architecture.
+        """
+        if architecture_store is None or 'model_config' in model_data or \
+                'model_hash' not in model_data:
+            return model_data
 
-        return config
+        model_data = dict(model_data)
+        model_data['model_config'] = architecture_store.get(
+                                                    model_data['model_hash'])
+
+        return model_data
+
+    @classmethod
+    def _parse_config_file(cls, config_file, array_store=None):
+        # The file may be stored compressed
+        content = read_file(config_file)
+
+        if array_store is None:
+            return JSONSerializer().loads(content)
+
+        return array_store.decode(content, JSONSerializer())
 
     @classmethod
     def _parse_experiment_data(cls, experiment_data: Dict):
@@ -92,10 +404,224 @@ class Experiment():
 
         return new_name, new_description, new_datetime
 
+    def get_config(self, name: str) -> Config:
+        """
+        Gets a config of the experiment by its name. The configs of a lazy
+        experiment are decoded the first time they are requested.
+
+        Parameters
+        ----------
+        name : str
+            Config name, such as 'metrics', 'model' or 'callbacks'.
+
+        Returns
+        -------
+        config : Config
+            Config with that name.
+        """
+        if not self.__dict__.get('_config_data_file'):
+            for config in self._configs:
+                if config.config[0] == name:
+                    return config
+
+            raise KeyError(f'The experiment has no {name} config')
+
+        if name not in self._decoded:
+            sections = self._get_sections()
+
+            if name not in sections:
+                raise KeyError(f'The experiment has no {name} config')
+
+            data = sections[name]
+
+            if name == 'model':
+                data = self._load_architecture(data, self._architecture_store)
+
+            self._decoded[name] = self._CONFIGS_EQUIVALENCES[name](data)
+
+        return self._decoded[name]
+
+    def _load_experiment_config(self) -> None:
+        """
+        Loads the experiment config file of a lazy experiment.
+        """
+        experiment_config = self._parse_config_file(self._config_info_file)
+        name, description, datetime = self._parse_experiment_config(
+                                                            experiment_config)
+        self._name = name
+        self._description = description
+        self._datetime = datetime
+
+    def _get_sections(self) -> Dict:
+        """
+        Gets the raw data of each config of a lazy experiment, loading the
+        experiment data file the first time.
+
+        Returns
+        -------
+        sections : Dict
+            Raw data of each config, by name.
+        """
+        if self._sections is None:
+            # Series stored in sidecar files are memory-mapped
+            array_store = ArrayStore(self._experiment_path)
+            sections = self._parse_config_file(self._config_data_file,
+                                               array_store)
+            # Changes appended after the data file was written
+            self._sections = apply_segments(sections, read_segments(
+                                                    self._experiment_path))
+
+        return self._sections
+
+    def add_config(self, config: Config) -> None:
+        """
+        Adds a config to a registered experiment, replacing the config with
+        the same name. Only the new config is written, appended to the
+        segments file of the experiment.
+
+        Parameters
+        ----------
+        config : Config
+            Config to add.
+        """
+        if not isinstance(config, Config):
+            raise ValueError(f'{config.__class__.__name__} is not a Config '
+                             'object')
+
+        name, data = config.config
+        self._load_for_update(name)
+        self._append_segment(config_segment(name, data))
+        self._set_config(name, data, config)
+        self._notify_metrics_update(name)
+
+    def extend_metrics(self, data: DataFrame, initial_epoch: int = None,
+                       name: str = 'metrics') -> None:
+        """
+        Appends epochs to the metrics of a registered experiment, such as the
+        history of a resumed training. Only the new epochs are written,
+        appended to the segments file of the experiment.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            DataFrame containing the metrics of the new epochs.
+        initial_epoch : int
+            Epoch of the first new row. The stored epochs from it onwards
+            are replaced. Default is None, which appends after the stored
+            epochs.
+        name : str
+            Metrics config name, 'metrics' or 'batch_metrics'. Default is
+            'metrics'.
+        """
+        if name not in ('metrics', 'batch_metrics'):
+            raise ValueError('The name must be metrics or batch_metrics')
+
+        columns = {column: data[column].to_numpy(dtype=np.float64)
+                   for column in data.columns}
+        self._load_for_update(name)
+        self._append_segment(extend_segment(name, columns, initial_epoch))
+
+        # Updates the configs already in memory
+        if self.__dict__.get('_config_data_file'):
+            if self._sections is None:
+                return
+            stored = self._sections.get(name, {})
+        else:
+            stored = next((config.config[1] for config in self._configs
+                           if config.config[0] == name), {})
+
+        self._set_config(name, extend_metrics_data(stored, columns,
+                                                   initial_epoch))
+        self._notify_metrics_update(name)
+
+    def _notifies_update(self, name: str) -> bool:
+        # Only the epoch metrics are reported, as the batch ones are not
+        # indexed
+        return self._enabled and name == 'metrics' and \
+            self._on_metrics_update is not None
+
+    def _load_for_update(self, name: str) -> None:
+        """
+        Loads the data file of a lazy experiment before a change reported to
+        on_metrics_update, as the appended segment may not be written yet
+        when the function reads the metrics.
+
+        Parameters
+        ----------
+        name : str
+            Name of the config changed.
+        """
+        if self._notifies_update(name) and \
+                self.__dict__.get('_config_data_file'):
+            self._get_sections()
+
+    def _notify_metrics_update(self, name: str) -> None:
+        if self._notifies_update(name):
+            self._on_metrics_update(self)
+
+    def compact(self) -> None:
+        """
+        Rewrites the experiment files with every appended change merged, and
+        removes the segments file.
+        """
+        self.register_experiment()
+
+    @profiled('Experiment.append_segment')
+    def _append_segment(self, segment: Dict) -> None:
+        # The ranks which don't log never created the experiment folder
+        if not self._enabled:
+            return
+
+        if self._writer is None:
+            append_segment(self._experiment_path, segment, self._fsync)
+        else:
+            # A segment is an increment, discarding it would lose changes
+            self._writer.submit(append_segment, self._experiment_path,
+                                snapshot(segment), self._fsync,
+                                required=True)
+
+    def _set_config(self, name: str, data: Dict,
+                    config: Config = None) -> None:
+        """
+        Replaces a config of the experiment in memory.
+
+        Parameters
+        ----------
+        name : str
+            Config name.
+        data : Dict
+            Config data.
+        config : Config
+            Config object. Default is None, which creates it from the data.
+        """
+        if config is None:
+            config = self._CONFIGS_EQUIVALENCES[name](data)
+
+        if self.__dict__.get('_config_data_file'):
+            # Lazy experiments whose data is not loaded read the segment
+            if self._sections is None:
+                return
+
+            self._sections[name] = data
+            self._decoded[name] = config
+
+            if '_configs' not in self.__dict__:
+                return
+
+        configs = [element for element in self._configs
+                   if element.config[0] != name]
+        configs.append(config)
+        self._configs = configs
+
+    @profiled('Experiment.register_experiment')
     def register_experiment(self) -> None:
         """
-        Registers the experiment data
+        Registers the experiment data. Nothing is written by the ranks which
+        don't log in the rank zero only mode.
         """
+        if not self._enabled:
+            return
+
         # Obtains the experiment configs
         experiment_config = self._create_experiment_config()
         experiment_data = {}
@@ -109,9 +635,84 @@ class Experiment():
             name, data = config_element.config
             experiment_data[name] = data
 
-        # Write the experiments config
-        self._write_json_file('experiment_config.json', experiment_config)
-        self._write_json_file('experiment_data.json', experiment_data)
+        if self._writer is None:
+            self._write_experiment_files(experiment_config, experiment_data)
+        else:
+            self._writer.submit(self._write_experiment_files,
+                                experiment_config, snapshot(experiment_data))
+
+    @profiled('Experiment.write_experiment_files')
+    def _write_experiment_files(self, experiment_config: Dict,
+                                experiment_data: Dict) -> None:
+        """
+        Writes the experiment config and data files.
+
+        Parameters
+        ----------
+        experiment_config : Dict
+            Dictionary containing the experiment description
+        experiment_data : Dict
+            Dictionary containing the data of each config
+        """
+        if self._architecture_store is not None and \
+                'model_config' in experiment_data.get('model', {}):
+            experiment_data = dict(experiment_data)
+            experiment_data['model'] = self._store_architecture(
+                                                    experiment_data['model'])
+
+        config_content = self._serializer.dumps(experiment_config)
+        data_filename = 'experiment_data.json' + \
+                            get_extension(self._compression)
+
+        # Other processes may be writing the same experiment
+        with FileLock(self._experiment_path):
+            sidecar_files = {}
+
+            if self._array_threshold is not None:
+                array_store = ArrayStore(self._experiment_path,
+                                         self._array_threshold)
+                experiment_data = array_store.externalize(
+                                        experiment_data, files=sidecar_files)
+
+            def write_data(file):
+                # The data is compressed while it is serialized
+                with compress_stream(file, self._compression) as stream:
+                    self._serializer.dump(experiment_data, stream)
+
+                return file.tell()
+
+            # Both files and the sidecar files are replaced together, so a
+            # crash never leaves the config or the series of one version next
+            # to the data of another. The data file stored in another format
+            # is removed by the same commit.
+            commit_files(self._experiment_path, {
+                'experiment_config.json': config_content,
+                data_filename: write_data,
+                **sidecar_files
+            }, self._fsync, remove=get_variants('experiment_data.json') +
+                                   [SEGMENTS_FILE])
+
+    def _store_architecture(self, model_data: Dict) -> Dict:
+        """
+        Writes the model architecture into the architecture store, keeping
+        only its hash in the model config.
+
+        Parameters
+        ----------
+        model_data : Dict
+            Data of the model config.
+
+        Returns
+        -------
+        model_data : Dict
+            Data of the model config without the architecture.
+        """
+        model_data = dict(model_data)
+        architecture = model_data.pop('model_config')
+        model_data['model_hash'] = self._architecture_store.put(
+                                    architecture, model_data.get('model_hash'))
+
+        return model_data
 
     def _create_experiment_config(self) -> Dict:
         """
@@ -132,6 +733,7 @@ class Experiment():
 
         return experiment_config
 
+    @profiled('Experiment.write_json_file')
     def _write_json_file(self, filename: str, config_data: Dict) -> None:
         """
         Write a given configuration data into a JSON file.
@@ -143,5 +745,5 @@ class Experiment():
         config_data : Dict
             Data to write into the JSOn file
         """
-        with open(self._experiment_path + filename, 'w') as outfile:  
-            json.dump(config_data, outfile, indent=4, cls=ConfigsJSONEncoder)
\ No newline at end of file
+        atomic_write(self._experiment_path + filename,
+                     self._serializer.dumps(config_data), self._fsync)
\ No newline at end of file
@@ -1,9 +1,34 @@
 from deeplearning_logger.keras.keras_logger import Experiment
-from deeplearning_logger.keras.configs import Config
-from typing import List
+from deeplearning_logger.keras.configs import Config, MetricsConfig
+from deeplearning_logger.keras.index import ProjectIndex
+from deeplearning_logger.keras.segments import SEGMENTS_FILE, \
+                                               apply_segments, \
+                                               decode_segments, read_segments
+from deeplearning_logger.keras.sweep import Sweep
+from deeplearning_logger.comparison import MetricComparison, \
+                                           get_metric_series
+from deeplearning_logger.diff import ExperimentDiff, ExperimentsDiff, \
+                                     diff_many, diff_metrics, diff_trees
+from deeplearning_logger.arrays import ArrayStore, has_references
+from deeplearning_logger.architectures import ArchitectureStore
+from deeplearning_logger.checkpoints import CHECKPOINTS_FILE, BlobStore, \
+                                            CheckpointRegistry, \
+                                            check_dedup_mode
+from deeplearning_logger.json import JSONSerializer
+from deeplearning_logger.files import FileLock, check_fsync_policy, \
+                                      recover_folder
+from deeplearning_logger.distributed import get_rank
+from deeplearning_logger.writer import BackgroundWriter
+from deeplearning_logger.compression import check_compression, read_file
+from deeplearning_logger.streaming import iter_epochs, iter_metric, \
+                                          read_metric, read_section
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Tuple, Union
 
 import os
 import glob
+import numpy as np
 
 class Project():
     """
@@ -15,6 +40,52 @@ class Project():
         Project name
     proejct_path : str
         Path where to create the project.
+    array_threshold : int
+        Minimum number of elements of a numeric series to be stored in a
+        sidecar .npy file instead of inline. Default is None, which stores
+        every series inline.
+    index_metrics : List[str]
+        Metrics whose final, minimum and maximum values are stored in the
+        project index. Default is None, which indexes every metric.
+    writer : BackgroundWriter
+        Writer running the serialization and writing of the experiment
+        files in a background thread. Default is None, which writes them in
+        the caller's thread.
+    serializer : JSONSerializer
+        Serializer of the experiment files. Default is None, which uses the
+        standard library json module with indentation.
+    dedup_architectures : bool
+        If True, each distinct model architecture is written once into the
+        project '.architectures' folder, and the experiments only keep its
+        hash. Default is False.
+    fsync : str
+        'always' flushes the experiment files to disk before they become
+        visible, which survives power losses. 'never' relies on atomic
+        renames only, which survives killed processes and is much faster.
+        Default is 'never'.
+    recover : bool
+        If True, an experiment left half-written by a process that died is
+        repaired the first time the project accesses it, so the cost doesn't
+        depend on the size of the project. `recover` repairs every experiment
+        at once. Default is True.
+    compression : str
+        Compression of the experiment data files, 'gzip' or 'zstd'. The
+        experiments are read whatever their compression. Default is None,
+        which writes plain JSON files.
+    rank_zero_only : bool
+        If True, only the process of rank 0 of a distributed training writes
+        the experiments, and the other ranks skip every write. Default is
+        False.
+    rank : int
+        Rank of the process. Default is None, which reads the RANK
+        environment variable.
+    checkpoint_dedup : str
+        How the registered checkpoints are deduplicated into the project
+        '.checkpoints' folder: 'copy', 'link' or None, see
+        `check_dedup_mode`. Default is None, which only hashes the
+        checkpoints. 'copy' stores a second copy of every distinct
+        checkpoint, doubling their disk use, and 'link' takes no extra space
+        but requires each checkpoint file to be written once.
 
     Attributes
     ----------
@@ -24,10 +95,57 @@ class Project():
         Project name
     _project_folder_path : str
         Path to the project folder
+    _array_threshold : int
+        Minimum number of elements of a series stored in a sidecar file.
+    _index_metrics : List[str]
+        Metrics stored in the project index.
+    _index : ProjectIndex
+        Project index, opened on its first use.
+    _writer : BackgroundWriter
+        Writer of the experiment files, or None to write them synchronously.
+    _serializer : JSONSerializer
+        Serializer of the experiment files.
+    _architecture_store : ArchitectureStore
+        Store of the model architectures, or None to store them inline.
+    _fsync : str
+        fsync policy of the experiment files.
+    _compression : str
+        Compression of the experiment data files, or None.
+    _enabled : bool
+        Whether this process writes the experiments.
+    _checkpoint_store : BlobStore
+        Store of the checkpoint contents, or None to only hash them.
+    _recover : bool
+        Whether the experiments are repaired when they are first accessed.
+    _recovered : Set[str]
+        Experiments already repaired, or found clean.
     """
-    def __init__(self, project_name: str, project_path: str = '') -> None:
+    _ARCHITECTURES_FOLDER = '.architectures'
+    _CHECKPOINTS_FOLDER = '.checkpoints'
+    _SWEEPS_FOLDER = '.sweeps'
+
+    def __init__(self, project_name: str, project_path: str = '',
+                 array_threshold: int = None,
+                 index_metrics: List[str] = None,
+                 writer: BackgroundWriter = None,
+                 serializer: JSONSerializer = None,
+                 dedup_architectures: bool = False, fsync: str = 'never',
+                 recover: bool = True, compression: str = None,
+                 rank_zero_only: bool = False, rank: int = None,
+                 checkpoint_dedup: str = None) -> None:
+        check_fsync_policy(fsync)
+        check_compression(compression)
+        check_dedup_mode(checkpoint_dedup)
         self._project_path = project_path
         self._project_name = project_name
+        self._array_threshold = array_threshold
+        self._index_metrics = index_metrics
+        self._index = None
+        self._writer = writer
+        self._serializer = serializer
+        self._fsync = fsync
+        self._compression = compression
+        self._enabled = not rank_zero_only or get_rank(rank) == 0
 
         if not project_path:
             project_path = os.getcwd()
@@ -35,9 +153,26 @@ class Project():
         self._project_folder_path = self._create_folder([project_path,
                                                         project_name])
 
+        if dedup_architectures:
+            self._architecture_store = ArchitectureStore(
+                self._project_folder_path + self._ARCHITECTURES_FOLDER)
+        else:
+            self._architecture_store = None
+
+        if checkpoint_dedup is not None:
+            self._checkpoint_store = BlobStore(
+                self._project_folder_path + self._CHECKPOINTS_FOLDER,
+                checkpoint_dedup)
+        else:
+            self._checkpoint_store = None
+
+        self._recover = recover and self._enabled
+        self._recovered = set()
+
     def create_experiment(self, experiment_name: str = '',
                         configs: List[Config] = [],
-                        description: str = '') -> None:
+                        description: str = '',
+                        exist_ok: bool = True) -> Experiment:
         """
         Creates an experiment inside the project.
 
@@ -47,6 +182,18 @@ class Project():
             Experiment's name. Default is an empty string.
         configs : List
             Configurations list. Default is an empty list.
+        description : str
+            Experiment's description. Default is an empty string.
+        exist_ok : bool
+            If False, the experiment folder is created atomically and a
+            ValueError is raised if it already exists, so only one of the
+            processes creating the same experiment succeeds. If True, an
+            existing experiment is replaced. Default is True.
+
+        Returns
+        -------
+        experiment : Experiment
+            Experiment created.
         """
         if not experiment_name:
             raise ValueError('Must use a non empty experiment name')
@@ -54,30 +201,462 @@ class Project():
             raise ValueError('The configurations list is empty,' \
                             'there are nothing to log')
         
-        # Create the experiment folder
-        experiment_folder_path = self._create_folder([self._project_folder_path,
-                                                    experiment_name])
+        # A folder left half-written by a dead process is repaired first
+        experiment_folder_path = self._get_experiment_folder(experiment_name)
+
+        if self._enabled and exist_ok:
+            # Create the experiment folder
+            experiment_folder_path = self._create_folder(
+                                [self._project_folder_path, experiment_name])
+        elif self._enabled:
+            experiment_folder_path = self._create_experiment_folder(
+                                                            experiment_name)
+
         # Register the experiment
         experiment = Experiment(experiment_path=experiment_folder_path,
                                 name=experiment_name,
                                 configs=configs,
-                                description=description)
+                                description=description,
+                                array_threshold=self._array_threshold,
+                                writer=self._writer,
+                                serializer=self._serializer,
+                                architecture_store=self._architecture_store,
+                                fsync=self._fsync,
+                                compression=self._compression,
+                                enabled=self._enabled,
+                                on_metrics_update=self._index_experiment)
+        self.update_experiment(experiment)
+
+        return experiment
+
+    def update_experiment(self, experiment: Experiment) -> None:
+        """
+        Writes again the files of an experiment of the project, after its
+        configs changed, and updates it in the project index. Nothing is
+        written by the ranks which don't log in the rank zero only mode.
+
+        Parameters
+        ----------
+        experiment : Experiment
+            Experiment created in the project.
+        """
+        if not self._enabled:
+            return
+
         experiment.register_experiment()
 
-    def open_experiment(self, experiment_name: str) -> Experiment:
+        self._get_index().add(experiment.name, experiment.description,
+                              experiment.datetime,
+                              self._get_index_metrics(experiment.configs))
+
+    def _index_experiment(self, experiment: Experiment) -> None:
+        """
+        Updates an experiment in the project index after its epoch metrics
+        were extended or replaced.
+
+        Parameters
+        ----------
+        experiment : Experiment
+            Experiment of the project.
+        """
+        self._get_index().add(experiment.name, experiment.description,
+                              experiment.datetime,
+                              self._get_index_metrics(
+                                    [experiment.get_config('metrics')]))
+
+    def open_experiment(self, experiment_name: str,
+                        lazy: bool = True) -> Experiment:
+        """
+        Opens an experiment of the project.
+
+        Parameters
+        ----------
+        experiment_name : str
+            Experiment's name.
+        lazy : bool
+            If True, the experiment files are loaded when their content is
+            first accessed. Default is True.
+
+        Returns
+        -------
+        experiment : Experiment
+            Experiment stored in the project.
+        """
         # Create the experiment folder path
-        experiment_folder = self._project_folder_path + experiment_name
+        experiment_folder = self._get_experiment_folder(experiment_name)
         # Create the experiment config files path
-        experiment_data_file = experiment_folder + '/experiment_data.json'
-        experiment_config_file = experiment_folder + '/experiment_config.json'
+        experiment_data_file = experiment_folder + 'experiment_data.json'
+        experiment_config_file = experiment_folder + 'experiment_config.json'
 
         experiment = Experiment.by_config_files(
                                 path=experiment_folder,
                                 config_info_file=experiment_config_file,
-                                config_data_file=experiment_data_file)
+                                config_data_file=experiment_data_file,
+                                array_threshold=self._array_threshold,
+                                lazy=lazy,
+                                architecture_store=self._architecture_store,
+                                writer=self._writer,
+                                serializer=self._serializer,
+                                fsync=self._fsync,
+                                compression=self._compression,
+                                enabled=self._enabled,
+                                on_metrics_update=self._index_experiment)
 
         return experiment
 
+    def open_experiments(self, experiment_names: List[str], workers: int = 4,
+                         processes: int = 0) -> List[Union[Experiment,
+                                                           Exception]]:
+        """
+        Opens several experiments at the same time. The files are read by a
+        thread pool and decoded either by the same threads or by a process
+        pool, and the experiments are fully loaded.
+
+        Parameters
+        ----------
+        experiment_names : List[str]
+            Names of the experiments to open.
+        workers : int
+            Number of threads reading the files. Default is 4.
+        processes : int
+            Number of processes decoding the files. Default is 0, which
+            decodes them in the reading threads.
+
+        Returns
+        -------
+        experiments : List[Experiment or Exception]
+            Experiments in the same order as the names. The experiments that
+            could not be opened are replaced by the exception raised, so an
+            error doesn't abort the rest of the batch.
+        """
+        folders = [self._get_experiment_folder(experiment_name)
+                   for experiment_name in experiment_names]
+
+        with ThreadPoolExecutor(max_workers=workers) as threads:
+            contents = list(threads.map(_read_experiment_files, folders))
+
+            if processes:
+                with ProcessPoolExecutor(max_workers=processes) as pool:
+                    decoded = list(pool.map(_decode_experiment_files,
+                                            contents, chunksize=8))
+            else:
+                decoded = list(threads.map(_decode_experiment_files,
+                                           contents))
+
+        experiments = []
+
+        for folder, content, result in zip(folders, contents, decoded):
+            if isinstance(result, Exception):
+                experiments.append(result)
+                continue
+
+            experiment_config, experiment_data, segments = result
+
+            try:
+                # Only walk the data when it references sidecar files
+                if has_references(content[1]):
+                    experiment_data = ArrayStore(folder).internalize(
+                                                            experiment_data)
+
+                experiment_data = apply_segments(experiment_data, segments)
+
+                experiments.append(Experiment.by_config_dicts(
+                                    folder, experiment_config, experiment_data,
+                                    array_threshold=self._array_threshold,
+                                    architecture_store=self._architecture_store,
+                                    writer=self._writer,
+                                    serializer=self._serializer,
+                                    fsync=self._fsync,
+                                    compression=self._compression,
+                                    enabled=self._enabled,
+                                    on_metrics_update=self._index_experiment))
+            except Exception as exception:
+                experiments.append(exception)
+
+        return experiments
+
+    def compare(self, metric: str, experiments: List[str] = None,
+                workers: int = 4) -> MetricComparison:
+        """
+        Compares a metric across experiments, aligned by epoch.
+
+        Only the metrics of each experiment are decoded, the other configs
+        are never built, and the files are read by a thread pool.
+
+        Parameters
+        ----------
+        metric : str
+            Name of the metric, such as 'val_loss'.
+        experiments : List[str]
+            Names of the experiments to compare. Default is None, which
+            compares every experiment of the project.
+        workers : int
+            Number of threads reading the files. Default is 4.
+
+        Returns
+        -------
+        comparison : MetricComparison
+            Values of the metric in each experiment, with its reductions.
+        """
+        if experiments is None:
+            experiments = sorted(self.list_experiments())
+
+        folders = [self._get_experiment_folder(experiment_name)
+                   for experiment_name in experiments]
+
+        with ThreadPoolExecutor(max_workers=workers) as threads:
+            series = list(threads.map(
+                            lambda folder: _read_metric_series(folder, metric),
+                            folders))
+
+        return MetricComparison(metric, experiments, series)
+
+    def diff(self, old_experiment: str, new_experiment: str) -> ExperimentDiff:
+        """
+        Compares two experiments: the values of their model, optimizer,
+        callbacks and other configs, and the differences of their metrics.
+
+        Parameters
+        ----------
+        old_experiment : str
+            Name of the experiment compared against.
+        new_experiment : str
+            Name of the compared experiment.
+
+        Returns
+        -------
+        diff : ExperimentDiff
+            Changed config values and statistics of each metric.
+        """
+        (old_tree, old_columns), (new_tree, new_columns) = \
+                self._get_diff_data([old_experiment, new_experiment])
+
+        return ExperimentDiff([old_experiment, new_experiment],
+                              diff_trees(old_tree, new_tree),
+                              diff_metrics(old_columns, new_columns))
+
+    def diff_many(self, experiments: List[str] = None,
+                  workers: int = 4) -> ExperimentsDiff:
+        """
+        Compares several experiments: the config values which are not equal
+        in all of them, and reductions of each metric.
+
+        Parameters
+        ----------
+        experiments : List[str]
+            Names of the experiments. Default is None, which compares every
+            experiment of the project.
+        workers : int
+            Number of threads reading the files. Default is 4.
+
+        Returns
+        -------
+        diff : ExperimentsDiff
+            Differing config values and metrics of each experiment.
+        """
+        if experiments is None:
+            experiments = sorted(self.list_experiments())
+
+        data = self._get_diff_data(experiments, workers)
+
+        return diff_many({name: tree for name, (tree, _) in
+                          zip(experiments, data)},
+                         {name: columns for name, (_, columns) in
+                          zip(experiments, data)})
+
+    def read_section(self, experiment_name: str, name: str) -> Any:
+        """
+        Reads the data of a single config of an experiment, streaming the
+        data file so the other configs are skipped without being decoded.
+
+        Parameters
+        ----------
+        experiment_name : str
+            Experiment's name.
+        name : str
+            Config name, such as 'metrics' or 'model'.
+
+        Returns
+        -------
+        data : Any
+            Stored data of the config.
+        """
+        folder = self._get_experiment_folder(experiment_name)
+        segments = [segment for segment in read_segments(folder)
+                    if segment['name'] == name]
+
+        try:
+            data = read_section(folder + 'experiment_data.json', name)
+        except KeyError:
+            # The config may only be stored in the segments
+            if not segments:
+                raise
+            data = {}
+
+        return apply_segments({name: data}, segments)[name]
+
+    def iter_metric(self, experiment_name: str, metric: str,
+                    name: str = 'metrics') -> Iterator[float]:
+        """
+        Iterates the values of a metric of an experiment, streaming the data
+        file so the memory doesn't depend on the number of epochs.
+
+        Parameters
+        ----------
+        experiment_name : str
+            Experiment's name.
+        metric : str
+            Metric name, such as 'val_loss'.
+        name : str
+            Metrics config, 'metrics' or 'batch_metrics'. Default is
+            'metrics'.
+
+        Returns
+        -------
+        values : Iterator[float]
+            Value of the metric in each epoch, None or NaN if an epoch
+            doesn't have it.
+        """
+        folder = self._get_experiment_folder(experiment_name)
+
+        # Appended epochs may replace stored ones, so an experiment with
+        # segments is read whole. Compacting it restores the streaming.
+        if any(segment['name'] == name for segment in read_segments(folder)):
+            return iter(get_metric_series(
+                            self.read_section(experiment_name, name), metric))
+
+        return iter_metric(folder + 'experiment_data.json', metric, name)
+
+    def iter_epochs(self, experiment_name: str,
+                    name: str = 'metrics') -> Iterator[Tuple[int, Dict]]:
+        """
+        Iterates the epochs of an experiment, decoding one epoch at a time
+        when the metrics are stored with the epochs layout.
+
+        Parameters
+        ----------
+        experiment_name : str
+            Experiment's name.
+        name : str
+            Metrics config, 'metrics' or 'batch_metrics'. Default is
+            'metrics'.
+
+        Returns
+        -------
+        epochs : Iterator[Tuple[int, Dict]]
+            Epoch number and value of each metric in the epoch.
+        """
+        folder = self._get_experiment_folder(experiment_name)
+
+        if any(segment['name'] == name for segment in read_segments(folder)):
+            return _iter_epochs_data(self.read_section(experiment_name, name))
+
+        return iter_epochs(folder + 'experiment_data.json', name)
+
+    def get_checkpoints(self, experiment_name: str,
+                        monitor: str = 'val_loss',
+                        mode: str = 'min') -> CheckpointRegistry:
+        """
+        Gets the checkpoint registry of an experiment.
+
+        Parameters
+        ----------
+        experiment_name : str
+            Experiment's name.
+        monitor : str
+            Metric used to find the best checkpoint. Default is 'val_loss'.
+        mode : str
+            'min' if lower values of the monitored metric are better, 'max'
+            if higher values are better. Default is 'min'.
+
+        Returns
+        -------
+        registry : CheckpointRegistry
+            Registry stored in the experiment folder.
+        """
+        experiment_folder = self._get_experiment_folder(experiment_name)
+
+        if not experiment_name or not os.path.isdir(experiment_folder):
+            raise ValueError(f'There is no experiment {experiment_name}')
+
+        return CheckpointRegistry(
+                    os.path.join(experiment_folder, CHECKPOINTS_FILE),
+                    monitor, mode, self._checkpoint_store, self._fsync)
+
+    def create_sweep(self, sweep_name: str, configs: List[Config] = [],
+                     params: Dict = None, description: str = '',
+                     batch_size: int = 1000) -> Sweep:
+        """
+        Creates a hyperparameter sweep inside the project. Its trials are
+        stored in a single file of the sweep instead of as experiments.
+
+        Parameters
+        ----------
+        sweep_name : str
+            Sweep's name.
+        configs : List[Config]
+            Configs shared by every trial, such as the model config. Default
+            is an empty list.
+        params : Dict
+            Params shared by every trial. Default is None.
+        description : str
+            Sweep's description. Default is an empty string.
+        batch_size : int
+            Number of trials buffered before they are written. Default is
+            1000.
+
+        Returns
+        -------
+        sweep : Sweep
+            Sweep created.
+        """
+        if not sweep_name:
+            raise ValueError('Must use a non empty sweep name')
+
+        sweep = Sweep(self._get_sweep_folder(sweep_name), sweep_name,
+                      configs, params, description, batch_size=batch_size,
+                      serializer=self._serializer, fsync=self._fsync,
+                      enabled=self._enabled)
+        sweep.register_sweep()
+
+        return sweep
+
+    def open_sweep(self, sweep_name: str, batch_size: int = 1000) -> Sweep:
+        """
+        Opens a hyperparameter sweep of the project, to query its trials or
+        to log more of them.
+
+        Parameters
+        ----------
+        sweep_name : str
+            Sweep's name.
+        batch_size : int
+            Number of trials buffered before they are written. Default is
+            1000.
+
+        Returns
+        -------
+        sweep : Sweep
+            Sweep stored in the project.
+        """
+        return Sweep.by_folder(self._get_sweep_folder(sweep_name),
+                               batch_size=batch_size,
+                               serializer=self._serializer, fsync=self._fsync,
+                               enabled=self._enabled)
+
+    def list_sweeps(self) -> List[str]:
+        """
+        Gets the names of the sweeps of the project.
+
+        Returns
+        -------
+        sweep_names : List[str]
+            Sweep names.
+        """
+        path = self._project_folder_path + self._SWEEPS_FOLDER + '/*/'
+
+        return [path.split('/')[-2] for path in glob.glob(path)]
+
     def list_experiments(self):
         """
         Get the list of experiments inside a project.
@@ -94,6 +673,225 @@ class Project():
 
         return experiment_names
 
+    def recover(self) -> Dict[str, str]:
+        """
+        Repairs the experiments left half-written by a process that died.
+
+        Pending commits of both experiment files are finished, and the
+        temporary files of dead processes are removed. An experiment folder
+        left empty, because its first write never committed, is removed.
+
+        Returns
+        -------
+        recovered : Dict[str, str]
+            Status of each repaired folder, relative to the project folder:
+            'committed', 'rolled_back' or 'removed'.
+        """
+        patterns = ['*/.commit', '*/*.tmp', '*/.*.tmp', '*/*/*.tmp', '.*/*.tmp',
+                    '.*/*/*.tmp']
+        folders = set()
+
+        for pattern in patterns:
+            for path in glob.glob(self._project_folder_path + pattern):
+                folder = os.path.dirname(path)
+                name = os.path.relpath(folder, self._project_folder_path)
+
+                # Sidecar folders are repaired with their experiment folder,
+                # whose journal may still rename their files
+                if not name.startswith('.'):
+                    folder = self._project_folder_path + name.split(os.sep)[0]
+
+                folders.add(folder)
+
+        recovered = {}
+
+        # Blob folders are repaired before the folders containing them
+        for folder in sorted(folders, key=lambda path: -path.count(os.sep)):
+            name = os.path.relpath(folder, self._project_folder_path)
+            experiment_name = name.split(os.sep)[0]
+
+            # Live writers of the experiment finish before it is repaired
+            with FileLock(self._project_folder_path + experiment_name):
+                status = recover_folder(folder)
+
+            if status != 'clean':
+                recovered[name] = status
+
+        return recovered
+
+    def find(self, after: Union[datetime, str] = None,
+             before: Union[datetime, str] = None, description: str = None,
+             metric: str = None, top_k: int = None, mode: str = 'min',
+             reduction: str = 'final') -> List[str]:
+        """
+        Finds experiments using the project index, without opening their
+        files.
+
+        Parameters
+        ----------
+        after : datetime or str
+            Only experiments performed at or after this datetime. Default is
+            None.
+        before : datetime or str
+            Only experiments performed before this datetime. Default is None.
+        description : str
+            Only experiments whose description contains this text. Default is
+            None.
+        metric : str
+            Only experiments with this metric, sorted by its value. Default
+            is None, which sorts the experiments by datetime.
+        top_k : int
+            Maximum number of experiments returned. Default is None.
+        mode : str
+            'min' sorts the metric in ascending order, 'max' in descending
+            order. Default is 'min'.
+        reduction : str
+            Metric value used to sort: 'final', 'min' or 'max'. Default is
+            'final'.
+
+        Returns
+        -------
+        experiment_names : List[str]
+            Names of the experiments found
+        """
+        return self._get_index().find(after=after, before=before,
+                                      description=description, metric=metric,
+                                      top_k=top_k, mode=mode,
+                                      reduction=reduction)
+
+    def rebuild_index(self) -> None:
+        """
+        Rebuilds the project index from the experiment files, replacing its
+        content in a single transaction.
+        """
+        experiments = []
+
+        for experiment_name in self.list_experiments():
+            experiment = self.open_experiment(experiment_name)
+
+            try:
+                configs = [experiment.get_config('metrics')]
+            except KeyError:
+                configs = []
+
+            experiments.append((experiment.name, experiment.description,
+                                experiment.datetime,
+                                self._get_index_metrics(configs)))
+
+        index = self._get_index()
+        index.clear()
+        index.add_many(experiments)
+
+    def _get_diff_data(self, experiment_names: List[str], workers: int = 4
+                       ) -> List[Tuple[Dict, Dict[str, np.ndarray]]]:
+        """
+        Gets the configs and the metrics columns of experiments to compare.
+
+        Parameters
+        ----------
+        experiment_names : List[str]
+            Names of the experiments.
+        workers : int
+            Number of threads reading the files. Default is 4.
+
+        Returns
+        -------
+        data : List[Tuple[Dict, Dict[str, np.ndarray]]]
+            Data of each config but the metrics, with the description, and
+            the values of each metric, of each experiment. The batch metrics
+            are prefixed with 'batch_metrics.'.
+        """
+        data = []
+
+        for experiment in self.open_experiments(experiment_names, workers):
+            if isinstance(experiment, Exception):
+                raise experiment
+
+            tree = {'description': experiment.description}
+            columns = {}
+
+            for config in experiment.configs:
+                name, config_data = config.config
+
+                if name == 'metrics':
+                    columns.update(config.get_columns())
+                elif name == 'batch_metrics':
+                    columns.update((f'{name}.{metric}', values) for
+                                   metric, values in
+                                   config.get_columns().items())
+                else:
+                    tree[name] = config_data
+
+            data.append((tree, columns))
+
+        return data
+
+    def _get_experiment_folder(self, experiment_name: str) -> str:
+        """
+        Gets the folder of an experiment, repairing it the first time it is
+        accessed if a process died while writing it.
+
+        Parameters
+        ----------
+        experiment_name : str
+            Experiment's name.
+
+        Returns
+        -------
+        folder_path : str
+            Path to the experiment folder.
+        """
+        folder_path = self._project_folder_path + experiment_name + '/'
+
+        if self._recover and experiment_name and \
+                experiment_name not in self._recovered:
+            self._recovered.add(experiment_name)
+
+            if os.path.isdir(folder_path):
+                # Live writers of the experiment finish before it is repaired
+                with FileLock(folder_path):
+                    recover_folder(folder_path)
+
+        return folder_path
+
+    def _get_sweep_folder(self, sweep_name: str) -> str:
+        return self._project_folder_path + self._SWEEPS_FOLDER + '/' + \
+                sweep_name + '/'
+
+    def _get_index(self) -> ProjectIndex:
+        if self._index is None:
+            self._index = ProjectIndex(self._project_folder_path)
+
+        return self._index
+
+    def _get_index_metrics(self, configs: List[Config]) -> Dict:
+        """
+        Gets the metrics of an experiment to store in the project index.
+
+        Parameters
+        ----------
+        configs : List[Config]
+            Experiment configurations list.
+
+        Returns
+        -------
+        metrics : Dict
+            Values of each indexed metric.
+        """
+        metrics = {}
+
+        for config in configs:
+            # Only the epoch metrics, not the batch ones
+            if isinstance(config, MetricsConfig) and \
+                    config.config[0] == 'metrics':
+                metrics.update(config.get_columns())
+
+        if self._index_metrics is not None:
+            metrics = {metric: values for metric, values in metrics.items()
+                       if metric in self._index_metrics}
+
+        return metrics
+
     def _create_folder(self, paths: List[str]=[]) -> str:
         """
         Creates a folder from a list of paths.
@@ -119,9 +917,153 @@ class Project():
             else:
                 folder_path += path + '/'
 
-        if not os.path.isdir(folder_path):
-            os.makedirs(folder_path)
+        # Other processes may create the same folder at the same time
+        os.makedirs(folder_path, exist_ok=True)
+
+        return folder_path
+
+    def _create_experiment_folder(self, experiment_name: str) -> str:
+        """
+        Creates the folder of a new experiment, failing if it already exists.
+
+        Parameters
+        ----------
+        experiment_name : str
+            Experiment's name.
+
+        Returns
+        -------
+        folder_path : str
+            Path to the experiment folder.
+        """
+        folder_path = self._project_folder_path + experiment_name + '/'
+
+        try:
+            # mkdir is atomic, only one process can create the folder
+            os.mkdir(folder_path)
+        except FileExistsError:
+            raise ValueError('There is already an experiment with that name')
 
         return folder_path
 
-        
\ No newline at end of file
+def _read_experiment_files(folder: str) -> Union[Tuple[bytes, bytes, bytes],
+                                                 Exception]:
+    """
+    Reads the content of the config files of an experiment.
+
+    Parameters
+    ----------
+    folder : str
+        Experiment folder path.
+
+    Returns
+    -------
+    contents : Tuple[bytes, bytes, bytes] or Exception
+        Content of the experiment config, data and segments files, or the
+        exception raised while reading them.
+    """
+    try:
+        experiment_config = read_file(folder + 'experiment_config.json')
+        experiment_data = read_file(folder + 'experiment_data.json')
+
+        try:
+            with open(folder + SEGMENTS_FILE, 'rb') as file:
+                segments = file.read()
+        except FileNotFoundError:
+            segments = b''
+    except Exception as exception:
+        return exception
+
+    return experiment_config, experiment_data, segments
+
+def _decode_experiment_files(contents: Union[Tuple[bytes, bytes, bytes],
+                                             Exception]
+                            ) -> Union[Tuple[Dict, Dict, List], Exception]:
+    """
+    Decodes the content of the config files of an experiment. It is a module
+    level function so it can run in a process pool.
+
+    Parameters
+    ----------
+    contents : Tuple[bytes, bytes, bytes] or Exception
+        Content of the experiment config, data and segments files, or the
+        exception raised while reading them.
+
+    Returns
+    -------
+    configs : Tuple[Dict, Dict, List] or Exception
+        Decoded experiment config, data and segments, or the exception
+        raised.
+    """
+    if isinstance(contents, Exception):
+        return contents
+
+    try:
+        serializer = JSONSerializer()
+
+        return serializer.loads(contents[0]), serializer.loads(contents[1]), \
+                decode_segments(contents[2])
+    except Exception as exception:
+        return exception
+
+def _iter_epochs_data(metrics_data: Dict) -> Iterator[Tuple[int, Dict]]:
+    """
+    Iterates the epochs of the stored data of a metrics config.
+
+    Parameters
+    ----------
+    metrics_data : Dict
+        Stored data of the metrics config, with either layout.
+
+    Returns
+    -------
+    epochs : Iterator[Tuple[int, Dict]]
+        Epoch number and value of each metric in the epoch.
+    """
+    first = next(iter(metrics_data.values()), None)
+
+    # Columns layout, each value is the metric series
+    if first is not None and not isinstance(first, Dict):
+        return ((epoch, dict(zip(metrics_data, values)))
+                for epoch, values in enumerate(zip(*metrics_data.values())))
+
+    return ((int(key.split('_')[-1]), values)
+            for key, values in metrics_data.items())
+
+def _read_metric_series(folder: str, metric: str) -> np.ndarray:
+    """
+    Reads the values of a metric from the data file of an experiment.
+
+    Parameters
+    ----------
+    folder : str
+        Experiment folder path.
+    metric : str
+        Name of the metric.
+
+    Returns
+    -------
+    values : np.ndarray
+        Values of the metric, empty if the experiment doesn't store it.
+    """
+    path = folder + 'experiment_data.json'
+    segments = [segment for segment in read_segments(folder)
+                if segment['name'] == 'metrics']
+
+    try:
+        # Only the metric is decoded, streaming the data file
+        if not segments:
+            return read_metric(path, metric)
+
+        # Appended epochs may replace stored ones, so the metrics are read
+        # whole
+        metrics_data = read_section(path, 'metrics')
+    except KeyError: # The experiment has no metrics config
+        if not segments:
+            return np.empty(0)
+        metrics_data = {}
+
+    metrics_data = apply_segments({'metrics': metrics_data},
+                                  segments)['metrics']
+
+    return get_metric_series(metrics_data, metric)
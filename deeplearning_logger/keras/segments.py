@@ -0,0 +1,225 @@
+import os
+import numpy as np
+from typing import Dict, List
+from deeplearning_logger.files import FileLock
+from deeplearning_logger.json import JSONSerializer
+from deeplearning_logger.profiling import timed_fsync, track_file
+
+# Append-only file with the changes made to an experiment after its data
+# file was written
+SEGMENTS_FILE = 'experiment_data.segments.jsonl'
+
+_SERIALIZER = JSONSerializer(compact=True)
+
+def append_segment(folder: str, segment: Dict, fsync: str = 'never') -> int:
+    """
+    Appends a segment to the segments file of an experiment, so an update
+    costs the size of the change instead of the size of the experiment.
+
+    Parameters
+    ----------
+    folder : str
+        Experiment folder path.
+    segment : Dict
+        Segment created by `config_segment` or `extend_segment`.
+    fsync : str
+        fsync policy, 'always' or 'never'. Default is 'never'.
+
+    Returns
+    -------
+    size : int
+        Number of bytes written.
+    """
+    line = _SERIALIZER.dumps(segment) + b'\n'
+    path = os.path.join(folder, SEGMENTS_FILE)
+
+    with FileLock(folder):
+        with open(path, 'ab') as file:
+            file = track_file(file)
+
+            # A line truncated by a killed process is terminated, so it
+            # doesn't corrupt the new one
+            if file.tell() and not _ends_with_newline(path):
+                line = b'\n' + line
+
+            size = file.write(line)
+
+            if fsync == 'always':
+                file.flush()
+                timed_fsync(file.fileno())
+
+    return size
+
+def read_segments(folder: str) -> List[Dict]:
+    """
+    Reads the segments of an experiment.
+
+    Parameters
+    ----------
+    folder : str
+        Experiment folder path.
+
+    Returns
+    -------
+    segments : List[Dict]
+        Segments in the order they were appended, empty if there are none.
+    """
+    try:
+        with open(os.path.join(folder, SEGMENTS_FILE), 'rb') as file:
+            content = file.read()
+    except FileNotFoundError:
+        return []
+
+    return decode_segments(content)
+
+def decode_segments(content: bytes) -> List[Dict]:
+    """
+    Decodes the content of a segments file. Truncated lines, left by a
+    process killed while writing, are skipped.
+
+    Parameters
+    ----------
+    content : bytes
+        Content of the segments file.
+
+    Returns
+    -------
+    segments : List[Dict]
+        Decoded segments.
+    """
+    segments = []
+
+    for line in content.splitlines():
+        try:
+            segments.append(_SERIALIZER.loads(line))
+        except ValueError:
+            continue
+
+    return segments
+
+def config_segment(name: str, data: Dict) -> Dict:
+    """
+    Creates a segment which adds or replaces a config.
+
+    Parameters
+    ----------
+    name : str
+        Config name.
+    data : Dict
+        Config data.
+
+    Returns
+    -------
+    segment : Dict
+        Segment to append.
+    """
+    return {'type': 'config', 'name': name, 'data': data}
+
+def extend_segment(name: str, columns: Dict[str, np.ndarray],
+                   initial_epoch: int = None) -> Dict:
+    """
+    Creates a segment which appends epochs to a metrics config.
+
+    Parameters
+    ----------
+    name : str
+        Metrics config name, 'metrics' or 'batch_metrics'.
+    columns : Dict[str, np.ndarray]
+        Values of each metric in the new epochs.
+    initial_epoch : int
+        Epoch of the first new row. The stored epochs from it onwards are
+        replaced. Default is None, which appends after the stored epochs.
+
+    Returns
+    -------
+    segment : Dict
+        Segment to append.
+    """
+    return {'type': 'extend', 'name': name, 'columns': columns,
+            'initial_epoch': initial_epoch}
+
+def apply_segments(sections: Dict, segments: List[Dict]) -> Dict:
+    """
+    Applies segments to the data of each config of an experiment.
+
+    Parameters
+    ----------
+    sections : Dict
+        Data of each config, by name. It is updated in place.
+    segments : List[Dict]
+        Segments in the order they were appended.
+
+    Returns
+    -------
+    sections : Dict
+        Updated data of each config.
+    """
+    for segment in segments:
+        name = segment['name']
+
+        if segment['type'] == 'config':
+            sections[name] = segment['data']
+        else:
+            sections[name] = extend_metrics_data(sections.get(name, {}),
+                                                 segment['columns'],
+                                                 segment['initial_epoch'])
+
+    return sections
+
+def extend_metrics_data(metrics_data: Dict, columns: Dict,
+                        initial_epoch: int = None) -> Dict:
+    """
+    Appends epochs to the stored data of a metrics config, keeping its
+    layout.
+
+    Parameters
+    ----------
+    metrics_data : Dict
+        Stored data of the metrics config, with either layout.
+    columns : Dict
+        Values of each metric in the new epochs.
+    initial_epoch : int
+        Epoch of the first new row. The epochs from it onwards are replaced.
+        Default is None, which appends after the stored epochs.
+
+    Returns
+    -------
+    metrics_data : Dict
+        Extended data. Data with the epochs layout is updated in place.
+    """
+    rows = len(next(iter(columns.values()), []))
+    first = next(iter(metrics_data.values()), None)
+
+    # Columns layout, each value is the metric series
+    if first is not None and not isinstance(first, Dict):
+        epochs = len(first)
+        start = epochs if initial_epoch is None else min(initial_epoch, epochs)
+        extended = {}
+
+        # Metrics missing in either part are filled with NaN
+        for metric in list(metrics_data) + [metric for metric in columns
+                                            if metric not in metrics_data]:
+            stored = metrics_data.get(metric, np.full(epochs, np.nan))
+            new = columns.get(metric, np.full(rows, np.nan))
+            extended[metric] = np.concatenate([
+                np.asarray(stored, dtype=np.float64)[:start],
+                np.asarray(new, dtype=np.float64)])
+
+        return extended
+
+    start = len(metrics_data) if initial_epoch is None else initial_epoch
+
+    for epoch in range(start, len(metrics_data)):
+        metrics_data.pop(f'epoch_{epoch}', None)
+
+    for row in range(rows):
+        metrics_data[f'epoch_{start + row}'] = {
+            metric: values[row] for metric, values in columns.items()}
+
+    return metrics_data
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, 'rb') as file:
+        file.seek(-1, os.SEEK_END)
+
+        return file.read(1) == b'\n'
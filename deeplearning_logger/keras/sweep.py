@@ -0,0 +1,548 @@
+from __future__ import annotations
+import atexit
+import os
+import numpy as np
+from datetime import datetime
+from typing import Any, Dict, Iterator, List
+from deeplearning_logger.keras.configs import Config
+from deeplearning_logger.keras.keras_logger import Experiment
+from deeplearning_logger.json import JSONSerializer
+from deeplearning_logger.files import FileLock, atomic_write, \
+                                      check_fsync_policy
+from deeplearning_logger.imports import lazy_import, lazy_type
+from deeplearning_logger.profiling import profiled, timed_fsync, track_file
+
+DataFrame = lazy_type('pandas', 'DataFrame')
+
+# Shared configs and params of a sweep, written once
+SWEEP_FILE = 'sweep.json'
+# Append-only table of the trials of a sweep, one trial per line
+TRIALS_FILE = 'trials.jsonl'
+
+_MODES = ('min', 'max')
+_SERIALIZER = JSONSerializer(compact=True)
+
+class Sweep():
+    """
+    Hyperparameter sweep: many trials sharing the same configs, such as the
+    model and the data, and differing in a few params.
+
+    The shared configs and params are written once. Each trial only stores
+    the params which differ from the shared ones and its results, as a line
+    of a single trials file. The trials are buffered and appended in
+    batches, so logging a trial doesn't create any file. Pending trials are
+    written when the interpreter exits.
+
+    Parameters
+    ----------
+    path : str
+        Folder of the sweep.
+    name : str
+        Sweep name.
+    configs : List[Config]
+        Configs shared by every trial. Default is None.
+    params : Dict
+        Params shared by every trial, which the trials override. Default is
+        None.
+    description : str
+        Sweep description. Default is an empty string.
+    sweep_datetime : datetime
+        Datetime the sweep was created. Default is None, which uses now.
+    batch_size : int
+        Number of trials buffered before they are written. Default is 1000.
+    serializer : JSONSerializer
+        Serializer of the sweep file. Default is None, which uses the
+        standard library json module with indentation.
+    fsync : str
+        fsync policy of the sweep files, 'always' or 'never'. Default is
+        'never'.
+    enabled : bool
+        Whether this process writes the sweep files. Default is True.
+
+    Attributes
+    ----------
+    _path : str
+        Folder of the sweep.
+    _name : str
+        Sweep name.
+    _configs : List[Config]
+        Shared configs.
+    _params : Dict
+        Shared params.
+    _description : str
+        Sweep description.
+    _datetime : datetime
+        Datetime the sweep was created.
+    _batch_size : int
+        Number of trials buffered before they are written.
+    _serializer : JSONSerializer
+        Serializer of the sweep file.
+    _fsync : str
+        fsync policy of the sweep files.
+    _enabled : bool
+        Whether this process writes the sweep files.
+    _trials : List[Dict]
+        Stored and pending trials, in the order they were logged.
+    _positions : Dict[str, int]
+        Position of each trial in `_trials`, by id.
+    _pending : List[Dict]
+        Trials not written yet.
+    _columns : Dict[str, np.ndarray]
+        Values of each metric in every trial, built on the first query and
+        discarded when a trial is logged.
+    """
+    def __init__(self, path: str, name: str, configs: List[Config] = None,
+                 params: Dict = None, description: str = '',
+                 sweep_datetime: datetime = None, batch_size: int = 1000,
+                 serializer: JSONSerializer = None, fsync: str = 'never',
+                 enabled: bool = True) -> None:
+        check_fsync_policy(fsync)
+
+        if batch_size < 1:
+            raise ValueError('The batch size must be at least 1')
+
+        self._path = path
+        self._name = name
+        self._configs = configs or []
+        self._params = params or {}
+        self._description = description
+        self._datetime = sweep_datetime or datetime.now()
+        self._batch_size = batch_size
+        self._serializer = serializer or JSONSerializer()
+        self._fsync = fsync
+        self._enabled = enabled
+        self._pending = []
+        self.refresh()
+
+        if enabled:
+            atexit.register(self.flush)
+
+    def __len__(self) -> int:
+        return len(self._trials)
+
+    def __enter__(self) -> Sweep:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return self._description
+
+    @property
+    def datetime(self) -> datetime:
+        return self._datetime
+
+    @property
+    def configs(self) -> List[Config]:
+        return self._configs
+
+    @property
+    def params(self) -> Dict:
+        return self._params
+
+    @property
+    def trial_ids(self) -> List[str]:
+        return [trial['id'] for trial in self._trials]
+
+    @classmethod
+    def by_folder(cls, path: str, **kwargs) -> Sweep:
+        """
+        Opens a sweep stored in a folder.
+
+        Parameters
+        ----------
+        path : str
+            Folder of the sweep.
+        kwargs
+            Other arguments of the constructor, such as `batch_size`.
+
+        Returns
+        -------
+        sweep : Sweep
+            Sweep with its shared configs and trials.
+        """
+        sweep_file = os.path.join(path, SWEEP_FILE)
+
+        if not os.path.isfile(sweep_file):
+            raise ValueError(f'There is no sweep in {path}')
+
+        with open(sweep_file, 'rb') as file:
+            sweep_config = JSONSerializer().loads(file.read())
+
+        configs = [Experiment._CONFIGS_EQUIVALENCES[name](data)
+                   for name, data in sweep_config['configs'].items()]
+
+        return cls(path, sweep_config['name'], configs,
+                   sweep_config['params'], sweep_config['description'],
+                   datetime.strptime(sweep_config['datetime'],
+                                     '%Y-%m-%dT%H:%M:%S'), **kwargs)
+
+    @profiled('Sweep.register_sweep')
+    def register_sweep(self) -> None:
+        """
+        Writes the shared configs and params of the sweep.
+        """
+        if not self._enabled:
+            return
+
+        configs = {}
+
+        for config in self._configs:
+            if not isinstance(config, Config):
+                raise ValueError(f'{config.__class__.__name__} is not a '
+                                 f'Config object')
+
+            name, data = config.config
+            configs[name] = data
+
+        os.makedirs(self._path, exist_ok=True)
+        atomic_write(os.path.join(self._path, SWEEP_FILE),
+                     self._serializer.dumps({
+                        'name': self._name,
+                        'description': self._description,
+                        'datetime': self._datetime.strftime(
+                                                    '%Y-%m-%dT%H:%M:%S'),
+                        'params': self._params,
+                        'configs': configs
+                     }), self._fsync)
+
+    def log_trial(self, params: Dict = None, metrics: Dict[str, float] = None,
+                  trial_id: str = None) -> str:
+        """
+        Logs a trial. It is buffered, and written with the next batch.
+
+        Parameters
+        ----------
+        params : Dict
+            Params of the trial. Only the ones which differ from the shared
+            params are stored. Default is None.
+        metrics : Dict[str, float]
+            Results of the trial, such as the final 'val_loss'. Default is
+            None.
+        trial_id : str
+            Trial id. A trial with the same id is replaced. Default is None,
+            which numbers the trials in the order they are logged. Processes
+            logging into the same sweep must give their own ids.
+
+        Returns
+        -------
+        trial_id : str
+            Id of the trial.
+        """
+        if trial_id is None:
+            trial_id = f'trial_{len(self._trials)}'
+
+        trial = {
+            'id': str(trial_id),
+            'params': diff_params(self._params, params or {}),
+            'metrics': {name: float(value)
+                        for name, value in (metrics or {}).items()},
+            'datetime': datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+        }
+
+        self._add_trial(trial)
+
+        if self._enabled:
+            self._pending.append(trial)
+
+            if len(self._pending) >= self._batch_size:
+                self.flush()
+
+        return trial['id']
+
+    @profiled('Sweep.flush')
+    def flush(self) -> None:
+        """
+        Appends the pending trials to the trials file, in a single write.
+        """
+        if not self._pending:
+            return
+
+        content = b''.join(_SERIALIZER.dumps(trial) + b'\n'
+                           for trial in self._pending)
+        path = os.path.join(self._path, TRIALS_FILE)
+        os.makedirs(self._path, exist_ok=True)
+
+        # Other processes may be logging trials of the same sweep
+        with FileLock(self._path):
+            with open(path, 'a+b') as file:
+                # A line truncated by a killed process is terminated, so it
+                # doesn't corrupt the new ones
+                if file.seek(0, os.SEEK_END):
+                    file.seek(-1, os.SEEK_END)
+                    if file.read(1) != b'\n':
+                        content = b'\n' + content
+
+                file = track_file(file)
+                file.write(content)
+
+                if self._fsync == 'always':
+                    file.flush()
+                    timed_fsync(file.fileno())
+
+        self._pending = []
+
+    def close(self) -> None:
+        """
+        Writes the pending trials. The sweep can still be queried.
+        """
+        self.flush()
+        atexit.unregister(self.flush)
+
+    def refresh(self) -> None:
+        """
+        Reloads the trials file, such as after other processes logged
+        trials. The pending trials are kept.
+        """
+        self._trials = []
+        self._positions = {}
+        self._columns = None
+
+        try:
+            with open(os.path.join(self._path, TRIALS_FILE), 'rb') as file:
+                content = file.read()
+        except FileNotFoundError:
+            content = b''
+
+        for line in content.splitlines():
+            # Lines truncated by a killed process are skipped
+            try:
+                trial = _SERIALIZER.loads(line)
+            except ValueError:
+                continue
+
+            self._add_trial(trial)
+
+        for trial in self._pending:
+            self._add_trial(trial)
+
+    def get_trial(self, trial_id: str) -> Dict:
+        """
+        Gets a trial with its full params.
+
+        Parameters
+        ----------
+        trial_id : str
+            Trial id.
+
+        Returns
+        -------
+        trial : Dict
+            Id, params, metrics and datetime of the trial.
+        """
+        if trial_id not in self._positions:
+            raise KeyError(f'The sweep has no trial {trial_id}')
+
+        return self._expand(self._trials[self._positions[trial_id]])
+
+    def iter_trials(self) -> Iterator[Dict]:
+        """
+        Iterates the trials with their full params.
+
+        Returns
+        -------
+        trials : Iterator[Dict]
+            Trials in the order they were logged.
+        """
+        return (self._expand(trial) for trial in self._trials)
+
+    def get_column(self, metric: str) -> np.ndarray:
+        """
+        Gets the values of a metric in every trial.
+
+        Parameters
+        ----------
+        metric : str
+            Metric name.
+
+        Returns
+        -------
+        values : np.ndarray
+            Value of the metric in each trial, in the order they were
+            logged. NaN if a trial doesn't have it.
+        """
+        if self._columns is None:
+            self._columns = {}
+
+        if metric not in self._columns:
+            self._columns[metric] = np.fromiter(
+                    (trial['metrics'].get(metric, np.nan)
+                     for trial in self._trials), dtype=float,
+                    count=len(self._trials))
+
+        return self._columns[metric]
+
+    def top_k(self, metric: str, k: int = 1, mode: str = 'min') -> List[Dict]:
+        """
+        Gets the best trials by a metric. The trials without the metric or
+        with NaN are never returned.
+
+        Parameters
+        ----------
+        metric : str
+            Metric name.
+        k : int
+            Maximum number of trials. Default is 1.
+        mode : str
+            'min' if lower values are better, 'max' if higher values are
+            better. Default is 'min'.
+
+        Returns
+        -------
+        trials : List[Dict]
+            Best trials with their full params, the best first.
+        """
+        if mode not in _MODES:
+            raise ValueError(f'The mode must be one of {_MODES}')
+
+        values = self.get_column(metric)
+        rows = np.flatnonzero(~np.isnan(values))
+
+        if mode == 'max':
+            keys = -values[rows]
+        else:
+            keys = values[rows]
+
+        # Only the k best values are sorted
+        if k < len(rows):
+            selected = np.argpartition(keys, k - 1)[:k]
+        else:
+            selected = np.arange(len(rows))
+
+        selected = selected[np.argsort(keys[selected], kind='stable')]
+
+        return [self._expand(self._trials[row]) for row in rows[selected]]
+
+    def best(self, metric: str, mode: str = 'min') -> Dict:
+        """
+        Gets the best trial by a metric.
+
+        Parameters
+        ----------
+        metric : str
+            Metric name.
+        mode : str
+            'min' or 'max'. Default is 'min'.
+
+        Returns
+        -------
+        trial : Dict
+            Best trial with its full params, None if no trial has the
+            metric.
+        """
+        trials = self.top_k(metric, 1, mode)
+
+        return trials[0] if trials else None
+
+    def to_frame(self) -> DataFrame:
+        """
+        Gets the trials as a DataFrame.
+
+        Returns
+        -------
+        frame : pd.DataFrame
+            One row per trial, indexed by id, with a column per param and
+            per metric.
+        """
+        pd = lazy_import('pandas')
+
+        rows = [{**_flatten_params(trial['params']), **trial['metrics']}
+                for trial in self.iter_trials()]
+
+        return pd.DataFrame(rows, index=pd.Index(self.trial_ids, name='trial'))
+
+    def _add_trial(self, trial: Dict) -> None:
+        position = self._positions.get(trial['id'])
+
+        # A trial logged again replaces the previous one
+        if position is None:
+            self._positions[trial['id']] = len(self._trials)
+            self._trials.append(trial)
+        else:
+            self._trials[position] = trial
+
+        self._columns = None
+
+    def _expand(self, trial: Dict) -> Dict:
+        return {**trial, 'params': merge_params(self._params,
+                                                trial['params'])}
+
+def diff_params(base: Dict, params: Dict) -> Dict:
+    """
+    Gets the params which differ from the base ones. Nested dictionaries are
+    compared key by key.
+
+    Parameters
+    ----------
+    base : Dict
+        Base params.
+    params : Dict
+        Params to compare.
+
+    Returns
+    -------
+    diff : Dict
+        Params whose key is not in the base params or whose value is
+        different.
+    """
+    diff = {}
+
+    for key, value in params.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            nested = diff_params(base[key], value)
+
+            if nested:
+                diff[key] = nested
+        elif key not in base or not _equal(base[key], value):
+            diff[key] = value
+
+    return diff
+
+def merge_params(base: Dict, diff: Dict) -> Dict:
+    """
+    Applies the params created by `diff_params` to the base params.
+
+    Parameters
+    ----------
+    base : Dict
+        Base params. They are not modified.
+    diff : Dict
+        Params which override the base ones.
+
+    Returns
+    -------
+    params : Dict
+        Merged params.
+    """
+    params = dict(base)
+
+    for key, value in diff.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            params[key] = merge_params(base[key], value)
+        else:
+            params[key] = value
+
+    return params
+
+def _equal(first: Any, second: Any) -> bool:
+    try:
+        return bool(first == second)
+    except ValueError: # Arrays
+        return False
+
+def _flatten_params(params: Dict, prefix: str = '') -> Dict:
+    flat = {}
+
+    for key, value in params.items():
+        if isinstance(value, dict):
+            flat.update(_flatten_params(value, f'{prefix}{key}.'))
+        else:
+            flat[f'{prefix}{key}'] = value
+
+    return flat
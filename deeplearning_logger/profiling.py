@@ -0,0 +1,403 @@
+from __future__ import annotations
+import functools
+import os
+import threading
+import time
+from typing import IO, Any, Callable, Dict, List
+from deeplearning_logger.json import JSONSerializer
+
+# Stats file written next to the experiments
+STATS_FILE = 'logger_stats.json'
+
+class OperationStats():
+    """
+    Counters of the calls to an operation of the logger.
+
+    The durations are also counted in a histogram with power of two buckets
+    of microseconds, so its memory doesn't grow with the number of calls.
+
+    Attributes
+    ----------
+    calls : int
+        Number of calls.
+    seconds : float
+        Total wall time of the calls.
+    min_seconds : float
+        Wall time of the fastest call.
+    max_seconds : float
+        Wall time of the slowest call.
+    bytes_written : int
+        Total number of bytes written to files.
+    io_seconds : float
+        Total time spent writing and flushing files. The rest of the wall
+        time is spent serializing the data.
+    histogram : Dict[int, int]
+        Number of calls by the upper bound of their duration, in
+        microseconds.
+    """
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        self.min_seconds = float('inf')
+        self.max_seconds = 0.0
+        self.bytes_written = 0
+        self.io_seconds = 0.0
+        self.histogram = {}
+
+    def add(self, seconds: float, bytes_written: int = 0,
+            io_seconds: float = 0.0) -> None:
+        """
+        Counts a call.
+
+        Parameters
+        ----------
+        seconds : float
+            Wall time of the call.
+        bytes_written : int
+            Number of bytes written to files. Default is 0.
+        io_seconds : float
+            Time spent writing and flushing files. Default is 0.0.
+        """
+        self.calls += 1
+        self.seconds += seconds
+        self.min_seconds = min(self.min_seconds, seconds)
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.bytes_written += bytes_written
+        self.io_seconds += io_seconds
+
+        bucket = 1 << int(seconds * 1e6).bit_length()
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    def to_dict(self) -> Dict:
+        """
+        Gets the counters as a dictionary.
+
+        Returns
+        -------
+        stats : Dict
+            Counters of the operation, including the mean wall time and the
+            time spent serializing the data.
+        """
+        return {
+            'calls': self.calls,
+            'seconds': self.seconds,
+            'mean_seconds': self.seconds / self.calls if self.calls else 0.0,
+            'min_seconds': self.min_seconds if self.calls else 0.0,
+            'max_seconds': self.max_seconds,
+            'bytes_written': self.bytes_written,
+            'io_seconds': self.io_seconds,
+            'serialization_seconds': max(self.seconds - self.io_seconds, 0.0),
+            'histogram_us': {str(bucket): count for bucket, count
+                             in sorted(self.histogram.items())}
+        }
+
+class Profiler():
+    """
+    In-process counters of the time and bytes spent by the logger.
+
+    The profiler is disabled by default. While it is disabled, a profiled
+    call only checks the `enabled` attribute, so the instrumentation can be
+    kept in production.
+
+    Attributes
+    ----------
+    enabled : bool
+        Whether the calls are counted.
+    _stats : Dict[str, OperationStats]
+        Counters of each operation, by name.
+    _lock : threading.Lock
+        Lock of the counters, updated by the training and writer threads.
+    _local : threading.local
+        Bytes and I/O time of the operations running in each thread, from
+        the outermost to the innermost.
+    """
+    def __init__(self) -> None:
+        self.enabled = False
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self) -> None:
+        """
+        Starts counting the calls.
+        """
+        self.enabled = True
+
+    def disable(self) -> None:
+        """
+        Stops counting the calls. The counters are kept.
+        """
+        self.enabled = False
+
+    def reset(self) -> None:
+        """
+        Removes every counter.
+        """
+        with self._lock:
+            self._stats = {}
+
+    def record(self, name: str, seconds: float, bytes_written: int = 0,
+               io_seconds: float = 0.0) -> None:
+        """
+        Counts a call of an operation.
+
+        Parameters
+        ----------
+        name : str
+            Operation name.
+        seconds : float
+            Wall time of the call.
+        bytes_written : int
+            Number of bytes written to files. Default is 0.
+        io_seconds : float
+            Time spent writing and flushing files. Default is 0.0.
+        """
+        with self._lock:
+            stats = self._stats.get(name)
+
+            if stats is None:
+                stats = self._stats[name] = OperationStats()
+
+            stats.add(seconds, bytes_written, io_seconds)
+
+    def add_io(self, bytes_written: int, seconds: float) -> None:
+        """
+        Adds the bytes and time of a file write to the innermost operation
+        running in this thread.
+
+        Parameters
+        ----------
+        bytes_written : int
+            Number of bytes written.
+        seconds : float
+            Time spent writing.
+        """
+        frames = self._get_frames()
+
+        if frames:
+            frames[-1][0] += bytes_written
+            frames[-1][1] += seconds
+
+    def call(self, name: str, function: Callable, *args, **kwargs) -> Any:
+        """
+        Calls a function counting its wall time, bytes and I/O time.
+
+        Parameters
+        ----------
+        name : str
+            Operation name.
+        function : Callable
+            Function to call with the given arguments.
+
+        Returns
+        -------
+        result : Any
+            Result of the function.
+        """
+        frames = self._get_frames()
+        frame = [0, 0.0]
+        frames.append(frame)
+        start = time.perf_counter()
+
+        try:
+            return function(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            frames.pop()
+
+            # The I/O of a nested operation is also part of the outer one
+            if frames:
+                frames[-1][0] += frame[0]
+                frames[-1][1] += frame[1]
+
+            self.record(name, seconds, frame[0], frame[1])
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """
+        Gets the counters of each operation.
+
+        Returns
+        -------
+        stats : Dict[str, Dict]
+            Counters of each operation, by name.
+        """
+        with self._lock:
+            return {name: stats.to_dict()
+                    for name, stats in sorted(self._stats.items())}
+
+    def dump(self, path: str) -> str:
+        """
+        Writes the counters into a JSON file.
+
+        Parameters
+        ----------
+        path : str
+            File path, or folder where the stats file is written, such as
+            the project or experiment folder.
+
+        Returns
+        -------
+        path : str
+            Path of the written file.
+        """
+        # Imported here since the files module writes through the profiler
+        from deeplearning_logger.files import atomic_write
+
+        if os.path.isdir(path):
+            path = os.path.join(path, STATS_FILE)
+
+        atomic_write(path, JSONSerializer().dumps(self.get_stats()))
+
+        return path
+
+    def _get_frames(self) -> List[List]:
+        frames = getattr(self._local, 'frames', None)
+
+        if frames is None:
+            frames = self._local.frames = []
+
+        return frames
+
+class TimedFile():
+    """
+    Wrapper of a file which adds the bytes and time of its writes to the
+    operation running in the profiler.
+
+    Parameters
+    ----------
+    file : IO
+        Binary file opened for writing.
+
+    Attributes
+    ----------
+    _file : IO
+        Wrapped file.
+    """
+    def __init__(self, file: IO) -> None:
+        self._file = file
+
+    def write(self, data: bytes) -> int:
+        start = time.perf_counter()
+        size = self._file.write(data)
+        PROFILER.add_io(len(data) if size is None else size,
+                        time.perf_counter() - start)
+
+        return size
+
+    def flush(self) -> None:
+        start = time.perf_counter()
+        self._file.flush()
+        PROFILER.add_io(0, time.perf_counter() - start)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._file, name)
+
+# Profiler of the logger operations
+PROFILER = Profiler()
+
+def profiled(name: str) -> Callable:
+    """
+    Decorator which counts the calls of a function in the profiler.
+
+    Parameters
+    ----------
+    name : str
+        Operation name, such as 'Experiment.register_experiment'.
+
+    Returns
+    -------
+    decorator : Callable
+        Decorator of the function.
+    """
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return function(*args, **kwargs)
+
+            return PROFILER.call(name, function, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+def track_file(file: IO) -> IO:
+    """
+    Wraps a file so its writes are counted, if the profiler is enabled.
+
+    Parameters
+    ----------
+    file : IO
+        Binary file opened for writing.
+
+    Returns
+    -------
+    file : IO
+        The file itself if the profiler is disabled, a TimedFile otherwise.
+    """
+    return TimedFile(file) if PROFILER.enabled else file
+
+def timed_fsync(descriptor: int) -> None:
+    """
+    Flushes a file to disk, adding the time to the operation running in the
+    profiler.
+
+    Parameters
+    ----------
+    descriptor : int
+        File descriptor.
+    """
+    if not PROFILER.enabled:
+        os.fsync(descriptor)
+        return
+
+    start = time.perf_counter()
+    os.fsync(descriptor)
+    PROFILER.add_io(0, time.perf_counter() - start)
+
+def enable_profiling() -> None:
+    """
+    Starts counting the logger operations.
+    """
+    PROFILER.enable()
+
+def disable_profiling() -> None:
+    """
+    Stops counting the logger operations. The counters are kept.
+    """
+    PROFILER.disable()
+
+def reset_stats() -> None:
+    """
+    Removes the counters of the logger operations.
+    """
+    PROFILER.reset()
+
+def get_stats() -> Dict[str, Dict]:
+    """
+    Gets the counters of each logger operation.
+
+    Returns
+    -------
+    stats : Dict[str, Dict]
+        Calls, wall time, bytes written, and I/O and serialization time of
+        each operation, by name.
+    """
+    return PROFILER.get_stats()
+
+def dump_stats(path: str) -> str:
+    """
+    Writes the counters of the logger operations into a JSON file.
+
+    Parameters
+    ----------
+    path : str
+        File path, or folder where the stats file is written, such as the
+        project or experiment folder.
+
+    Returns
+    -------
+    path : str
+        Path of the written file.
+    """
+    return PROFILER.dump(path)
@@ -1,22 +1,52 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 from dataclasses import dataclass, field, fields
-import torch.nn as nn
+from deeplearning_logger.pytorch.metric_series import MetricColumns, \
+                                                      MetricSeries
+from deeplearning_logger.architectures import fingerprint
+from deeplearning_logger.imports import lazy_type
+from deeplearning_logger.validation import is_validation_enabled, \
+                                           skip_validation
+from typing import Tuple
 import typing
 
+# PyTorch is only imported by the user code creating the modules, so
+# reading experiments doesn't import it
+Module = lazy_type('torch.nn', 'Module')
+
+# Resolved type of each field, by data class
+_FIELD_TYPES = {}
+
 @dataclass
 class Data(ABC):
     def get(self):
         return self.__dict__
 
+    @classmethod
+    def trusted(cls, *args, **kwargs) -> Data:
+        """
+        Creates the data object without validating its types, for hot paths
+        whose values are already known to be valid.
+
+        Returns
+        -------
+        data : Data
+            Data object created with the given arguments.
+        """
+        with skip_validation():
+            return cls(*args, **kwargs)
+
     def validate_types(self, instance: Data, class_type: object):
-        for field in fields(instance):
-            attr = getattr(instance, field.name)
-            attr_type = typing.get_type_hints(class_type)[field.name]
+        if not is_validation_enabled():
+            return
+
+        for name, attr_type in _get_field_types(class_type):
+            attr = getattr(instance, name)
 
             if attr is not None and not isinstance(attr, attr_type):
                 msg = (
-                    f'Field {field.name} is of type {type(attr)}, it ',  
+                    f'Field {name} is of type {type(attr)}, it ',
                     f'must be {attr_type}')
 
                 raise ValueError(msg)
@@ -25,6 +55,31 @@ class Data(ABC):
     def __post_init__(self):
         pass
 
+def _get_field_types(class_type: type) -> Tuple[Tuple[str, type], ...]:
+    """
+    Gets the name and type of each field of a data class. The string
+    annotations are resolved once per class and cached.
+
+    Parameters
+    ----------
+    class_type : type
+        Data class.
+
+    Returns
+    -------
+    field_types : Tuple[Tuple[str, type], ...]
+        Name and resolved type of each field.
+    """
+    field_types = _FIELD_TYPES.get(class_type)
+
+    if field_types is None:
+        hints = typing.get_type_hints(class_type)
+        field_types = tuple((field.name, hints[field.name])
+                            for field in fields(class_type))
+        _FIELD_TYPES[class_type] = field_types
+
+    return field_types
+
 @dataclass
 class OptimizerData(Data):
     """
@@ -49,26 +104,93 @@ class MetricsData(Data):
     """
     Attributes
     ----------
-    train_losses : list of float
-        List containing the training loss for each epoch
-    val_losses : list of float
-        List containing the validation loss for each epoch
-    train_metrics : list of dict
-        List containing the training metrics dictionary for each epoch
-    val_metrics : list of dict
-        List containing tje validation metrics dictionary for each epoch
+    train_losses : Sequence of float
+        List or MetricSeries containing the training loss for each epoch
+    val_losses : Sequence of float
+        List or MetricSeries containing the validation loss for each epoch
+    train_metrics : Sequence of dict
+        List or MetricColumns containing the training metrics dictionary for
+        each epoch
+    val_metrics : Sequence of dict
+        List or MetricColumns containing tje validation metrics dictionary
+        for each epoch
     test_metrics : dict
         Dictionary containing the test metrics
     """
-    train_losses: list = field(default_factory=list)
-    val_losses: list = field(default_factory=list)
-    train_metrics: list = field(default_factory=list)
-    val_metrics: list = field(default_factory=list)
+    train_losses: Sequence = field(default_factory=list)
+    val_losses: Sequence = field(default_factory=list)
+    train_metrics: Sequence = field(default_factory=list)
+    val_metrics: Sequence = field(default_factory=list)
     test_metrics: dict = field(default_factory=dict)
 
     def __post_init__(self):
         self.validate_types(self, MetricsData)
 
+    @classmethod
+    def compact(cls, max_size: int = None, policy: str = None) -> MetricsData:
+        """
+        Creates a MetricsData which stores the losses in MetricSeries and the
+        metrics in MetricColumns, optionally bounding their memory.
+
+        Parameters
+        ----------
+        max_size : int
+            Maximum number of values or buckets of each series. Default is
+            None.
+        policy : str
+            What to do when a series is full: 'ring' or 'buckets'. Default
+            is None.
+
+        Returns
+        -------
+        metrics : MetricsData
+            MetricsData with empty compact series.
+        """
+        # The series are known to be valid, so they aren't checked
+        return cls.trusted(train_losses=MetricSeries(max_size=max_size,
+                                                     policy=policy),
+                           val_losses=MetricSeries(max_size=max_size,
+                                                   policy=policy),
+                           train_metrics=MetricColumns(max_size=max_size,
+                                                       policy=policy),
+                           val_metrics=MetricColumns(max_size=max_size,
+                                                     policy=policy))
+
+    def log_epoch(self, train_loss: float = None, val_loss: float = None,
+                  train_metrics: dict = None,
+                  val_metrics: dict = None) -> None:
+        """
+        Appends the results of an epoch or step.
+
+        Parameters
+        ----------
+        train_loss : float
+            Training loss. Default is None.
+        val_loss : float
+            Validation loss. Default is None.
+        train_metrics : dict
+            Training metrics. Default is None.
+        val_metrics : dict
+            Validation metrics. Default is None.
+        """
+        values = [(self.train_losses, train_loss),
+                  (self.val_losses, val_loss),
+                  (self.train_metrics, train_metrics),
+                  (self.val_metrics, val_metrics)]
+
+        for series, value in values:
+            if value is not None:
+                series.append(value)
+
+    def get(self):
+        """
+        Gets the metrics as a dictionary. The compact series are returned as
+        arrays, and the metrics columns as a dictionary of arrays.
+        """
+        return {key: value.get() if isinstance(value, (MetricSeries,
+                                                       MetricColumns))
+                else value for key, value in self.__dict__.items()}
+
 @dataclass
 class ModelData(Data):
     """
@@ -80,12 +202,21 @@ class ModelData(Data):
         Model architecture used in the training
     epochs : str
         Number of epochs used in the experiment
+    architecture_hash : str
+        Content hash of the model architecture
     """
     checkpoint: str = ''
-    architecture: nn.Module = None
+    architecture: Module = None
     epochs: int = 0
+    architecture_hash: str = ''
 
     def __post_init__(self):
         self.validate_types(self, ModelData)
 
-        self.architecture = str(self.architecture)
\ No newline at end of file
+        has_architecture = self.architecture is not None
+        self.architecture = str(self.architecture)
+
+        if has_architecture:
+            # Modules are not cached by identity: any key detecting every
+            # change of a module costs as much as its representation
+            self.architecture_hash = fingerprint(self.architecture)
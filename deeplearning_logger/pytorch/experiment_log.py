@@ -0,0 +1,214 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterator, List, Union
+from deeplearning_logger.json import JSONSerializer
+
+# Metrics fields that grow while the experiment is running, and the record
+# key used to append to each one of them
+_SERIES_FIELDS = {
+    'train_loss': 'train_losses',
+    'val_loss': 'val_losses',
+    'train_metric': 'train_metrics',
+    'val_metric': 'val_metrics'
+}
+
+class ExperimentLog():
+    """
+    Append-only JSON Lines log of a running experiment.
+
+    The first record is a header with the experiment data available when the
+    log is opened. Every following record is a compact JSON line appended at
+    the end of the file, so logging has a constant cost per call and nothing
+    is kept in memory. The full experiment data is rebuilt by replaying the
+    records.
+
+    Parameters
+    ----------
+    path : str
+        Path of the log file.
+
+    Attributes
+    ----------
+    path : str
+        Path of the log file.
+    _file : file object
+        File opened in append mode. None if the log is not open.
+    _serializer : JSONSerializer
+        Compact serializer of the records.
+    _steps : int
+        Number of step records written by this object.
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = None
+        self._steps = 0
+        self._serializer = JSONSerializer(compact=True)
+
+    def open(self, header: Dict) -> None:
+        """
+        Creates the log file and writes the header record.
+
+        Parameters
+        ----------
+        header : Dict
+            Experiment data available when the log is opened.
+        """
+        # Unbuffered, each record is written as soon as it is complete
+        self._file = open(self.path, 'xb', buffering=0)
+        self.append({'type': 'header', 'data': header})
+
+    def append(self, record: Dict) -> None:
+        """
+        Appends a record at the end of the log.
+
+        Parameters
+        ----------
+        record : Dict
+            Record to append. It must contain a 'type' key.
+        """
+        if self._file is None:
+            raise ValueError('The experiment log is not open')
+
+        self._file.write(self._serializer.dumps(record) + b'\n')
+
+    def log_epoch(self, train_loss: float = None, val_loss: float = None,
+                  train_metrics: Dict = None,
+                  val_metrics: Dict = None) -> None:
+        """
+        Appends the results of an epoch.
+
+        Parameters
+        ----------
+        train_loss : float
+            Training loss of the epoch. Default is None.
+        val_loss : float
+            Validation loss of the epoch. Default is None.
+        train_metrics : Dict
+            Training metrics of the epoch. Default is None.
+        val_metrics : Dict
+            Validation metrics of the epoch. Default is None.
+        """
+        values = {
+            'train_loss': train_loss,
+            'val_loss': val_loss,
+            'train_metric': train_metrics,
+            'val_metric': val_metrics
+        }
+        record = {'type': 'epoch'}
+        record.update({key: value for key, value in values.items()
+                       if value is not None})
+
+        self.append(record)
+
+    def log_step(self, metrics: Dict, step: int = None) -> None:
+        """
+        Appends the metrics of a training step.
+
+        Parameters
+        ----------
+        metrics : Dict
+            Metrics of the step.
+        step : int
+            Step number. Default is the number of steps already logged.
+        """
+        if step is None:
+            step = self._steps
+
+        self.append({'type': 'step', 'step': step, 'metrics': metrics})
+        self._steps += 1
+
+    def close(self) -> None:
+        """
+        Closes the log file.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def replay(self) -> Iterator[Dict]:
+        """
+        Iterates over the records stored in the log.
+
+        A truncated last line, left by a process killed while writing, is
+        ignored.
+
+        Yields
+        ------
+        record : Dict
+            Log record.
+        """
+        with open(self.path, 'rb') as file:
+            for line in file:
+                try:
+                    record = self._serializer.loads(line)
+                except ValueError:
+                    break
+
+                yield record
+
+    def rebuild(self) -> Dict:
+        """
+        Rebuilds the metrics series by replaying the log.
+
+        Returns
+        -------
+        series : Dict
+            Dictionary containing the losses, metrics and steps lists.
+        """
+        series = {field: [] for field in _SERIES_FIELDS.values()}
+        series['steps'] = []
+
+        for record in self.replay():
+            if record['type'] == 'header':
+                for field in _SERIES_FIELDS.values():
+                    series[field] = _copy_series(
+                                        record['data'].get(field, []))
+                series['steps'] = list(record['data'].get('steps', []))
+            elif record['type'] == 'epoch':
+                for key, field in _SERIES_FIELDS.items():
+                    if key in record:
+                        _append_value(series[field], record[key])
+            elif record['type'] == 'step':
+                step = {'step': record['step']}
+                step.update(record['metrics'])
+                series['steps'].append(step)
+
+        return series
+
+    def read(self) -> Dict:
+        """
+        Reads the full experiment data stored in the log.
+
+        Returns
+        -------
+        data : Dict
+            Header data updated with the replayed metrics series.
+        """
+        data = next(self.replay())['data']
+        data.update(self.rebuild())
+
+        return data
+
+def _copy_series(series: Union[List, Dict]) -> Union[List, Dict]:
+    # Metrics stored in MetricColumns are a list of values of each metric
+    if isinstance(series, dict):
+        return {name: list(values) for name, values in series.items()}
+
+    return list(series)
+
+def _append_value(series: Union[List, Dict], value: Any) -> None:
+    """
+    Appends the value of an epoch to a series, which is either a list or
+    the dictionary of metric columns of compact metrics.
+    """
+    if not isinstance(series, dict):
+        series.append(value)
+        return
+
+    size = len(next(iter(series.values()), []))
+
+    # Fills the previous epochs of a new metric
+    for name in value:
+        series.setdefault(name, [None] * size)
+
+    for name, values in series.items():
+        values.append(value.get(name))
@@ -0,0 +1,282 @@
+from __future__ import annotations
+from array import array
+from collections.abc import Sequence
+from typing import Dict, List, Union
+import numpy as np
+
+class MetricSeries(Sequence):
+    """
+    Series of float values stored in a typed array, which takes 8 bytes per
+    value instead of the ~32 bytes of a list of floats.
+
+    A maximum size bounds the memory used by the series:
+
+    - The 'ring' policy keeps the last `max_size` values.
+    - The 'buckets' policy keeps the whole series at a lower resolution.
+      When the series is full, each pair of adjacent buckets is merged into
+      one, keeping the mean, minimum, maximum and number of values of each
+      bucket, and the new values are grouped into buckets of the same width.
+
+    Parameters
+    ----------
+    values : list of float
+        Initial values. Default is None.
+    max_size : int
+        Maximum number of values or buckets stored. Default is None, which
+        doesn't bound the series.
+    policy : str
+        What to do when the series is full: 'ring' or 'buckets'. Default is
+        None, which is only allowed without a maximum size.
+
+    Attributes
+    ----------
+    max_size : int
+        Maximum number of values or buckets stored.
+    policy : str
+        What to do when the series is full.
+    _values : array
+        Stored values, or the mean of each bucket.
+    _min : array
+        Minimum value of each bucket, only with the 'buckets' policy.
+    _max : array
+        Maximum value of each bucket, only with the 'buckets' policy.
+    _count : array
+        Number of values of each bucket, only with the 'buckets' policy.
+    _width : int
+        Number of values of a full bucket.
+    _start : int
+        Position of the oldest value, only with the 'ring' policy.
+    """
+    _POLICIES = ('ring', 'buckets')
+
+    def __init__(self, values: List[float] = None, max_size: int = None,
+                 policy: str = None) -> None:
+        if max_size is not None and policy not in self._POLICIES:
+            raise ValueError(f'The policy must be one of {self._POLICIES}')
+        if policy == 'buckets' and max_size is not None and max_size < 2:
+            raise ValueError('The buckets policy needs a max_size of 2 or '
+                             'more')
+
+        self.max_size = max_size
+        self.policy = policy if max_size is not None else None
+        self._values = array('d')
+        self._min = array('d')
+        self._max = array('d')
+        self._count = array('q')
+        self._width = 1
+        self._start = 0
+
+        for value in values or []:
+            self.append(value)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, idx: Union[int, slice]) -> Union[float, List[float]]:
+        if isinstance(idx, slice):
+            return self.tolist()[idx]
+
+        if idx < 0:
+            idx += len(self._values)
+        if not 0 <= idx < len(self._values):
+            raise IndexError('MetricSeries index out of range')
+
+        if self.policy == 'ring':
+            idx = (self._start + idx) % len(self._values)
+
+        return self._values[idx]
+
+    def append(self, value: float) -> None:
+        """
+        Appends a value to the series.
+
+        Parameters
+        ----------
+        value : float
+            Value to append.
+        """
+        value = float(value)
+
+        if self.policy == 'buckets':
+            self._append_to_bucket(value)
+        elif self.policy == 'ring' and len(self._values) == self.max_size:
+            # Overwrites the oldest value
+            self._values[self._start] = value
+            self._start = (self._start + 1) % self.max_size
+        else:
+            self._values.append(value)
+
+    def _append_to_bucket(self, value: float) -> None:
+        if self._count and self._count[-1] < self._width:
+            count = self._count[-1] + 1
+            self._values[-1] += (value - self._values[-1]) / count
+            self._min[-1] = min(self._min[-1], value)
+            self._max[-1] = max(self._max[-1], value)
+            self._count[-1] = count
+            return
+
+        if len(self._values) == self.max_size:
+            self._merge_buckets()
+
+        self._values.append(value)
+        self._min.append(value)
+        self._max.append(value)
+        self._count.append(1)
+
+    def _merge_buckets(self) -> None:
+        """
+        Merges each pair of adjacent buckets, halving the resolution.
+        """
+        values = np.frombuffer(self._values, dtype=np.float64)
+        minimums = np.frombuffer(self._min, dtype=np.float64)
+        maximums = np.frombuffer(self._max, dtype=np.float64)
+        counts = np.frombuffer(self._count, dtype=np.int64).astype(np.float64)
+
+        size = len(values) // 2 * 2
+        pair_counts = counts[:size].reshape(-1, 2)
+        pair_sums = (values[:size] * counts[:size]).reshape(-1, 2)
+
+        merged_counts = pair_counts.sum(axis=1)
+        merged_values = pair_sums.sum(axis=1) / merged_counts
+        merged_min = minimums[:size].reshape(-1, 2).min(axis=1)
+        merged_max = maximums[:size].reshape(-1, 2).max(axis=1)
+
+        # An odd bucket left at the end is kept as it is
+        rest = slice(size, len(values))
+        self._values = array('d', np.append(merged_values, values[rest]))
+        self._min = array('d', np.append(merged_min, minimums[rest]))
+        self._max = array('d', np.append(merged_max, maximums[rest]))
+        self._count = array('q', np.append(merged_counts,
+                                           counts[rest]).astype(np.int64))
+        self._width *= 2
+
+    def tolist(self) -> List[float]:
+        """
+        Gets the values of the series as a list.
+
+        Returns
+        -------
+        values : list of float
+            Values of the series, or the mean of each bucket.
+        """
+        return self.to_numpy().tolist()
+
+    def to_numpy(self) -> np.ndarray:
+        """
+        Gets the values of the series as an array.
+
+        Returns
+        -------
+        values : np.ndarray
+            Values of the series, or the mean of each bucket.
+        """
+        values = np.array(self._values, dtype=np.float64)
+
+        if self.policy == 'ring':
+            values = np.roll(values, -self._start)
+
+        return values
+
+    def get_buckets(self) -> Dict[str, np.ndarray]:
+        """
+        Gets the buckets of a series with the 'buckets' policy.
+
+        Returns
+        -------
+        buckets : Dict[str, np.ndarray]
+            Mean, minimum, maximum and number of values of each bucket.
+        """
+        if self.policy != 'buckets':
+            raise ValueError('The series has no buckets')
+
+        return {
+            'mean': np.array(self._values, dtype=np.float64),
+            'min': np.array(self._min, dtype=np.float64),
+            'max': np.array(self._max, dtype=np.float64),
+            'count': np.array(self._count, dtype=np.int64)
+        }
+
+    def get(self) -> np.ndarray:
+        return self.to_numpy()
+
+class MetricColumns(Sequence):
+    """
+    Table of metrics stored as one MetricSeries per metric name, instead of
+    a list with a dictionary for each row.
+
+    Parameters
+    ----------
+    rows : list of dict
+        Initial rows. Default is None.
+    max_size : int
+        Maximum number of values or buckets of each metric. Default is None.
+    policy : str
+        What to do when a metric is full: 'ring' or 'buckets'. Default is
+        None.
+
+    Attributes
+    ----------
+    columns : Dict[str, MetricSeries]
+        Series of each metric.
+    _max_size : int
+        Maximum number of values or buckets of each metric.
+    _policy : str
+        What to do when a metric is full.
+    _size : int
+        Number of rows appended.
+    """
+    def __init__(self, rows: List[Dict] = None, max_size: int = None,
+                 policy: str = None) -> None:
+        self.columns = {}
+        self._max_size = max_size
+        self._policy = policy
+        self._size = 0
+
+        for row in rows or []:
+            self.append(row)
+
+    def __len__(self) -> int:
+        if not self.columns:
+            return 0
+
+        return len(next(iter(self.columns.values())))
+
+    def __getitem__(self, idx: Union[int, slice]) -> Union[Dict, List[Dict]]:
+        if isinstance(idx, slice):
+            return [self[row] for row in range(len(self))[idx]]
+
+        return {name: series[idx] for name, series in self.columns.items()}
+
+    def append(self, values: Dict) -> None:
+        """
+        Appends a row of metric values. Metrics missing in a row are stored
+        as NaN.
+
+        Parameters
+        ----------
+        values : Dict
+            Value of each metric.
+        """
+        for name in values:
+            if name not in self.columns:
+                # Fills the previous rows of a new metric
+                self.columns[name] = MetricSeries([np.nan] * self._size,
+                                                  self._max_size,
+                                                  self._policy)
+
+        for name, series in self.columns.items():
+            series.append(values.get(name, np.nan))
+
+        self._size += 1
+
+    def get(self) -> Dict[str, np.ndarray]:
+        """
+        Gets the values of each metric.
+
+        Returns
+        -------
+        columns : Dict[str, np.ndarray]
+            Values of each metric, or the mean of each bucket.
+        """
+        return {name: series.to_numpy()
+                for name, series in self.columns.items()}
@@ -1,14 +1,89 @@
 from __future__ import annotations
-from typing import Dict
-from deeplearning_logger.json import ConfigsJSONEncoder
+from typing import Dict, List, Tuple
+from deeplearning_logger.json import JSONSerializer
+from deeplearning_logger.diff import ExperimentDiff, ExperimentsDiff, \
+                                     diff_many, diff_metrics, diff_trees
+from deeplearning_logger.arrays import ArrayStore
+from deeplearning_logger.architectures import ArchitectureStore
+from deeplearning_logger.checkpoints import BlobStore, CheckpointRegistry, \
+                                            check_dedup_mode
+from deeplearning_logger.writer import BackgroundWriter, snapshot
+from deeplearning_logger.files import FileLock, check_fsync_policy, \
+                                      commit_files
+from deeplearning_logger.distributed import get_rank
+from deeplearning_logger.profiling import profiled
+from deeplearning_logger.compression import check_compression, \
+                                            compress_stream, find_file, \
+                                            get_extension, read_file
 from deeplearning_logger.pytorch.experiment_data import MetricsData, ModelData,\
                                                         OptimizerData
-import json
+from deeplearning_logger.pytorch.experiment_log import ExperimentLog
+import functools
 import os
-from datetime import date, datetime
+import numpy as np
+from datetime import datetime
 
 class PytorchLogger():
-    def __init__(self, project_folder: str = '') -> None:
+    """
+    Logger of PyTorch experiments.
+
+    Parameters
+    ----------
+    project_folder : str
+        Folder where the experiments are saved. Default is the current
+        working directory.
+    array_threshold : int
+        Minimum number of elements of a numeric series, such as the losses,
+        to be stored in a sidecar .npy file instead of inline. Default is
+        None, which stores every series inline.
+    writer : BackgroundWriter
+        Writer running the serialization and writing of the experiment files
+        in a background thread. Default is None, which writes them in the
+        caller's thread.
+    serializer : JSONSerializer
+        Serializer of the experiment files. Default is None, which uses the
+        standard library json module with indentation.
+    dedup_architectures : bool
+        If True, each distinct model architecture is written once into the
+        '.architectures' folder, and the experiments only keep its hash.
+        Default is False.
+    fsync : str
+        'always' flushes the experiment files to disk before they become
+        visible, 'never' relies on atomic renames only. Default is 'never'.
+    compression : str
+        Compression of the experiment files, 'gzip' or 'zstd'. The
+        experiments are loaded whatever their compression. Default is None,
+        which writes plain JSON files.
+    rank_zero_only : bool
+        If True, only the process of rank 0 of a distributed training saves
+        and logs the experiments, and the other ranks skip every write.
+        Default is False.
+    rank : int
+        Rank of the process. Default is None, which reads the RANK
+        environment variable.
+    checkpoint_dedup : str
+        How the registered checkpoints are deduplicated into the
+        '.checkpoints' folder: 'copy', 'link' or None, see
+        `check_dedup_mode`. Default is None, which only hashes the
+        checkpoints. 'copy' stores a second copy of every distinct
+        checkpoint, doubling their disk use, and 'link' takes no extra space
+        but requires each checkpoint file to be written once.
+    """
+    _ARCHITECTURES_FOLDER = '.architectures'
+    _CHECKPOINTS_FOLDER = '.checkpoints'
+
+    def __init__(self, project_folder: str = '',
+                 array_threshold: int = None,
+                 writer: BackgroundWriter = None,
+                 serializer: JSONSerializer = None,
+                 dedup_architectures: bool = False,
+                 fsync: str = 'never', compression: str = None,
+                 rank_zero_only: bool = False, rank: int = None,
+                 checkpoint_dedup: str = None) -> None:
+        check_fsync_policy(fsync)
+        check_compression(compression)
+        check_dedup_mode(checkpoint_dedup)
+
         if not project_folder:
             self.project_path = os.getcwd()
             self.project_path = os.path.join(self.project_path, '')
@@ -16,6 +91,29 @@ class PytorchLogger():
             # This method adds the '/' at the end if it is not already added
             self.project_path = os.path.join(project_folder, '')
 
+        self._array_threshold = array_threshold
+        self._writer = writer
+        self._serializer = serializer or JSONSerializer()
+        self._fsync = fsync
+        self._compression = compression
+        self._enabled = not rank_zero_only or get_rank(rank) == 0
+        self._pending = set()
+
+        if dedup_architectures:
+            self._architecture_store = ArchitectureStore(
+                        self.project_path + self._ARCHITECTURES_FOLDER)
+        else:
+            self._architecture_store = None
+
+        if checkpoint_dedup is not None:
+            self._checkpoint_store = BlobStore(
+                        self.project_path + self._CHECKPOINTS_FOLDER,
+                        checkpoint_dedup)
+        else:
+            self._checkpoint_store = None
+        self._logs = {}
+
+    @profiled('PytorchLogger.save')
     def save(self, data: ExperimentData, experiment_name: str) -> None:
         """
         Saves the experiment data into a JSON file
@@ -30,11 +128,342 @@ class PytorchLogger():
         if not isinstance(data, ExperimentData):
             raise ValueError('The data must be an ExperimentData object')
 
-        if os.path.isfile(f'{self.project_path}{experiment_name}.json'):
+        if not self._enabled:
+            return
+
+        # Experiments submitted to the writer may not be written yet
+        if experiment_name in self._pending or \
+                find_file(f'{self.project_path}{experiment_name}.json'):
+            raise ValueError('There is already an experiment with that name')
+
+        if self._writer is None:
+            self._write_experiment(data.get(), experiment_name)
+        else:
+            self._pending.add(experiment_name)
+            # A write discarded by the writer policy frees its name
+            release = functools.partial(self._pending.discard, experiment_name)
+
+            try:
+                self._writer.submit(self._write_experiment,
+                                    snapshot(data.get()), experiment_name,
+                                    on_drop=release)
+            except Exception:
+                release()
+                raise
+
+    @profiled('PytorchLogger.write_experiment')
+    def _write_experiment(self, experiment_data: Dict,
+                          experiment_name: str) -> None:
+        """
+        Writes the experiment data into its JSON file
+
+        Parameters
+        ----------
+        experiment_data : dict
+            Dictionary containing the experiment data
+        experiment_name : str
+            JSON filename
+        """
+        path = f'{self.project_path}{experiment_name}.json'
+
+        try:
+            if self._architecture_store is not None and \
+                    experiment_data.get('architecture_hash'):
+                experiment_data = dict(experiment_data)
+                self._architecture_store.put(experiment_data['architecture'],
+                                    experiment_data['architecture_hash'])
+                experiment_data['architecture'] = None
+
+            # Other processes may be saving an experiment with the same name.
+            # The lock is held on the whole folder, without creating files.
+            with FileLock(self.project_path):
+                if find_file(path):
+                    raise ValueError('There is already an experiment with '
+                                     'that name')
+
+                sidecar_files = {}
+
+                if self._array_threshold is not None:
+                    experiment_data = self._get_array_store(
+                                experiment_name).externalize(
+                                        experiment_data, files=sidecar_files)
+
+                def write_data(file):
+                    # The data is compressed while it is serialized
+                    with compress_stream(file, self._compression) as stream:
+                        self._serializer.dump(experiment_data, stream)
+
+                    return file.tell()
+
+                # A killed process leaves temporary files, never a partial
+                # experiment file or sidecar files of another version
+                filename = os.path.basename(path) + \
+                            get_extension(self._compression)
+                commit_files(self.project_path,
+                             {filename: write_data, **sidecar_files},
+                             self._fsync)
+        finally:
+            self._pending.discard(experiment_name)
+
+    def load(self, experiment_name: str) -> Dict:
+        """
+        Loads the data of a saved experiment. The series stored in sidecar
+        files are memory-mapped.
+
+        Parameters
+        ----------
+        experiment_name : str
+            JSON filename, without the '.json' extension
+
+        Returns
+        -------
+        data : dict
+            Dictionary containing the experiment data
+        """
+        array_store = self._get_array_store(experiment_name)
+
+        # The file may be stored compressed
+        content = read_file(f'{self.project_path}{experiment_name}.json')
+        data = array_store.decode(content, self._serializer)
+
+        # Architectures stored apart are only referenced by their hash
+        if data.get('architecture') is None and data.get('architecture_hash'):
+            folder = self.project_path + self._ARCHITECTURES_FOLDER
+            data['architecture'] = ArchitectureStore(folder).get(
+                                                    data['architecture_hash'])
+
+        return data
+
+    def diff(self, old_experiment: str, new_experiment: str) -> ExperimentDiff:
+        """
+        Compares two saved experiments: the model, optimizer and other
+        values, and the differences of their losses and metrics.
+
+        Parameters
+        ----------
+        old_experiment : str
+            Name of the experiment compared against.
+        new_experiment : str
+            Name of the compared experiment.
+
+        Returns
+        -------
+        diff : ExperimentDiff
+            Changed values and statistics of each metric.
+        """
+        old_tree, old_columns = _split_metrics(self.load(old_experiment))
+        new_tree, new_columns = _split_metrics(self.load(new_experiment))
+
+        return ExperimentDiff([old_experiment, new_experiment],
+                              diff_trees(old_tree, new_tree),
+                              diff_metrics(old_columns, new_columns))
+
+    def diff_many(self, experiment_names: List[str]) -> ExperimentsDiff:
+        """
+        Compares several saved experiments: the values which are not equal
+        in all of them, and reductions of each loss and metric.
+
+        Parameters
+        ----------
+        experiment_names : List[str]
+            Names of the experiments.
+
+        Returns
+        -------
+        diff : ExperimentsDiff
+            Differing values and metrics of each experiment.
+        """
+        data = [_split_metrics(self.load(experiment_name))
+                for experiment_name in experiment_names]
+
+        return diff_many({name: tree for name, (tree, _) in
+                          zip(experiment_names, data)},
+                         {name: columns for name, (_, columns) in
+                          zip(experiment_names, data)})
+
+    def get_checkpoints(self, experiment_name: str,
+                        monitor: str = 'val_loss',
+                        mode: str = 'min') -> CheckpointRegistry:
+        """
+        Gets the checkpoint registry of an experiment, stored next to its
+        JSON file.
+
+        Parameters
+        ----------
+        experiment_name : str
+            Experiment's name.
+        monitor : str
+            Metric used to find the best checkpoint. Default is 'val_loss'.
+        mode : str
+            'min' if lower values of the monitored metric are better, 'max'
+            if higher values are better. Default is 'min'.
+
+        Returns
+        -------
+        registry : CheckpointRegistry
+            Checkpoint registry of the experiment.
+        """
+        return CheckpointRegistry(
+                    f'{self.project_path}{experiment_name}.checkpoints.jsonl',
+                    monitor, mode, self._checkpoint_store, self._fsync)
+
+    def _get_array_store(self, experiment_name: str) -> ArrayStore:
+        return ArrayStore(self.project_path, self._array_threshold or 0,
+                          directory=f'{experiment_name}_arrays')
+
+    def start(self, data: ExperimentData, experiment_name: str) -> None:
+        """
+        Starts the append log of an experiment.
+
+        After this call the epoch and step results are appended to the
+        experiment log file with `log_epoch` and `log_step` as the training
+        progresses, instead of being kept in memory.
+
+        Parameters
+        ----------
+        data : ExperimentData
+            ExperimentData object which contains the data
+        experiment_name : str
+            Log filename, without the '.jsonl' extension
+        """
+        if not isinstance(data, ExperimentData):
+            raise ValueError('The data must be an ExperimentData object')
+
+        if not self._enabled:
+            return
+
+        log_path = f'{self.project_path}{experiment_name}.jsonl'
+
+        if experiment_name in self._logs or os.path.isfile(log_path):
             raise ValueError('There is already an experiment with that name')
-        
-        with open(f'{self.project_path}{experiment_name}.json', 'w') as outfile:    
-            json.dump(data.get(), outfile, indent=4, cls=ConfigsJSONEncoder)
+
+        log = ExperimentLog(log_path)
+
+        try:
+            # The log is created exclusively, other processes can't take it
+            log.open(data.get())
+        except FileExistsError:
+            raise ValueError('There is already an experiment with that name')
+
+        data.attach_log(log)
+
+        self._logs[experiment_name] = log
+
+    def log_epoch(self, experiment_name: str, train_loss: float = None,
+                  val_loss: float = None, train_metrics: Dict = None,
+                  val_metrics: Dict = None) -> None:
+        """
+        Appends the results of an epoch to the experiment log.
+
+        Parameters
+        ----------
+        experiment_name : str
+            Name of a started experiment
+        train_loss : float
+            Training loss of the epoch. Default is None.
+        val_loss : float
+            Validation loss of the epoch. Default is None.
+        train_metrics : dict
+            Training metrics of the epoch. Default is None.
+        val_metrics : dict
+            Validation metrics of the epoch. Default is None.
+        """
+        if not self._enabled:
+            return
+
+        self._get_log(experiment_name).log_epoch(train_loss, val_loss,
+                                                 train_metrics, val_metrics)
+
+    def log_step(self, experiment_name: str, metrics: Dict,
+                 step: int = None) -> None:
+        """
+        Appends the metrics of a training step to the experiment log.
+
+        Parameters
+        ----------
+        experiment_name : str
+            Name of a started experiment
+        metrics : dict
+            Metrics of the step
+        step : int
+            Step number. Default is the number of steps already logged.
+        """
+        if not self._enabled:
+            return
+
+        self._get_log(experiment_name).log_step(metrics, step)
+
+    def finish(self, experiment_name: str) -> None:
+        """
+        Closes the append log of an experiment.
+
+        Parameters
+        ----------
+        experiment_name : str
+            Name of a started experiment
+        """
+        if not self._enabled:
+            return
+
+        self._get_log(experiment_name).close()
+        del self._logs[experiment_name]
+
+    def _get_log(self, experiment_name: str) -> ExperimentLog:
+        if experiment_name not in self._logs:
+            raise ValueError(f'The experiment {experiment_name} is not started')
+
+        return self._logs[experiment_name]
+
+# Fields of the saved experiments which are compared as metrics, and fields
+# which are not compared
+_LOSS_FIELDS = ('train_losses', 'val_losses')
+_METRICS_FIELDS = ('train_metrics', 'val_metrics')
+_DATETIME_FIELDS = ('date', 'time')
+
+def _split_metrics(data: Dict) -> Tuple[Dict, Dict]:
+    """
+    Splits the data of a saved experiment into the values compared
+    structurally and the series compared as metrics.
+
+    Parameters
+    ----------
+    data : Dict
+        Data of the experiment, as loaded.
+
+    Returns
+    -------
+    tree : Dict
+        Model, optimizer and other values.
+    columns : Dict
+        Values of each loss, and of each metric prefixed with its field,
+        such as 'val_metrics.accuracy'.
+    """
+    tree = {}
+    columns = {}
+
+    for key, value in data.items():
+        if key in _LOSS_FIELDS:
+            columns[key] = value
+        elif key in _METRICS_FIELDS:
+            # Stored as a row per epoch or as a column per metric
+            if isinstance(value, dict):
+                rows = None
+                metrics = value
+            else:
+                rows = value
+                metrics = {metric: None for row in rows for metric in row}
+
+            for metric in metrics:
+                columns[f'{key}.{metric}'] = metrics[metric] if rows is None \
+                        else [row.get(metric) for row in rows]
+        elif key not in _DATETIME_FIELDS:
+            tree[key] = value
+
+    # Missing values are compared as NaN
+    columns = {key: np.array(values, dtype=np.float64)
+               for key, values in columns.items()}
+
+    return tree, columns
 
 class ExperimentData():
     """
@@ -70,6 +499,19 @@ class ExperimentData():
         self.data = [model, metrics, optimizer]
         self._annotations = {'annotations': annotations}
         self._datetime = self._get_datetime()
+        self._log = None
+
+    def attach_log(self, log: ExperimentLog) -> None:
+        """
+        Attaches an append log to the experiment data. Once attached, the
+        metrics series returned by `get` are rebuilt from the log.
+
+        Parameters
+        ----------
+        log : ExperimentLog
+            Log where the experiment results are appended
+        """
+        self._log = log
 
     def _get_datetime(self):
         """
@@ -93,6 +535,7 @@ class ExperimentData():
 
         return datetime_date
 
+    @profiled('ExperimentData.get')
     def get(self) -> Dict:
         """
         Gets the experiment data as a dictionary
@@ -111,4 +554,8 @@ class ExperimentData():
         data.update(self._annotations)
         data.update(self._datetime)
 
+        # The metrics series logged incrementally live in the log file
+        if self._log is not None:
+            data.update(self._log.rebuild())
+
         return data    
\ No newline at end of file
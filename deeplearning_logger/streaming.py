@@ -0,0 +1,446 @@
+import codecs
+import json
+import os
+import re
+import numpy as np
+from typing import IO, Any, Dict, Iterator, Tuple
+from deeplearning_logger.arrays import ArrayStore, is_reference
+from deeplearning_logger.compression import open_file
+
+_CHUNK_SIZE = 1 << 16
+# Characters after a value which ensure it is complete, such as a number
+# which could be cut after its decimal point
+_VALUE_MARGIN = 32
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Strings and brackets. A lone quote is a string cut at the end of the
+# buffer.
+_STRUCTURE = re.compile(r'"(?:[^"\\]|\\.)*"|"|[\[\]{}]')
+_EPOCH_PREFIX = 'epoch_'
+_DECODER = json.JSONDecoder()
+
+def iter_sections(path: str) -> Iterator[Tuple[str, Any]]:
+    """
+    Reads the sections of an experiment data file one at a time, so only one
+    of them is held in memory.
+
+    Parameters
+    ----------
+    path : str
+        Path of the plain experiment data file. Compressed files are
+        decompressed while they are read.
+
+    Yields
+    ------
+    name : str
+        Section name, such as 'metrics'.
+    data : Any
+        Section data.
+    """
+    with open_file(path) as file:
+        scanner = _Scanner(file)
+        scanner.expect('{')
+
+        for name in scanner.members():
+            yield name, _resolve(path, scanner.decode())
+
+def read_section(path: str, name: str) -> Any:
+    """
+    Reads a single section of an experiment data file. The other sections
+    are scanned without being decoded.
+
+    Parameters
+    ----------
+    path : str
+        Path of the plain experiment data file.
+    name : str
+        Section name, such as 'metrics' or 'model'.
+
+    Returns
+    -------
+    data : Any
+        Section data.
+    """
+    with open_file(path) as file:
+        scanner = _Scanner(file)
+        _find_section(scanner, name)
+
+        return _resolve(path, scanner.decode())
+
+def iter_epochs(path: str, name: str = 'metrics') -> Iterator[Tuple[int,
+                                                                  Dict]]:
+    """
+    Iterates the epochs of a metrics section.
+
+    With the epochs layout only one epoch is decoded at a time, so the
+    memory doesn't depend on the number of epochs. The columns layout is
+    decoded whole, except the columns stored in sidecar files, which are
+    memory-mapped.
+
+    Parameters
+    ----------
+    path : str
+        Path of the plain experiment data file.
+    name : str
+        Metrics section, 'metrics' or 'batch_metrics'. Default is 'metrics'.
+
+    Yields
+    ------
+    epoch : int
+        Epoch number.
+    metrics : Dict
+        Value of each metric in the epoch.
+    """
+    with open_file(path) as file:
+        scanner = _Scanner(file)
+        _find_section(scanner, name)
+        scanner.expect('{')
+        members = scanner.members()
+
+        for key in members:
+            data = scanner.decode()
+
+            # Columns layout, each value is the series of a metric
+            if not isinstance(data, dict) or is_reference(data):
+                columns = {key: _resolve(path, data)}
+                columns.update((key, _resolve(path, scanner.decode()))
+                               for key in members)
+
+                for epoch, values in enumerate(zip(*columns.values())):
+                    yield epoch, dict(zip(columns, values))
+                return
+
+            yield int(key[len(_EPOCH_PREFIX):]), data
+
+def iter_metric(path: str, metric: str,
+                name: str = 'metrics') -> Iterator[float]:
+    """
+    Iterates the values of a metric in each epoch, in constant memory with
+    either layout.
+
+    Parameters
+    ----------
+    path : str
+        Path of the plain experiment data file.
+    metric : str
+        Metric name.
+    name : str
+        Metrics section, 'metrics' or 'batch_metrics'. Default is 'metrics'.
+
+    Yields
+    ------
+    value : float
+        Value of the metric, None if an epoch doesn't have it.
+    """
+    with open_file(path) as file:
+        scanner = _Scanner(file)
+        _find_section(scanner, name)
+        scanner.expect('{')
+
+        for key in scanner.members():
+            if scanner.peek() == '[':
+                if key != metric:
+                    scanner.skip()
+                    continue
+
+                # Columns layout, only the metric column is decoded
+                yield from scanner.iter_array()
+                return
+
+            data = scanner.decode()
+
+            if not is_reference(data):
+                # Epochs layout, the metric is looked up in each epoch
+                yield data.get(metric)
+            elif key == metric:
+                # Column stored in a sidecar file, which is memory-mapped
+                yield from _resolve(path, data)
+                return
+
+def read_metric(path: str, metric: str, name: str = 'metrics') -> np.ndarray:
+    """
+    Reads the values of a metric into an array. With the columns layout the
+    other metrics are skipped without being decoded, and with the epochs
+    layout one epoch is decoded at a time.
+
+    Parameters
+    ----------
+    path : str
+        Path of the plain experiment data file.
+    metric : str
+        Metric name.
+    name : str
+        Metrics section, 'metrics' or 'batch_metrics'. Default is 'metrics'.
+
+    Returns
+    -------
+    values : np.ndarray
+        Values of the metric, NaN in the epochs which don't have it, and
+        empty if no epoch has it.
+    """
+    with open_file(path) as file:
+        scanner = _Scanner(file)
+        _find_section(scanner, name)
+        scanner.expect('{')
+        members = scanner.members()
+
+        for key in members:
+            if scanner.peek() == '[':
+                if key != metric:
+                    scanner.skip()
+                    continue
+
+                # Columns layout, only the metric column is decoded
+                return np.array(scanner.decode(), dtype=np.float64)
+
+            data = scanner.decode()
+
+            if is_reference(data):
+                if key == metric:
+                    # Column stored in a sidecar file, which is memory-mapped
+                    return np.asarray(_resolve(path, data), dtype=np.float64)
+                continue
+
+            # Epochs layout, one epoch is decoded at a time and only the
+            # metric is kept
+            values = [data.get(metric)]
+            values.extend(scanner.decode().get(metric) for _ in members)
+
+            if all(value is None for value in values):
+                return np.empty(0)
+
+            return np.array(values, dtype=np.float64)
+
+    return np.empty(0)
+
+class _Scanner():
+    """
+    Incremental reader of a JSON document.
+
+    The structure of the document is walked in Python one member at a time,
+    while the values are decoded by the C decoder of the json module and the
+    skipped values are scanned with a regular expression. Only the value
+    being read is held in memory.
+
+    Parameters
+    ----------
+    file : IO
+        Binary file with the JSON document.
+
+    Attributes
+    ----------
+    _file : IO
+        Binary file with the JSON document.
+    _decoder : codecs.IncrementalDecoder
+        UTF-8 decoder, which keeps the characters cut between chunks.
+    _buffer : str
+        Decoded characters read from the file and not discarded yet.
+    _position : int
+        Position of the next character in the buffer.
+    _eof : bool
+        Whether the whole file was read.
+    """
+    def __init__(self, file: IO) -> None:
+        self._file = file
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._position = 0
+        self._eof = False
+
+    def peek(self) -> str:
+        """
+        Skips the whitespace and gets the next character, which is not
+        consumed.
+
+        Returns
+        -------
+        char : str
+            Next character, empty at the end of the document.
+        """
+        while True:
+            self._position = _WHITESPACE.match(self._buffer,
+                                               self._position).end()
+
+            if self._position < len(self._buffer) or not self._fill():
+                return self._buffer[self._position:self._position + 1]
+
+    def expect(self, char: str) -> None:
+        """
+        Consumes the next character, which must be the given one.
+
+        Parameters
+        ----------
+        char : str
+            Expected character.
+        """
+        found = self.peek()
+
+        if found != char:
+            raise ValueError(f'Expected {char!r} in the JSON document, found '
+                             f'{found!r}')
+        self._position += 1
+
+    def members(self) -> Iterator[str]:
+        """
+        Iterates the keys of an object whose '{' is already consumed. The
+        value of each key must be read before the next key is requested.
+
+        Yields
+        ------
+        key : str
+            Key of the member whose value is next.
+        """
+        first = True
+
+        while True:
+            if self.peek() == '}':
+                self._position += 1
+                return
+            if not first:
+                self.expect(',')
+
+            key = self.decode()
+            self.expect(':')
+            first = False
+
+            yield key
+
+    def decode(self) -> Any:
+        """
+        Decodes the next value.
+
+        Returns
+        -------
+        value : Any
+            Decoded value.
+        """
+        self.peek()
+
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer,
+                                                 self._position)
+            except ValueError:
+                # The value may continue in the next chunks
+                if not self._fill():
+                    raise
+                continue
+
+            if self._eof or len(self._buffer) - end >= _VALUE_MARGIN:
+                self._position = end
+                return value
+
+            start = self._position
+            remaining = len(self._buffer) - start
+
+            # A value ending the file is not decoded again
+            if not self._fill() or len(self._buffer) == remaining:
+                self._position = end - start
+                return value
+
+    def skip(self) -> None:
+        """
+        Consumes the next value without decoding it.
+        """
+        if self.peek() not in ('{', '['):
+            self.decode()
+            return
+
+        depth = 0
+
+        while True:
+            for match in _STRUCTURE.finditer(self._buffer, self._position):
+                token = match.group()
+
+                if token == '"':
+                    # The cut string is scanned again with the next chunk
+                    self._position = match.start()
+                    break
+                if token[0] == '"':
+                    continue
+
+                depth += 1 if token in '[{' else -1
+
+                if depth == 0:
+                    self._position = match.end()
+                    return
+            else:
+                self._position = len(self._buffer)
+
+            if not self._fill():
+                raise ValueError('Unexpected end of the JSON document')
+
+    def iter_array(self) -> Iterator[Any]:
+        """
+        Iterates the elements of the next array, which must only contain
+        numbers, null or booleans. The elements are decoded in batches of
+        about a chunk.
+
+        Yields
+        ------
+        value : Any
+            Element of the array.
+        """
+        self.expect('[')
+
+        while True:
+            end = self._buffer.find(']', self._position)
+            last = end >= 0
+
+            if not last:
+                end = self._buffer.rfind(',', self._position)
+
+            if end < 0:
+                if not self._fill():
+                    raise ValueError('Unexpected end of the JSON document')
+                continue
+
+            batch = self._buffer[self._position:end]
+            self._position = end + 1
+
+            if batch.strip():
+                yield from json.loads(f'[{batch}]')
+            if last:
+                return
+
+            self._fill()
+
+    def _fill(self) -> bool:
+        """
+        Reads the next chunk of the file into the buffer, discarding the
+        consumed characters.
+
+        Returns
+        -------
+        filled : bool
+            False if the end of the file was already reached.
+        """
+        if self._eof:
+            return False
+
+        # Values longer than a chunk are read in growing chunks, so decoding
+        # them again after each read stays linear
+        data = self._file.read(max(_CHUNK_SIZE,
+                                   len(self._buffer) - self._position))
+        self._eof = not data
+        self._buffer = self._buffer[self._position:] + \
+                        self._decoder.decode(data, final=self._eof)
+        self._position = 0
+
+        return True
+
+def _find_section(scanner: _Scanner, name: str) -> None:
+    """
+    Moves the scanner to the value of a top-level key.
+    """
+    scanner.expect('{')
+
+    for key in scanner.members():
+        if key == name:
+            return
+        scanner.skip()
+
+    raise KeyError(f'The experiment has no {name} config')
+
+def _resolve(path: str, data: Any) -> Any:
+    # Series stored in sidecar files are memory-mapped
+    return ArrayStore(os.path.dirname(path)).internalize(data)
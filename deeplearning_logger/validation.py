@@ -0,0 +1,47 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+# Runtime validation of the data objects, enabled by default
+_enabled = True
+# Threads building trusted objects skip the validation
+_trusted = threading.local()
+
+def set_validation(enabled: bool) -> None:
+    """
+    Enables or disables the runtime type validation of the data objects and
+    configs in every thread, such as in production hot paths whose data is
+    already known to be valid.
+
+    Parameters
+    ----------
+    enabled : bool
+        Whether the types are validated.
+    """
+    global _enabled
+    _enabled = enabled
+
+def is_validation_enabled() -> bool:
+    """
+    Checks whether the runtime type validation is enabled in this thread.
+
+    Returns
+    -------
+    enabled : bool
+        True if the types are validated.
+    """
+    return _enabled and not getattr(_trusted, 'active', False)
+
+@contextmanager
+def skip_validation() -> Iterator[None]:
+    """
+    Context manager which skips the type validation of the objects built
+    inside it, only in the current thread.
+    """
+    previous = getattr(_trusted, 'active', False)
+    _trusted.active = True
+
+    try:
+        yield
+    finally:
+        _trusted.active = previous
@@ -0,0 +1,236 @@
+import atexit
+import queue
+import threading
+from typing import Any, Callable, List, Tuple
+
+class BackgroundWriter():
+    """
+    Runs the serialization and writing of experiment files in a background
+    thread, so the training thread only pays for enqueuing a snapshot.
+
+    Pending writes are finished when the interpreter exits.
+
+    Parameters
+    ----------
+    max_pending : int
+        Maximum number of writes waiting in the queue. Default is 64.
+    policy : str
+        What to do when the queue is full: 'block' waits for a free slot,
+        'drop_oldest' discards the oldest pending write, 'drop_newest'
+        discards the new write and 'raise' raises a BufferError. Default is
+        'block'.
+
+    Attributes
+    ----------
+    dropped : int
+        Number of writes discarded because the queue was full.
+    _policy : str
+        Policy applied when the queue is full.
+    _queue : queue.Queue
+        Pending writes.
+    _errors : list
+        Exceptions raised by the writes, reported on `flush` or `close`.
+    _closed : bool
+        Whether the writer is closed.
+    _lock : threading.Lock
+        Lock held while a write is checked and enqueued, and while the
+        writer is closed.
+    _thread : threading.Thread
+        Thread running the writes.
+    """
+    _POLICIES = ('block', 'drop_oldest', 'drop_newest', 'raise')
+
+    def __init__(self, max_pending: int = 64, policy: str = 'block') -> None:
+        if policy not in self._POLICIES:
+            raise ValueError(f'The policy must be one of {self._POLICIES}')
+
+        self.dropped = 0
+        self._policy = policy
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._errors = []
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name='deeplearning-logger-writer')
+        self._thread.start()
+
+        atexit.register(self.close)
+
+    def submit(self, function: Callable, *args: Any,
+               on_drop: Callable[[], Any] = None,
+               required: bool = False) -> None:
+        """
+        Enqueues a write. The arguments must be a snapshot of the data, not
+        modified by the caller afterwards.
+
+        Parameters
+        ----------
+        function : Callable
+            Function which serializes and writes the data.
+        args : Any
+            Arguments of the function.
+        on_drop : Callable
+            Function called without arguments if the policy discards the
+            write, so the caller can release what it reserved for it.
+            Default is None.
+        required : bool
+            If True, the write is never discarded, it waits for a free slot
+            whatever the policy. For the writes which a later write doesn't
+            replace, such as appended changes. Default is False.
+        """
+        task = (function, args, on_drop, required)
+
+        with self._lock:
+            # Checked with the lock held, so no write is enqueued after the
+            # writer is closed
+            if self._closed:
+                raise ValueError('The writer is closed')
+
+            if self._policy == 'block' or required:
+                self._queue.put(task)
+                dropped = []
+            else:
+                dropped = self._put_or_drop(task)
+
+            self.dropped += len(dropped)
+
+        # The callbacks run outside the lock, they may submit other writes
+        for _, _, dropped_on_drop, _ in dropped:
+            if dropped_on_drop is not None:
+                dropped_on_drop()
+
+    def flush(self) -> None:
+        """
+        Waits until every pending write is finished. The first exception
+        raised by the writes, if any, is raised again.
+        """
+        self._queue.join()
+        self._raise_errors()
+
+    def close(self) -> None:
+        """
+        Finishes the pending writes and stops the background thread.
+        """
+        with self._lock:
+            if self._closed:
+                return
+
+            self._closed = True
+            self._queue.put(None)
+
+        self._thread.join()
+
+        atexit.unregister(self.close)
+        self._raise_errors()
+
+    def _put_or_drop(self, task: Tuple) -> List[Tuple]:
+        """
+        Enqueues a write without waiting, applying the policy if the queue is
+        full.
+
+        Parameters
+        ----------
+        task : Tuple
+            Function, arguments, drop callback and required flag of the
+            write.
+
+        Returns
+        -------
+        dropped : List[Tuple]
+            Writes discarded by the policy.
+        """
+        dropped = []
+
+        while True:
+            try:
+                self._queue.put_nowait(task)
+                return dropped
+            except queue.Full:
+                pass
+
+            if self._policy == 'raise':
+                raise BufferError('There are too many pending writes')
+            elif self._policy == 'drop_newest':
+                return [task]
+
+            oldest = self._drop_oldest()
+
+            # Only required writes are pending, the write waits for them
+            if oldest is None:
+                self._queue.put(task)
+                return dropped
+
+            dropped.append(oldest)
+
+    def _drop_oldest(self) -> Tuple:
+        """
+        Removes the oldest pending write which is not required.
+
+        Returns
+        -------
+        task : Tuple
+            Write removed, None if every pending write is required.
+        """
+        with self._queue.mutex:
+            pending = self._queue.queue
+            # Compared by identity, the arguments may be arrays
+            index = next((index for index, task in enumerate(pending)
+                          if task is not None and not task[3]), None)
+
+            if index is None:
+                return None
+
+            task = pending[index]
+            del pending[index]
+            self._queue.not_full.notify()
+
+        self._queue.task_done()
+
+        return task
+
+    def _run(self) -> None:
+        while True:
+            task = self._queue.get()
+
+            if task is None:
+                self._queue.task_done()
+                break
+
+            function, args, _, _ = task
+
+            try:
+                function(*args)
+            except Exception as exception:
+                self._errors.append(exception)
+            finally:
+                self._queue.task_done()
+
+    def _raise_errors(self) -> None:
+        if self._errors:
+            error = self._errors[0]
+            self._errors = []
+
+            raise error
+
+def snapshot(data: Any) -> Any:
+    """
+    Copies the dicts and lists of a structure, so the caller can keep
+    modifying them while the copy is waiting to be written. The leaf values,
+    including the NumPy arrays, are shared.
+
+    Parameters
+    ----------
+    data : Any
+        Structure of dicts and lists.
+
+    Returns
+    -------
+    copy : Any
+        Copy of the structure.
+    """
+    if isinstance(data, dict):
+        return {key: snapshot(value) for key, value in data.items()}
+    elif isinstance(data, list):
+        return [snapshot(value) for value in data]
+
+    return data
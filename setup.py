@@ -13,13 +13,18 @@ setup(
         'numpy>=1.18.0', 
         'tensorflow>=2.1.0',
         'pandas>=1.2.0',
-        'typeguard',
         'torch>=1.6.0'],
     python_requires='>=3.6',
     extras_require={
         'testing': [
             "pytest"
         ],
+        'fast': [
+            "orjson"
+        ],
+        'zstd': [
+            "zstandard"
+        ],
       },
     version='0.1',
     license='MIT',
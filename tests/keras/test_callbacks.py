@@ -0,0 +1,144 @@
+import pytest
+import os
+import shutil
+import numpy as np
+
+import tensorflow as tf
+
+from deeplearning_logger.keras.callbacks import CheckpointCallback, \
+                                                ExperimentCallback, \
+                                                MetricsBuffer
+from deeplearning_logger.keras.configs import BatchMetricsConfig, \
+                                              MetricsConfig, ModelConfig
+from deeplearning_logger.keras.project import Project
+
+from tests.keras.fixtures import get_iris_data
+
+_PROJECT_PATH = os.path.dirname(os.path.realpath(__file__))
+
+def get_model():
+    model = tf.keras.models.Sequential()
+    model.add(tf.keras.layers.Dense(10, activation='relu'))
+    model.add(tf.keras.layers.Dense(3, activation='softmax'))
+
+    optimizer = tf.keras.optimizers.Adam(learning_rate=0.005)
+    model.compile(loss='sparse_categorical_crossentropy',
+                optimizer=optimizer, metrics=['accuracy'])
+
+    return model
+
+def test_metrics_buffer():
+    """
+    Tests the metrics buffer grows and fills the missing values
+    """
+    buffer = MetricsBuffer(capacity=2)
+
+    for idx in range(5):
+        buffer.append({'loss': float(idx)})
+    buffer.append({'loss': 5., 'accuracy': 0.5})
+
+    columns = buffer.get_columns()
+
+    assert len(buffer) == 6
+    np.testing.assert_array_equal(columns['loss'], np.arange(6.))
+    assert np.isnan(columns['accuracy'][:5]).all()
+    assert columns['accuracy'][5] == 0.5
+
+def test_experiment_callback():
+    """
+    Tests logging an experiment while the model is trained
+    """
+    X, y = get_iris_data()
+    project = Project(project_name='project_callbacks',
+                      project_path=_PROJECT_PATH)
+    callback = ExperimentCallback(project, 'experiment_1',
+                                  description='Live logging',
+                                  log_batches=True, flush_every_epochs=2)
+
+    model = get_model()
+    model.fit(X, y, epochs=3, batch_size=50, callbacks=[callback], verbose=0)
+
+    experiment = project.open_experiment('experiment_1')
+    metrics = experiment.get_config('metrics').get_columns()
+    batch_metrics = experiment.get_config('batch_metrics')
+
+    assert experiment.description == 'Live logging'
+    assert len(metrics['loss']) == 3
+    assert metrics['accuracy'].dtype == np.float64
+    assert isinstance(batch_metrics, BatchMetricsConfig)
+    assert len(batch_metrics.get_columns()['loss']) == 9
+    assert isinstance(experiment.get_config('model'), ModelConfig)
+    # The epoch metrics are indexed
+    assert project.find(metric='loss') == ['experiment_1']
+
+    shutil.rmtree(_PROJECT_PATH + '/project_callbacks/')
+
+def test_experiment_callback_appends_epochs():
+    """
+    Tests the epochs after the first write are appended to the experiment,
+    and merged into its files when the training ends
+    """
+    project = Project(project_name='project_callbacks',
+                      project_path=_PROJECT_PATH)
+    callback = ExperimentCallback(project, 'experiment_1', log_model=False)
+    segments_file = _PROJECT_PATH + '/project_callbacks/experiment_1/' \
+                        'experiment_data.segments.jsonl'
+
+    for epoch in range(3):
+        callback.on_epoch_end(epoch, {'loss': float(epoch)})
+
+    experiment = project.open_experiment('experiment_1')
+    metrics = experiment.get_config('metrics').get_columns()
+
+    assert os.path.isfile(segments_file)
+    np.testing.assert_array_equal(metrics['loss'], [0., 1., 2.])
+
+    callback.on_train_end()
+
+    assert not os.path.isfile(segments_file)
+    assert project.compare('loss').final()[0] == 2.
+
+    shutil.rmtree(_PROJECT_PATH + '/project_callbacks/')
+
+def test_experiment_callback_empty_name_exception():
+    """
+    Tests creating the callback without an experiment name
+    """
+    project = Project(project_name='project_callbacks',
+                      project_path=_PROJECT_PATH)
+
+    with pytest.raises(ValueError):
+        ExperimentCallback(project, '')
+
+    shutil.rmtree(_PROJECT_PATH + '/project_callbacks/')
+
+def test_checkpoint_callback():
+    """
+    Tests registering the checkpoints saved while the model is trained
+    """
+    X, y = get_iris_data()
+    project = Project(project_name='project_callbacks',
+                      project_path=_PROJECT_PATH)
+    project.create_experiment('experiment_1', configs=[
+                                MetricsConfig({'epoch_0': {'loss': 1.}})])
+    registry = project.get_checkpoints('experiment_1', monitor='loss')
+    filepath = _PROJECT_PATH + '/project_callbacks/model.weights.h5'
+
+    checkpoint = tf.keras.callbacks.ModelCheckpoint(
+                    filepath, monitor='loss', save_best_only=True,
+                    save_weights_only=True)
+    callback = CheckpointCallback(registry, filepath)
+
+    model = get_model()
+    history = model.fit(X, y, epochs=3, batch_size=50,
+                        callbacks=[checkpoint, callback], verbose=0)
+
+    losses = history.history['loss']
+    best = project.get_checkpoints('experiment_1', monitor='loss').best()
+
+    assert 1 <= len(registry) <= 3
+    assert best['epoch'] == int(np.argmin(losses))
+    assert best['metrics']['loss'] == pytest.approx(min(losses))
+    assert os.path.isfile(registry.get_file(best))
+
+    shutil.rmtree(_PROJECT_PATH + '/project_callbacks/')
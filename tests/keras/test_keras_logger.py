@@ -1,16 +1,21 @@
 import pytest
+import collections
 import json
 import numpy as np
 import os
+import pathlib
 import pandas as pd
 import shutil
 
 import tensorflow as tf
 from tensorflow.keras.callbacks import ModelCheckpoint
 
+from deeplearning_logger.keras import configs
+from deeplearning_logger.imports import lazy_type
 from deeplearning_logger.keras.keras_logger import Experiment
 from deeplearning_logger.keras.configs import MetricsConfig, ModelConfig, \
-                                            CallbackConfig
+                                            CallbackConfig, \
+                                            register_callback_handler
 
 from tests.keras.fixtures import get_trained_model
 
@@ -75,6 +80,22 @@ def test_logger_log_model(get_trained_model):
     # Removes the project and experiment folder
     shutil.rmtree(_PROJECT_FOLDER)
 
+def test_model_config_changed_layer(get_model):
+    """
+    Tests the architecture of a model is captured again after a layer changes
+    """
+    get_model.build((None, 4))
+    model_hash = ModelConfig(get_model).config[1]['model_hash']
+
+    assert ModelConfig(get_model).config[1]['model_hash'] == model_hash
+
+    get_model.layers[0].trainable = False
+    _, model_data = ModelConfig(get_model).config
+
+    assert model_data['model_hash'] != model_hash
+    assert model_data['model_config']['layers'][1]['config']['trainable'] \
+            is False
+
 def test_logger_log_metrics(get_trained_model):
     """
     Tests logging an experiment which only contains metrics
@@ -216,4 +237,182 @@ def test_logger_non_config_exception():
     assert str(exception_info.value) == 'ModelCheckpoint is not a Config object'
 
     # Remove the project and experiment folder
-    shutil.rmtree(_PROJECT_FOLDER)
\ No newline at end of file
+    shutil.rmtree(_PROJECT_FOLDER)
+
+def test_logger_log_metrics_columns(get_metrics):
+    """
+    Tests logging the metrics using the columns layout
+    """
+    # Create the project and experiment folder
+    experiement_path = _PROJECT_FOLDER + 'log_metrics_columns/'
+    os.makedirs(experiement_path)
+
+    metrics_config = MetricsConfig(get_metrics, layout='columns')
+    experiment = Experiment(experiment_path=experiement_path,
+                            name='log_metrics_columns',
+                            configs=[metrics_config])
+    experiment.register_experiment()
+
+    with open(experiement_path + 'experiment_data.json') as file:
+        experiment_data = json.load(file)
+
+    # Assert each metric is stored as a single list
+    assert experiment_data['metrics']['val_loss'] == \
+            get_metrics['val_loss'].tolist()
+    assert len(experiment_data['metrics']['train_loss']) == 100
+
+    # Remove the project and experiment folder
+    shutil.rmtree(_PROJECT_FOLDER)
+
+def test_metrics_config_columns(get_metrics):
+    """
+    Tests both metrics layouts give the same columns
+    """
+    epochs_config = MetricsConfig(get_metrics)
+    columns_config = MetricsConfig(get_metrics, layout='columns')
+
+    _, config = epochs_config.config
+
+    assert config['epoch_99']['train_loss'] == 990.
+
+    for metric in ['train_loss', 'val_loss']:
+        np.testing.assert_array_equal(epochs_config.get_columns()[metric],
+                                      get_metrics[metric].to_numpy())
+        np.testing.assert_array_equal(columns_config.get_columns()[metric],
+                                      get_metrics[metric].to_numpy())
+
+def test_metrics_config_layout_exception(get_metrics):
+    """
+    Tests creating a MetricsConfig with an unknown layout
+    """
+    with pytest.raises(ValueError):
+        MetricsConfig(get_metrics, layout='rows')
+
+def test_config_data_type_exception(get_trained_model):
+    """
+    Tests creating configs from data of a wrong type
+    """
+    model, metrics = get_trained_model
+
+    with pytest.raises(TypeError):
+        MetricsConfig([1.0, 2.0])
+
+    with pytest.raises(TypeError):
+        ModelConfig(metrics)
+
+    with pytest.raises(TypeError):
+        CallbackConfig(model)
+
+class BufferCallback(tf.keras.callbacks.Callback):
+    """
+    Callback holding numpy and TensorFlow values, like custom callbacks
+    accumulating statistics
+    """
+    def __init__(self):
+        super().__init__()
+        self.best = np.float32(0.5)
+        self.buffer = np.arange(20000, dtype=np.float64)
+        self.counter = tf.Variable(3)
+        self.scale = tf.constant([1., 2.])
+        self.history = {'loss': [1., 0.5], 'steps': [np.int64(1)]}
+        self.monitor_op = np.less
+        self.path = pathlib.Path('weights')
+
+@pytest.fixture
+def handlers(monkeypatch):
+    # The handlers registered by a test are removed afterwards
+    monkeypatch.setattr(configs, '_CALLBACK_HANDLERS',
+                        list(configs._CALLBACK_HANDLERS))
+    monkeypatch.setattr(configs, '_CALLBACK_DISPATCH', {})
+
+def test_callback_config_attribute_types(handlers):
+    """
+    Tests the callback attributes are converted by the handler of their type
+    """
+    _, config = CallbackConfig(BufferCallback()).config
+    attributes = config['BufferCallback']
+
+    assert attributes['best'] == 0.5 and type(attributes['best']) is float
+    assert isinstance(attributes['buffer'], np.ndarray)
+    assert attributes['counter'] == 3
+    assert list(attributes['scale']) == [1., 2.]
+    assert attributes['history'] == {'loss': [1., 0.5], 'steps': [1]}
+    assert attributes['path'] == 'weights'
+    assert 'monitor_op' not in attributes
+
+    # User handlers take precedence, also for a single callback class
+    register_callback_handler(np.ndarray, lambda value: value.shape)
+    register_callback_handler(tf.Variable, None, BufferCallback)
+    _, config = CallbackConfig(BufferCallback()).config
+
+    assert config['BufferCallback']['buffer'] == (20000,)
+    assert 'counter' not in config['BufferCallback']
+
+    _, config = CallbackConfig(ModelCheckpoint('model.keras')).config
+
+    assert config['ModelCheckpoint']['filepath'] == 'model.keras'
+
+    with pytest.raises(TypeError):
+        register_callback_handler(np.ndarray, 'shape')
+
+def test_callback_config_container_subclasses(handlers):
+    """
+    Tests the attributes whose types subclass dict, list or tuple are stored
+    as containers
+    """
+    Point = collections.namedtuple('Point', ['x', 'y'])
+    callback = tf.keras.callbacks.Callback()
+    callback.ordered = collections.OrderedDict(loss=np.float32(0.5))
+    callback.counts = collections.defaultdict(int, {'steps': 2})
+    callback.point = Point(np.int64(1), 2)
+
+    _, config = CallbackConfig(callback).config
+    attributes = config['Callback']
+
+    assert attributes['ordered'] == {'loss': 0.5}
+    assert attributes['counts'] == {'steps': 2}
+    assert attributes['point'] == [1, 2]
+
+    # A handler registered for a subclass takes precedence
+    register_callback_handler(collections.OrderedDict, lambda value: 'ordered')
+    _, config = CallbackConfig(callback).config
+
+    assert config['Callback']['ordered'] == 'ordered'
+
+def test_callback_config_missing_handler_type(handlers):
+    """
+    Tests a handler of a class missing from the installed framework version
+    is ignored
+    """
+    register_callback_handler(lazy_type('tensorflow', 'MissingVariable'),
+                              None)
+    _, config = CallbackConfig(BufferCallback()).config
+
+    assert config['BufferCallback']['counter'] == 3
+
+def test_logger_log_callbacks_sidecar(handlers):
+    """
+    Tests the large arrays of a callback are stored in sidecar files
+    """
+    experiment_path = _PROJECT_FOLDER + 'log_callbacks_sidecar/'
+    os.makedirs(experiment_path)
+
+    experiment = Experiment(experiment_path=experiment_path,
+                            name='log_callbacks_sidecar',
+                            configs=[CallbackConfig(BufferCallback())],
+                            array_threshold=10000)
+    experiment.register_experiment()
+
+    assert os.listdir(experiment_path + 'arrays')
+
+    opened = Experiment.by_config_files(
+                    path=experiment_path,
+                    config_info_file=experiment_path + 'experiment_config.json',
+                    config_data_file=experiment_path + 'experiment_data.json')
+    _, config = opened.get_config('callbacks').config
+
+    np.testing.assert_array_equal(config['BufferCallback']['buffer'],
+                                  np.arange(20000))
+
+    # Remove the project and experiment folder
+    shutil.rmtree(_PROJECT_FOLDER)
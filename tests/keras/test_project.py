@@ -1,10 +1,22 @@
 import pytest
+import json
+import numpy as np
 import os
+import pandas as pd
 import tensorflow as tf
 import shutil
+import threading
+import time
+import warnings
+
+from concurrent.futures import ThreadPoolExecutor
 
 from deeplearning_logger.keras.project import Project
-from deeplearning_logger.keras.configs import MetricsConfig, ModelConfig
+from deeplearning_logger.keras.configs import BatchMetricsConfig, \
+                                              MetricsConfig, ModelConfig
+from deeplearning_logger.writer import BackgroundWriter
+from deeplearning_logger.files import get_temp_path
+from deeplearning_logger import checkpoints
 
 from tests.keras.fixtures import get_trained_model
 
@@ -126,4 +138,697 @@ def test_open_experiment():
     experiment = project.open_experiment('experiment_1')
 
     assert experiment._name == 'experiment_1'
-    assert isinstance(experiment._configs[0], ModelConfig)
\ No newline at end of file
+    assert isinstance(experiment._configs[0], ModelConfig)
+
+def test_open_experiment_sidecar_arrays():
+    """
+    Test storing the metrics series in sidecar files and memory-mapping them
+    when the experiment is opened
+    """
+    project_path = os.path.dirname(os.path.realpath(__file__))
+    project = Project(project_name='project_04', project_path=project_path,
+                      array_threshold=50)
+
+    metrics = pd.DataFrame({'loss': np.linspace(1, 0, 100),
+                            'accuracy': np.linspace(0, 1, 100),
+                            'val/loss': np.linspace(2, 1, 100),
+                            'val_loss': np.linspace(3, 2, 100)})
+    metrics_config = MetricsConfig(metrics, layout='columns')
+    project.create_experiment('experiment_1', configs=[metrics_config])
+
+    experiment_path = project_path + '/project_04/experiment_1/'
+
+    with open(experiment_path + 'experiment_data.json') as file:
+        experiment_data = json.load(file)
+
+    # The JSON file only holds references to the sidecar files
+    assert experiment_data['metrics']['loss'] == \
+            {'__ndarray__': 'arrays/metrics.loss.npy'}
+    assert os.path.isfile(experiment_path + 'arrays/metrics.loss.npy')
+
+    experiment = project.open_experiment('experiment_1')
+    columns = experiment._configs[0].get_columns()
+
+    assert isinstance(experiment._configs[0].config[1]['loss'], np.memmap)
+    np.testing.assert_array_equal(columns['accuracy'],
+                                  metrics['accuracy'].to_numpy())
+
+    # Metrics whose names map to the same filename are stored apart
+    assert len(os.listdir(experiment_path + 'arrays')) == 4
+    np.testing.assert_array_equal(columns['val/loss'],
+                                  metrics['val/loss'].to_numpy())
+    np.testing.assert_array_equal(columns['val_loss'],
+                                  metrics['val_loss'].to_numpy())
+
+    # Remove the project and its files
+    shutil.rmtree(project_path + '/project_04/')
+
+def test_open_experiment_lazy(get_model):
+    """
+    Test opening an experiment loads its files only when they are needed
+    """
+    project_path = os.path.dirname(os.path.realpath(__file__))
+    project = Project(project_name='project_05', project_path=project_path)
+
+    metrics = pd.DataFrame({'loss': np.linspace(1, 0, 10)})
+    project.create_experiment('experiment_1',
+                              configs=[ModelConfig(get_model),
+                                       MetricsConfig(metrics)],
+                              description='Lazy experiment')
+
+    experiment = project.open_experiment('experiment_1')
+
+    # Nothing is loaded until it is accessed
+    assert '_name' not in experiment.__dict__
+    assert experiment._sections is None
+
+    assert experiment.description == 'Lazy experiment'
+    assert experiment._sections is None
+
+    # Only the requested config is decoded
+    metrics_config = experiment.get_config('metrics')
+
+    assert isinstance(metrics_config, MetricsConfig)
+    assert list(experiment._decoded) == ['metrics']
+    assert metrics_config.get_columns()['loss'][-1] == 0.
+
+    assert [config.config[0] for config in experiment.configs] == \
+            ['model', 'metrics']
+
+    # A missing experiment is reported when it is opened
+    for lazy in [True, False]:
+        with pytest.raises(FileNotFoundError):
+            project.open_experiment('missing', lazy=lazy)
+
+    # Remove the project and its files
+    shutil.rmtree(project_path + '/project_05/')
+
+def test_project_index_find():
+    """
+    Test finding experiments through the project index
+    """
+    project_path = os.path.dirname(os.path.realpath(__file__))
+    project = Project(project_name='project_06', project_path=project_path,
+                      index_metrics=['val_loss'])
+
+    for idx, final_loss in enumerate([0.3, 0.1, 0.2]):
+        metrics = pd.DataFrame({'val_loss': [1.0, final_loss],
+                                'accuracy': [0.5, 0.9]})
+        project.create_experiment(f'experiment_{idx}',
+                                  configs=[MetricsConfig(metrics)],
+                                  description=f'Run {idx} of the sweep')
+
+    # A diverged run, whose NaN values are never the best ones
+    metrics = pd.DataFrame({'val_loss': [np.nan, np.nan],
+                            'accuracy': [0.5, 0.5]})
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', RuntimeWarning)
+        project.create_experiment('diverged', configs=[MetricsConfig(metrics)])
+
+    assert project._get_index().summary('diverged')['metrics']\
+            ['val_loss']['min'] is None
+
+    assert project.find(metric='val_loss', top_k=2) == \
+            ['experiment_1', 'experiment_2']
+    assert project.find(metric='val_loss', reduction='min', top_k=1) == \
+            ['experiment_1']
+    assert project.find(metric='val_loss')[-1] == 'diverged'
+    assert project.find(metric='val_loss', mode='max', top_k=1) == \
+            ['experiment_0']
+    assert project.find(description='Run 2') == ['experiment_2']
+    assert project.find(after='2000-01-01T00:00:00', metric='val_loss',
+                        reduction='max') != []
+    # Only the chosen metrics are indexed
+    assert project.find(metric='accuracy') == []
+
+    # Rebuild the index from the experiment files
+    project._get_index().clear()
+    assert project.find() == []
+
+    project.rebuild_index()
+
+    assert sorted(project.find()) == \
+            ['diverged', 'experiment_0', 'experiment_1', 'experiment_2']
+    assert project._get_index().summary('experiment_1')['metrics']\
+            ['val_loss']['final'] == 0.1
+
+    # Remove the project and its files
+    project._get_index().close()
+    shutil.rmtree(project_path + '/project_06/')
+
+def test_project_index_appended_metrics():
+    """
+    Test the project index is updated when the metrics are appended
+    """
+    project_path = os.path.dirname(os.path.realpath(__file__))
+    project = Project(project_name='project_22', project_path=project_path)
+
+    for idx, final_loss in enumerate([0.2, 0.3]):
+        metrics = pd.DataFrame({'val_loss': [1.0, final_loss]})
+        project.create_experiment(f'experiment_{idx}',
+                                  configs=[MetricsConfig(metrics)])
+
+    assert project.find(metric='val_loss') == ['experiment_0', 'experiment_1']
+
+    # A resumed training of the experiment created
+    experiment = project.open_experiment('experiment_1', lazy=False)
+    experiment.extend_metrics(pd.DataFrame({'val_loss': [0.1]}))
+
+    assert project.find(metric='val_loss') == ['experiment_1', 'experiment_0']
+
+    # A lazy experiment whose data file is not loaded
+    experiment = project.open_experiment('experiment_0')
+    experiment.extend_metrics(pd.DataFrame({'val_loss': [0.05]}))
+
+    assert project.find(metric='val_loss') == ['experiment_0', 'experiment_1']
+
+    # A replaced metrics config
+    metrics = pd.DataFrame({'val_loss': [0.5]})
+    project.open_experiment('experiment_0').add_config(MetricsConfig(metrics))
+
+    assert project.find(metric='val_loss') == ['experiment_1', 'experiment_0']
+    assert project._get_index().summary('experiment_0')['metrics']\
+            ['val_loss']['epochs'] == 1
+
+    # Remove the project and its files
+    project._get_index().close()
+    shutil.rmtree(project_path + '/project_22/')
+
+def test_open_experiments():
+    """
+    Test opening several experiments at the same time
+    """
+    project_path = os.path.dirname(os.path.realpath(__file__))
+    project = Project(project_name='project_07', project_path=project_path)
+
+    for idx in range(5):
+        metrics = pd.DataFrame({'loss': np.full(10, float(idx))})
+        project.create_experiment(f'experiment_{idx}',
+                                  configs=[MetricsConfig(metrics)])
+
+    names = ['experiment_3', 'missing', 'experiment_0']
+
+    for processes in [0, 2]:
+        experiments = project.open_experiments(names, workers=2,
+                                               processes=processes)
+
+        # The results keep the order and the errors don't abort the batch
+        assert experiments[0].name == 'experiment_3'
+        assert isinstance(experiments[1], FileNotFoundError)
+        assert experiments[2].get_config('metrics').get_columns()['loss'][0] \
+                == 0.
+
+    # Remove the project and its files
+    shutil.rmtree(project_path + '/project_07/')
+
+def test_create_experiment_background_writer():
+    """
+    Test creating experiments whose files are written in a background thread
+    """
+    project_path = os.path.dirname(os.path.realpath(__file__))
+    writer = BackgroundWriter(max_pending=2)
+    project = Project(project_name='project_08', project_path=project_path,
+                      writer=writer)
+
+    for idx in range(5):
+        metrics = pd.DataFrame({'loss': np.full(10, float(idx))})
+        project.create_experiment(f'experiment_{idx}',
+                                  configs=[MetricsConfig(metrics)])
+
+    writer.flush()
+
+    experiment = project.open_experiment('experiment_4')
+
+    assert experiment.get_config('metrics').get_columns()['loss'][0] == 4.
+
+    # Remove the project and its files
+    writer.close()
+    shutil.rmtree(project_path + '/project_08/')
+
+def test_create_experiment_dedup_architectures(get_model):
+    """
+    Test the model architecture is stored once for several experiments
+    """
+    project_path = os.path.dirname(os.path.realpath(__file__))
+    project = Project(project_name='project_09', project_path=project_path,
+                      dedup_architectures=True)
+
+    for idx in range(3):
+        project.create_experiment(f'experiment_{idx}',
+                                  configs=[ModelConfig(get_model)])
+
+    project_folder = project_path + '/project_09/'
+    architectures = os.listdir(project_folder + '.architectures')
+
+    with open(project_folder + 'experiment_0/experiment_data.json') as file:
+        experiment_data = json.load(file)
+
+    # The experiments only hold the architecture hash
+    assert len(architectures) == 1
+    assert 'model_config' not in experiment_data['model']
+    assert architectures[0] == experiment_data['model']['model_hash'] + '.json'
+    assert sorted(project.list_experiments()) == \
+            ['experiment_0', 'experiment_1', 'experiment_2']
+
+    for lazy in [True, False]:
+        experiment = project.open_experiment('experiment_2', lazy=lazy)
+        _, model_data = experiment.get_config('model').config
+
+        assert model_data['model_config'] == get_model.get_config()
+
+    # Remove the project and its files
+    shutil.rmtree(project_folder)
+
+def test_project_recover():
+    """
+    Test the experiments left half-written are repaired by the project
+    """
+    project_path = os.path.dirname(os.path.realpath(__file__))
+    project = Project(project_name='project_10', project_path=project_path)
+    metrics = pd.DataFrame({'loss': np.arange(10, dtype=float)})
+    project.create_experiment('experiment_0', configs=[MetricsConfig(metrics)])
+
+    project_folder = project_path + '/project_10/'
+    # Process of this host which is never alive
+    host = get_temp_path('')[1:].rpartition('-')[0]
+    dead_pid = 999999999
+    dead_writer = f'{host}-{dead_pid}'
+
+    # A first write killed before its commit, and a commit killed before
+    # renaming the data file
+    os.makedirs(project_folder + 'experiment_1')
+    with open(project_folder + f'experiment_1/experiment_data.json.'
+              f'{dead_writer}.tmp', 'wb') as file:
+        file.write(b'{"metrics": [')
+
+    data_file = project_folder + 'experiment_0/experiment_data.json'
+    os.replace(data_file, f'{data_file}.{dead_writer}.tmp')
+    with open(project_folder + 'experiment_0/.commit', 'w') as file:
+        json.dump({'host': host, 'pid': dead_pid,
+                   'renames': [[f'experiment_data.json.{dead_writer}.tmp',
+                                'experiment_data.json']]}, file)
+
+    assert project.recover() == {'experiment_0': 'committed',
+                                 'experiment_1': 'removed'}
+    assert project.list_experiments() == ['experiment_0']
+
+    experiment = project.open_experiment('experiment_0')
+
+    assert experiment.get_config('metrics').get_columns()['loss'][9] == 9.
+
+    # Other projects only repair an experiment when they first access it
+    os.replace(data_file, f'{data_file}.{dead_writer}.tmp')
+    with open(project_folder + 'experiment_0/.commit', 'w') as file:
+        json.dump({'host': host, 'pid': dead_pid,
+                   'renames': [[f'experiment_data.json.{dead_writer}.tmp',
+                                'experiment_data.json']]}, file)
+
+    project = Project(project_name='project_10', project_path=project_path)
+
+    assert os.path.isfile(project_folder + 'experiment_0/.commit')
+
+    experiment = project.open_experiment('experiment_0')
+
+    assert experiment.get_config('metrics').get_columns()['loss'][9] == 9.
+    assert not os.path.isfile(project_folder + 'experiment_0/.commit')
+
+    # Remove the project and its files
+    shutil.rmtree(project_folder)
+
+def test_project_recover_checkpoint_copies(monkeypatch):
+    """
+    Test the checkpoint copies left by a dead process are removed
+    """
+    project_path = os.path.dirname(os.path.realpath(__file__))
+    project = Project(project_name='project_23', project_path=project_path,
+                      checkpoint_dedup='copy')
+    project_folder = project_path + '/project_23/'
+
+    with open(project_folder + 'model.ckpt', 'wb') as file:
+        file.write(b'weights')
+
+    temp_paths = []
+    get_copy_path = checkpoints._get_temp_path
+    monkeypatch.setattr(checkpoints, '_get_temp_path', lambda path:
+                        temp_paths.append(get_copy_path(path)) or
+                        temp_paths[-1])
+
+    digest, _ = project._checkpoint_store.put(project_folder + 'model.ckpt')
+
+    # The same copy, by a process of this host killed before its rename
+    dead_path = temp_paths[0].replace(f'-{os.getpid()}.', '-999999999.')
+    with open(dead_path, 'wb') as file:
+        file.write(b'weights')
+
+    assert project.recover() == {'.checkpoints': 'rolled_back'}
+    assert os.listdir(project_folder + '.checkpoints') == [digest]
+
+    # Remove the project and its files
+    shutil.rmtree(project_folder)
+
+def test_create_experiment_concurrent():
+    """
+    Test only one of several writers creating the same experiment succeeds
+    """
+    project_path = os.path.dirname(os.path.realpath(__file__))
+    projects = [Project(project_name='project_11', project_path=project_path)
+                for _ in range(4)]
+
+    def create(idx):
+        metrics = pd.DataFrame({'loss': np.full(10, float(idx))})
+
+        try:
+            projects[idx].create_experiment('experiment_0',
+                                            configs=[MetricsConfig(metrics)],
+                                            exist_ok=False)
+        except ValueError:
+            return False
+
+        return True
+
+    with ThreadPoolExecutor(max_workers=4) as threads:
+        created = list(threads.map(create, range(4)))
+
+    experiment = projects[0].open_experiment('experiment_0')
+    loss = experiment.get_config('metrics').get_columns()['loss']
+
+    assert sum(created) == 1
+    assert loss[0] == created.index(True)
+
+    # Remove the project and its files
+    shutil.rmtree(project_path + '/project_11/')
+
+def test_project_rank_zero_only():
+    """
+    Test only the process of rank 0 writes the experiments
+    """
+    project_path = os.path.dirname(os.path.realpath(__file__))
+    metrics = pd.DataFrame({'loss': np.arange(10, dtype=float)})
+
+    for rank in [1, 0]:
+        project = Project(project_name='project_12', project_path=project_path,
+                          rank_zero_only=True, rank=rank)
+        experiment = project.create_experiment(
+                                f'experiment_{rank}',
+                                configs=[MetricsConfig(metrics)])
+
+        assert experiment.name == f'experiment_{rank}'
+
+        # Appended changes are only written by the rank 0 too
+        experiment.extend_metrics(pd.DataFrame({'loss': [10.]}))
+        experiment.add_config(BatchMetricsConfig(pd.DataFrame({'loss': [1.]})))
+
+        assert len(experiment.get_config('metrics').get_columns()['loss']) \
+                == 11
+
+    assert project.list_experiments() == ['experiment_0']
+
+    # Remove the project and its files
+    shutil.rmtree(project_path + '/project_12/')
+
+def test_project_compare():
+    """
+    Test comparing a metric across experiments with different layouts and
+    number of epochs
+    """
+    project_path = os.path.dirname(os.path.realpath(__file__))
+    project = Project(project_name='project_13', project_path=project_path,
+                      array_threshold=5)
+
+    for idx, layout in enumerate(['epochs', 'columns', 'columns']):
+        metrics = pd.DataFrame({'val_loss': np.arange(idx + 4, 0, -1.)})
+        project.create_experiment(f'experiment_{idx}',
+                                  configs=[MetricsConfig(metrics, layout)])
+
+    comparison = project.compare('val_loss')
+
+    assert comparison.experiments == ['experiment_0', 'experiment_1',
+                                      'experiment_2']
+    assert comparison.values.shape == (3, 6)
+    assert list(comparison.lengths) == [4, 5, 6]
+    assert list(comparison.final()) == [1., 1., 1.]
+    assert list(comparison.best_epoch()) == [3, 4, 5]
+    assert list(comparison.rank('auc')) == [1, 2, 3]
+
+    comparison = project.compare('val_loss', experiments=['experiment_2'])
+
+    assert comparison.to_frame().shape == (1, 6)
+
+    # Remove the project and its files
+    shutil.rmtree(project_path + '/project_13/')
+
+def test_create_experiment_compression():
+    """
+    Test the experiment data is compressed and read back transparently,
+    also after changing the compression of the project
+    """
+    project_path = os.path.dirname(os.path.realpath(__file__))
+    metrics = pd.DataFrame({'loss': np.arange(100, dtype=float)})
+    experiment_folder = project_path + '/project_14/experiment_0/'
+
+    for compression in ['gzip', 'zstd', None]:
+        project = Project(project_name='project_14', project_path=project_path,
+                          compression=compression)
+        project.create_experiment('experiment_0',
+                                  configs=[MetricsConfig(metrics)])
+
+        extension = {'gzip': '.gz', 'zstd': '.zst', None: ''}[compression]
+
+        # The previous version of the data file is removed
+        assert sorted(os.listdir(experiment_folder)) == \
+                ['experiment_config.json', 'experiment_data.json' + extension]
+
+        for lazy in [True, False]:
+            experiment = project.open_experiment('experiment_0', lazy=lazy)
+            columns = experiment.get_config('metrics').get_columns()
+
+            assert columns['loss'][99] == 99.
+
+        assert project.open_experiments(['experiment_0'])[0].name == \
+                'experiment_0'
+        assert project.compare('loss').final()[0] == 99.
+
+    # Remove the project and its files
+    shutil.rmtree(project_path + '/project_14/')
+
+def test_open_experiment_project_settings(monkeypatch):
+    """
+    Test an opened experiment is written again with the project settings
+    """
+    project_path = os.path.dirname(os.path.realpath(__file__))
+    project = Project(project_name='project_20', project_path=project_path,
+                      compression='gzip', fsync='always')
+    synced = []
+    metrics = pd.DataFrame({'loss': [0.5, 0.4]})
+    experiment_folder = project_path + '/project_20/experiment_0/'
+
+    project.create_experiment('experiment_0',
+                              configs=[MetricsConfig(metrics)])
+
+    monkeypatch.setattr(os, 'fsync', synced.append)
+
+    for lazy in [True, False]:
+        experiment = project.open_experiment('experiment_0', lazy=lazy)
+        project.update_experiment(experiment)
+
+        assert sorted(os.listdir(experiment_folder)) == \
+                ['experiment_config.json', 'experiment_data.json.gz']
+        assert synced
+        synced.clear()
+
+    experiment = project.open_experiments(['experiment_0'])[0]
+    project.update_experiment(experiment)
+
+    assert sorted(os.listdir(experiment_folder)) == \
+            ['experiment_config.json', 'experiment_data.json.gz']
+    assert synced
+
+    # Remove the project and its files
+    shutil.rmtree(project_path + '/project_20/')
+
+def test_experiment_append_segments_drop_policy():
+    """
+    Test the segments submitted to a writer which discards writes are all
+    written
+    """
+    project_path = os.path.dirname(os.path.realpath(__file__))
+    writer = BackgroundWriter(max_pending=1, policy='drop_newest')
+    project = Project(project_name='project_21', project_path=project_path,
+                      writer=writer)
+    experiment = project.create_experiment(
+                        'experiment_0',
+                        configs=[MetricsConfig(pd.DataFrame({'loss': [5.]}))])
+    writer.flush()
+
+    # Keeps the background thread busy for a while so the queue fills up
+    started = threading.Event()
+    writer.submit(lambda: started.set() or time.sleep(0.2))
+    started.wait()
+
+    for loss in [4., 3., 2.]:
+        experiment.extend_metrics(pd.DataFrame({'loss': [loss]}))
+
+    writer.flush()
+
+    experiment = project.open_experiment('experiment_0')
+
+    assert list(experiment.get_config('metrics').get_columns()['loss']) == \
+            [5., 4., 3., 2.]
+
+    # Remove the project and its files
+    writer.close()
+    shutil.rmtree(project_path + '/project_21/')
+
+def test_experiment_append_segments():
+    """
+    Test adding configs and extending the metrics of an experiment without
+    rewriting its data file
+    """
+    project_path = os.path.dirname(os.path.realpath(__file__))
+    project = Project(project_name='project_15', project_path=project_path)
+    metrics = pd.DataFrame({'loss': [3., 2.]})
+    experiment = project.create_experiment('experiment_0',
+                                           configs=[MetricsConfig(metrics)])
+
+    experiment_folder = project_path + '/project_15/experiment_0/'
+    with open(experiment_folder + 'experiment_data.json', 'rb') as file:
+        experiment_data = file.read()
+
+    experiment.extend_metrics(pd.DataFrame({'loss': [1., 0.]}))
+    experiment.extend_metrics(pd.DataFrame({'loss': [1.5]}), initial_epoch=3)
+    experiment.add_config(BatchMetricsConfig(pd.DataFrame({'loss': [9.]})))
+
+    # The data file is not rewritten
+    with open(experiment_folder + 'experiment_data.json', 'rb') as file:
+        assert file.read() == experiment_data
+
+    expected = [3., 2., 1., 1.5]
+
+    assert list(experiment.get_config('metrics').get_columns()['loss']) == \
+            expected
+
+    opened = [project.open_experiment('experiment_0', lazy=True),
+              project.open_experiment('experiment_0', lazy=False),
+              project.open_experiments(['experiment_0'])[0]]
+
+    for opened_experiment in opened:
+        columns = opened_experiment.get_config('metrics').get_columns()
+        batch_columns = opened_experiment.get_config(
+                                        'batch_metrics').get_columns()
+
+        assert list(columns['loss']) == expected
+        assert list(batch_columns['loss']) == [9.]
+
+    assert list(project.compare('loss').values[0]) == expected
+
+    # Compacting merges the segments into the data file
+    opened[0].compact()
+
+    assert not os.path.isfile(experiment_folder +
+                              'experiment_data.segments.jsonl')
+
+    experiment = project.open_experiment('experiment_0', lazy=False)
+
+    assert list(experiment.get_config('metrics').get_columns()['loss']) == \
+            expected
+
+    # Remove the project and its files
+    shutil.rmtree(project_path + '/project_15/')
+
+def test_project_checkpoints():
+    """
+    Tests the experiments of a project share the identical checkpoints
+    """
+    project_path = os.path.dirname(os.path.realpath(__file__))
+    project = Project(project_name='project_16', project_path=project_path,
+                      checkpoint_dedup='link')
+    folder = project_path + '/project_16/'
+
+    for name in ['experiment_0', 'experiment_1']:
+        project.create_experiment(name, configs=[
+                                MetricsConfig(pd.DataFrame({'loss': [1.]}))])
+
+        with open(folder + name + '/model.ckpt', 'wb') as file:
+            file.write(b'same weights')
+
+        project.get_checkpoints(name).add(folder + name + '/model.ckpt', 0,
+                                          {'val_loss': 0.5})
+
+    first = project.get_checkpoints('experiment_0').best()
+    second = project.get_checkpoints('experiment_1').best()
+
+    assert first['hash'] == second['hash']
+    assert os.path.samefile(first['path'], second['path'])
+    assert len(os.listdir(folder + '.checkpoints')) == 1
+    assert sorted(project.list_experiments()) == ['experiment_0',
+                                                  'experiment_1']
+
+    with pytest.raises(ValueError):
+        project.get_checkpoints('experiment_2')
+
+    # Remove the project and its files
+    shutil.rmtree(folder)
+
+def test_project_streaming():
+    """
+    Tests reading single configs and metrics of the experiments by streaming
+    their data files, with and without segments
+    """
+    project_path = os.path.dirname(os.path.realpath(__file__))
+    project = Project(project_name='project_17', project_path=project_path,
+                      compression='gzip')
+    metrics = pd.DataFrame({'loss': [3., 2.], 'accuracy': [.5, .6]})
+    experiment = project.create_experiment('experiment_0',
+                                           configs=[MetricsConfig(metrics)])
+
+    assert list(project.iter_metric('experiment_0', 'loss')) == [3., 2.]
+    assert list(project.iter_epochs('experiment_0')) == [
+        (0, {'loss': 3., 'accuracy': .5}), (1, {'loss': 2., 'accuracy': .6})]
+
+    experiment.extend_metrics(pd.DataFrame({'loss': [1.], 'accuracy': [.7]}))
+
+    assert list(project.iter_metric('experiment_0', 'loss')) == [3., 2., 1.]
+    assert [epoch for epoch, _ in project.iter_epochs('experiment_0')] == \
+            [0, 1, 2]
+    assert len(project.read_section('experiment_0', 'metrics')) == 3
+
+    with pytest.raises(KeyError):
+        project.read_section('experiment_0', 'model')
+
+    # Remove the project and its files
+    shutil.rmtree(project_path + '/project_17/')
+
+def test_project_diff(get_model):
+    """
+    Tests comparing the configs and metrics of two and many experiments
+    """
+    project_path = os.path.dirname(os.path.realpath(__file__))
+    project = Project(project_name='project_19', project_path=project_path)
+    metrics = [pd.DataFrame({'loss': [3., 2.]}),
+               pd.DataFrame({'loss': [3., 1.5, 1.]}),
+               pd.DataFrame({'loss': [3., 2.]})]
+
+    for idx, data in enumerate(metrics):
+        get_model.optimizer.learning_rate = 0.005 if idx != 1 else 0.01
+        project.create_experiment(f'experiment_{idx}',
+                                  configs=[MetricsConfig(data),
+                                           ModelConfig(get_model)])
+
+    diff = project.diff('experiment_0', 'experiment_1')
+
+    assert [change['path'] for change in diff.changes] == \
+            ['model.optimizer_config.learning_rate']
+    assert diff.metrics['loss']['first_divergence'] == 1
+    assert not diff.identical
+    assert project.diff('experiment_0', 'experiment_2').identical
+
+    diff = project.diff_many()
+
+    assert diff.experiments == ['experiment_0', 'experiment_1',
+                                'experiment_2']
+    assert list(diff.values) == ['model.optimizer_config.learning_rate']
+    assert list(diff.metrics['loss']['epochs']) == [2, 3, 2]
+
+    # Remove the project and its files
+    shutil.rmtree(project_path + '/project_19/')
@@ -0,0 +1,51 @@
+import numpy as np
+import os
+import shutil
+
+from deeplearning_logger.keras.segments import SEGMENTS_FILE, \
+                                               append_segment, \
+                                               apply_segments, \
+                                               config_segment, \
+                                               extend_segment, read_segments
+
+def test_apply_segments_layouts():
+    """
+    Tests the metrics are extended keeping their stored layout
+    """
+    sections = {
+        'metrics': {'epoch_0': {'loss': 1.0}, 'epoch_1': {'loss': 0.5}},
+        'batch_metrics': {'loss': np.array([1.0, 0.5])}
+    }
+    segments = [extend_segment('metrics', {'loss': [0.2, 0.1]}, 1),
+                extend_segment('batch_metrics', {'acc': [0.9]}),
+                config_segment('callbacks', {'EarlyStopping': {}})]
+
+    sections = apply_segments(sections, segments)
+
+    assert sections['metrics'] == {'epoch_0': {'loss': 1.0},
+                                   'epoch_1': {'loss': 0.2},
+                                   'epoch_2': {'loss': 0.1}}
+    np.testing.assert_array_equal(sections['batch_metrics']['loss'],
+                                  [1.0, 0.5, np.nan])
+    np.testing.assert_array_equal(sections['batch_metrics']['acc'],
+                                  [np.nan, np.nan, 0.9])
+    assert sections['callbacks'] == {'EarlyStopping': {}}
+
+def test_read_segments_truncated():
+    """
+    Tests a line truncated by a killed process doesn't corrupt the segments
+    appended after it
+    """
+    folder = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                          'segments_01')
+    os.makedirs(folder, exist_ok=True)
+
+    append_segment(folder, config_segment('a', {}))
+    with open(os.path.join(folder, SEGMENTS_FILE), 'ab') as file:
+        file.write(b'{"type": "con')
+    append_segment(folder, config_segment('b', {}))
+
+    assert [segment['name'] for segment in read_segments(folder)] == \
+            ['a', 'b']
+
+    shutil.rmtree(folder)
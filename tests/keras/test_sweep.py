@@ -0,0 +1,138 @@
+import numpy as np
+import os
+import pandas as pd
+import pytest
+import shutil
+
+from deeplearning_logger.keras.configs import MetricsConfig
+from deeplearning_logger.keras.project import Project
+from deeplearning_logger.keras.sweep import TRIALS_FILE, Sweep, \
+                                            diff_params, merge_params
+
+@pytest.fixture
+def folder():
+    folder = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                          'sweep_01')
+    os.makedirs(folder, exist_ok=True)
+
+    yield folder
+
+    shutil.rmtree(folder)
+
+def test_diff_params():
+    """
+    Tests only the changed params are kept, and merged back
+    """
+    base = {'lr': 0.1, 'optimizer': {'name': 'adam', 'beta_1': 0.9}}
+    params = {'lr': 0.1, 'optimizer': {'name': 'adam', 'beta_1': 0.8},
+              'units': 32}
+    diff = diff_params(base, params)
+
+    assert diff == {'optimizer': {'beta_1': 0.8}, 'units': 32}
+    assert merge_params(base, diff) == params
+    assert base['optimizer']['beta_1'] == 0.9
+
+def test_sweep_batches(folder):
+    """
+    Tests the trials are written in batches and read back with their
+    params
+    """
+    sweep = Sweep(folder, 'sweep', params={'lr': 0.1, 'units': 16},
+                  batch_size=3)
+    sweep.register_sweep()
+    trials_file = os.path.join(folder, TRIALS_FILE)
+
+    for idx in range(4):
+        sweep.log_trial({'lr': 0.1 * idx}, {'val_loss': 4 - idx})
+
+    # The fourth trial is still pending
+    with open(trials_file, 'rb') as file:
+        assert len(file.read().splitlines()) == 3
+
+    sweep.close()
+
+    opened = Sweep.by_folder(folder)
+
+    assert len(opened) == 4
+    assert opened.get_trial('trial_0')['params'] == {'lr': 0., 'units': 16}
+    assert opened.get_trial('trial_3')['metrics'] == {'val_loss': 1.}
+    # Only the changed params are stored
+    assert opened._trials[1]['params'] == {}
+
+    with pytest.raises(KeyError):
+        opened.get_trial('trial_4')
+
+def test_sweep_best(folder):
+    """
+    Tests the best trials are found, skipping the ones without the metric
+    """
+    sweep = Sweep(folder, 'sweep')
+    values = [0.5, np.nan, 0.2, 0.9, 0.1]
+
+    for idx, value in enumerate(values):
+        sweep.log_trial({'seed': idx}, {'val_loss': value})
+    sweep.log_trial({'seed': 5}, {'loss': 0.})
+
+    assert sweep.best('val_loss')['params'] == {'seed': 4}
+    assert sweep.best('val_loss', mode='max')['params'] == {'seed': 3}
+    assert [trial['params']['seed'] for trial in
+            sweep.top_k('val_loss', 3)] == [4, 2, 0]
+    assert len(sweep.top_k('val_loss', 10)) == 4
+    assert sweep.best('accuracy') is None
+
+    # A trial logged again replaces the previous one
+    sweep.log_trial({'seed': 6}, {'val_loss': 0.}, trial_id='trial_0')
+
+    assert sweep.best('val_loss')['id'] == 'trial_0'
+    assert len(sweep) == 6
+
+    with pytest.raises(ValueError):
+        sweep.best('val_loss', mode='mean')
+
+    sweep.close()
+
+def test_sweep_truncated(folder):
+    """
+    Tests a line truncated by a killed process doesn't corrupt the trials
+    written after it
+    """
+    sweep = Sweep(folder, 'sweep', batch_size=1)
+    sweep.log_trial(metrics={'loss': 1.})
+
+    with open(os.path.join(folder, TRIALS_FILE), 'ab') as file:
+        file.write(b'{"id": "trial_1", "par')
+
+    sweep.log_trial(metrics={'loss': 2.})
+    sweep.refresh()
+
+    assert sweep.trial_ids == ['trial_0', 'trial_1']
+
+def test_project_sweep():
+    """
+    Tests creating and opening a sweep of a project, which is not listed as
+    an experiment
+    """
+    project_path = os.path.dirname(os.path.realpath(__file__))
+    project = Project(project_name='project_18', project_path=project_path)
+    metrics = MetricsConfig(pd.DataFrame({'loss': [1., 0.5]}))
+
+    with project.create_sweep('sweep_0', configs=[metrics],
+                              params={'lr': 0.1}) as sweep:
+        for lr in [0.1, 0.01]:
+            sweep.log_trial({'lr': lr}, {'val_loss': lr * 10})
+
+    assert project.list_sweeps() == ['sweep_0']
+    assert project.list_experiments() == []
+
+    sweep = project.open_sweep('sweep_0')
+    frame = sweep.to_frame()
+
+    assert list(sweep.configs[0].get_columns()['loss']) == [1., 0.5]
+    assert list(frame['lr']) == [0.1, 0.01]
+    assert frame.loc['trial_1', 'val_loss'] == 0.1
+
+    with pytest.raises(ValueError):
+        project.open_sweep('sweep_1')
+
+    # Remove the project and its files
+    shutil.rmtree(project_path + '/project_18/')
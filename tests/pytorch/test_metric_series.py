@@ -0,0 +1,73 @@
+from deeplearning_logger.pytorch.metric_series import MetricColumns, \
+                                                      MetricSeries
+import numpy as np
+import pytest
+
+def test_metric_series():
+    """
+    Test an unbounded metric series
+    """
+    series = MetricSeries([0.5, 0.25])
+    series.append(np.float32(0.125))
+
+    assert len(series) == 3
+    assert series[-1] == 0.125
+    assert series[1:] == [0.25, 0.125]
+    assert list(series) == [0.5, 0.25, 0.125]
+
+def test_metric_series_ring():
+    """
+    Test a metric series which keeps the last values
+    """
+    series = MetricSeries(max_size=4, policy='ring')
+
+    for value in range(10):
+        series.append(value)
+
+    assert len(series) == 4
+    assert series[0] == 6.
+    assert series.tolist() == [6., 7., 8., 9.]
+
+def test_metric_series_buckets():
+    """
+    Test a metric series which merges its values into buckets
+    """
+    series = MetricSeries(max_size=4, policy='buckets')
+
+    for value in range(16):
+        series.append(value)
+
+    buckets = series.get_buckets()
+
+    assert len(series) == 4
+    np.testing.assert_array_equal(buckets['mean'], [1.5, 5.5, 9.5, 13.5])
+    np.testing.assert_array_equal(buckets['min'], [0., 4., 8., 12.])
+    np.testing.assert_array_equal(buckets['max'], [3., 7., 11., 15.])
+    np.testing.assert_array_equal(buckets['count'], [4, 4, 4, 4])
+
+    # The memory is bounded whatever the number of values
+    for value in range(16, 1000):
+        series.append(value)
+
+    assert len(series) <= 4
+    assert series.get_buckets()['count'].sum() == 1000
+    assert series.get_buckets()['max'][-1] == 999.
+
+def test_metric_series_policy_exception():
+    """
+    Test creating a bounded series without a policy
+    """
+    with pytest.raises(ValueError):
+        MetricSeries(max_size=10)
+
+def test_metric_columns():
+    """
+    Test storing metric dictionaries as columns
+    """
+    columns = MetricColumns([{'accuracy': 0.5}])
+    columns.append({'accuracy': 0.75, 'f1': 0.5})
+
+    assert len(columns) == 2
+    assert columns[1] == {'accuracy': 0.75, 'f1': 0.5}
+    assert np.isnan(columns[0]['f1'])
+    np.testing.assert_array_equal(columns.get()['accuracy'], [0.5, 0.75])
@@ -1,10 +1,16 @@
 from deeplearning_logger.pytorch.pytorch_logger import PytorchLogger, \
                                                         ExperimentData
-from deeplearning_logger.pytorch.experiment_data import ModelData, OptimizerData
+from deeplearning_logger.pytorch.experiment_data import ModelData, OptimizerData, \
+                                                        MetricsData
+from deeplearning_logger.pytorch.experiment_log import ExperimentLog
+from deeplearning_logger.writer import BackgroundWriter
 from tests.pytorch.test_utils import CustomModel
 import pytest
+import torch.nn as nn
 import json
 import os
+import shutil
+import threading
 
 def test_default_pytorch_logger():
     """
@@ -56,6 +62,19 @@ def test_pytorch_logger():
 
     os.remove('prueba.json')
 
+def test_model_data_changed_architecture():
+    """
+    Test the architecture of a module modified after being captured
+    """
+    model = CustomModel()
+    first = ModelData(architecture=model)
+
+    model.classifier[0] = nn.Linear(24*3*3, 10)
+    second = ModelData(architecture=model)
+
+    assert 'out_features=10' in second.architecture
+    assert second.architecture_hash != first.architecture_hash
+
 def test_pytorch_logger_annotations():
     """
     Test a PytorchLogger with annotations
@@ -89,4 +108,351 @@ def test_pytorch_logger_same_filename_exception():
     with pytest.raises(ValueError):
         logger.save(experiment, 'prueba')
 
-    os.remove('prueba.json')
\ No newline at end of file
+    os.remove('prueba.json')
+
+def test_pytorch_logger_append_log():
+    """
+    Test logging the epochs and steps of an experiment into its append log
+    """
+    logger = PytorchLogger()
+    experiment = ExperimentData(annotations='Append log')
+
+    logger.start(experiment, 'append_ex')
+
+    for epoch in range(3):
+        logger.log_step('append_ex', {'loss': 1.0 / (epoch + 1)})
+        logger.log_epoch('append_ex', train_loss=float(epoch),
+                         val_loss=float(epoch) + 0.5,
+                         val_metrics={'accuracy': 0.1 * epoch})
+
+    logger.finish('append_ex')
+
+    with open('append_ex.jsonl', 'r') as file:
+        records = [json.loads(line) for line in file]
+
+    assert len(records) == 7
+    assert records[0]['type'] == 'header'
+    assert records[0]['data']['annotations'] == 'Append log'
+
+    data = experiment.get()
+
+    assert data['train_losses'] == [0.0, 1.0, 2.0]
+    assert data['val_losses'] == [0.5, 1.5, 2.5]
+    assert data['val_metrics'][2]['accuracy'] == pytest.approx(0.2)
+    assert data['steps'][1] == {'step': 1, 'loss': 0.5}
+
+    os.remove('append_ex.jsonl')
+
+def test_pytorch_logger_append_log_truncated():
+    """
+    Test replaying an append log whose last record was not fully written
+    """
+    logger = PytorchLogger()
+    experiment = ExperimentData()
+
+    logger.start(experiment, 'truncated_ex')
+    logger.log_epoch('truncated_ex', train_loss=0.5)
+    logger.finish('truncated_ex')
+
+    with open('truncated_ex.jsonl', 'a') as file:
+        file.write('{"type":"epoch","train_lo')
+
+    assert ExperimentLog('truncated_ex.jsonl').read()['train_losses'] == [0.5]
+
+    os.remove('truncated_ex.jsonl')
+
+def test_pytorch_logger_append_log_compact():
+    """
+    Test replaying the append log of an experiment with compact metrics
+    """
+    logger = PytorchLogger()
+    metrics = MetricsData.compact()
+    metrics.log_epoch(train_loss=1.0, val_metrics={'accuracy': 0.5})
+    experiment = ExperimentData(metrics=metrics)
+
+    logger.start(experiment, 'compact_log_ex')
+    logger.log_epoch('compact_log_ex', train_loss=0.5,
+                     val_metrics={'accuracy': 0.7, 'f1': 0.1})
+    logger.finish('compact_log_ex')
+
+    data = experiment.get()
+
+    assert data['train_losses'] == [1.0, 0.5]
+    assert data['val_metrics'] == {'accuracy': [0.5, 0.7], 'f1': [None, 0.1]}
+
+    os.remove('compact_log_ex.jsonl')
+
+def test_pytorch_logger_not_started_exception():
+    """
+    Test logging an epoch of an experiment which was not started
+    """
+    logger = PytorchLogger()
+
+    with pytest.raises(ValueError):
+        logger.log_epoch('not_started', train_loss=0.1)
+
+def test_pytorch_logger_sidecar_arrays():
+    """
+    Test storing the losses in sidecar files
+    """
+    logger = PytorchLogger(array_threshold=100)
+
+    metrics = MetricsData(train_losses=[0.5] * 1000, val_losses=[0.5] * 10)
+    experiment = ExperimentData(metrics=metrics)
+
+    logger.save(experiment, 'arrays_ex')
+
+    with open('arrays_ex.json', 'r') as file:
+        data = json.load(file)
+
+    # Only the long series is stored apart
+    assert data['train_losses'] == {'__ndarray__': 'arrays_ex_arrays/train_losses.npy'}
+    assert data['val_losses'] == [0.5] * 10
+
+    data = logger.load('arrays_ex')
+
+    assert data['train_losses'].shape == (1000,)
+    assert data['train_losses'][-1] == 0.5
+
+    os.remove('arrays_ex.json')
+    shutil.rmtree('arrays_ex_arrays')
+
+def test_pytorch_logger_background_writer():
+    """
+    Test saving an experiment from a background thread
+    """
+    writer = BackgroundWriter()
+    logger = PytorchLogger(writer=writer)
+
+    metrics = MetricsData(train_losses=[0.5, 0.4])
+    experiment = ExperimentData(metrics=metrics)
+
+    logger.save(experiment, 'background_ex')
+
+    # The saved data is a snapshot of the experiment
+    metrics.train_losses.append(0.3)
+
+    with pytest.raises(ValueError):
+        logger.save(experiment, 'background_ex')
+
+    writer.close()
+
+    with open('background_ex.json', 'r') as file:
+        data = json.load(file)
+
+    assert data['train_losses'] == [0.5, 0.4]
+
+    os.remove('background_ex.json')
+
+def test_pytorch_logger_dropped_write():
+    """
+    Test saving again an experiment whose write was discarded by the writer
+    """
+    writer = BackgroundWriter(max_pending=1, policy='drop_newest')
+    logger = PytorchLogger(writer=writer)
+    release = threading.Event()
+    started = threading.Event()
+
+    # Keeps the background thread busy so the queue fills up
+    writer.submit(lambda: (started.set(), release.wait()))
+    started.wait()
+    writer.submit(print, 'pending')
+
+    experiment = ExperimentData(metrics=MetricsData(train_losses=[0.5]))
+    logger.save(experiment, 'dropped_ex')
+
+    release.set()
+    writer.flush()
+
+    assert writer.dropped == 1
+    assert not os.path.exists('dropped_ex.json')
+
+    logger.save(experiment, 'dropped_ex')
+    writer.close()
+
+    with open('dropped_ex.json', 'r') as file:
+        assert json.load(file)['train_losses'] == [0.5]
+
+    os.remove('dropped_ex.json')
+
+def test_pytorch_logger_compact_metrics():
+    """
+    Test saving the metrics stored in compact series
+    """
+    logger = PytorchLogger()
+    metrics = MetricsData.compact(max_size=100, policy='buckets')
+
+    for step in range(1000):
+        metrics.log_epoch(train_loss=1. / (step + 1),
+                          train_metrics={'accuracy': step / 1000})
+
+    logger.save(ExperimentData(metrics=metrics), 'compact_ex')
+
+    with open('compact_ex.json', 'r') as file:
+        data = json.load(file)
+
+    assert len(data['train_losses']) <= 100
+    assert len(data['train_metrics']['accuracy']) <= 100
+    assert data['val_losses'] == []
+
+    os.remove('compact_ex.json')
+
+def test_pytorch_logger_dedup_architectures():
+    """
+    Test the model architecture is stored once for several experiments
+    """
+    logger = PytorchLogger(dedup_architectures=True)
+    model = CustomModel()
+
+    for name in ['dedup_ex_1', 'dedup_ex_2']:
+        logger.save(ExperimentData(model=ModelData(architecture=model)), name)
+
+    with open('dedup_ex_1.json', 'r') as file:
+        data = json.load(file)
+
+    assert data['architecture'] is None
+    assert os.listdir('.architectures') == [data['architecture_hash'] + '.json']
+    assert logger.load('dedup_ex_2')['architecture'] == str(model)
+
+    os.remove('dedup_ex_1.json')
+    os.remove('dedup_ex_2.json')
+    shutil.rmtree('.architectures')
+
+def test_pytorch_logger_concurrent_save():
+    """
+    Test only one of several loggers saving the same experiment at the same
+    time succeeds
+    """
+    writers = [BackgroundWriter() for _ in range(4)]
+    errors = 0
+
+    for idx, writer in enumerate(writers):
+        metrics = MetricsData(train_losses=[float(idx)])
+
+        # The name is checked when saving and again when writing the file
+        try:
+            PytorchLogger(writer=writer).save(ExperimentData(metrics=metrics),
+                                              'concurrent_ex')
+        except ValueError:
+            errors += 1
+
+    for writer in writers:
+        try:
+            writer.close()
+        except ValueError:
+            errors += 1
+
+    with open('concurrent_ex.json', 'r') as file:
+        data = json.load(file)
+
+    assert errors == 3
+    assert len(data['train_losses']) == 1
+
+    os.remove('concurrent_ex.json')
+
+def test_pytorch_logger_rank_zero_only():
+    """
+    Test only the process of rank 0 saves the experiments
+    """
+    experiment = ExperimentData()
+
+    PytorchLogger(rank_zero_only=True, rank=1).save(experiment, 'rank_ex')
+    PytorchLogger(rank_zero_only=True, rank=1).start(experiment, 'rank_ex')
+
+    assert not os.path.exists('rank_ex.json')
+    assert not os.path.exists('rank_ex.jsonl')
+
+    PytorchLogger(rank_zero_only=True, rank=0).save(experiment, 'rank_ex')
+
+    assert os.path.isfile('rank_ex.json')
+
+    os.remove('rank_ex.json')
+
+def test_pytorch_logger_compression():
+    """
+    Test saving a compressed experiment and loading it transparently
+    """
+    logger = PytorchLogger(compression='gzip')
+    metrics = MetricsData(train_losses=[0.5, 0.4])
+
+    logger.save(ExperimentData(metrics=metrics), 'compressed_ex')
+
+    assert os.path.isfile('compressed_ex.json.gz')
+    assert PytorchLogger().load('compressed_ex')['train_losses'] == [0.5, 0.4]
+
+    # Compressed experiments also reserve their name
+    with pytest.raises(ValueError):
+        PytorchLogger().save(ExperimentData(), 'compressed_ex')
+
+    os.remove('compressed_ex.json.gz')
+
+def test_pytorch_logger_checkpoints():
+    """
+    Test registering the checkpoints of an experiment
+    """
+    # The checkpoint file is overwritten, so its contents are copied
+    logger = PytorchLogger(checkpoint_dedup='copy')
+    registry = logger.get_checkpoints('checkpoints_ex')
+
+    for epoch, val_loss in enumerate([0.5, 0.3, 0.4]):
+        with open('checkpoints_ex.pt', 'wb') as file:
+            file.write(f'weights {epoch}'.encode())
+        registry.add('checkpoints_ex.pt', epoch, {'val_loss': val_loss})
+
+    best = logger.get_checkpoints('checkpoints_ex').best()
+
+    assert best['epoch'] == 1
+
+    with open(registry.get_file(best), 'rb') as file:
+        assert file.read() == b'weights 1'
+
+    os.remove('checkpoints_ex.pt')
+    os.remove('checkpoints_ex.checkpoints.jsonl')
+    shutil.rmtree('.checkpoints')
+
+def test_pytorch_logger_checkpoints_hashed():
+    """
+    Test the checkpoints are only hashed by default
+    """
+    logger = PytorchLogger()
+    registry = logger.get_checkpoints('hashed_ex')
+
+    with open('hashed_ex.pt', 'wb') as file:
+        file.write(b'weights')
+    entry = registry.add('hashed_ex.pt', 0, {'val_loss': 0.5})
+
+    assert not entry['stored']
+    assert registry.get_file(entry) == os.path.abspath('hashed_ex.pt')
+    assert not os.path.exists('.checkpoints')
+
+    os.remove('hashed_ex.pt')
+    os.remove('hashed_ex.checkpoints.jsonl')
+
+def test_pytorch_logger_diff():
+    """
+    Test comparing the saved experiments
+    """
+    logger = PytorchLogger()
+    model = ModelData(architecture=CustomModel())
+
+    for name, lr, losses in [('diff_ex_0', 0.1, [1., 0.5]),
+                             ('diff_ex_1', 0.01, [1., 0.4]),
+                             ('diff_ex_2', 0.1, [1., 0.5])]:
+        metrics = MetricsData(train_losses=losses,
+                              val_metrics=[{'acc': 0.5}, {'acc': 0.6}])
+        logger.save(ExperimentData(model=model, metrics=metrics,
+                                   optimizer=OptimizerData(lr=lr)), name)
+
+    diff = logger.diff('diff_ex_0', 'diff_ex_1')
+
+    assert [change['path'] for change in diff.changes] == ['lr']
+    assert diff.metrics['train_losses']['first_divergence'] == 1
+    assert diff.metrics['val_metrics.acc']['equal']
+    assert logger.diff('diff_ex_0', 'diff_ex_2').identical
+
+    diff = logger.diff_many(['diff_ex_0', 'diff_ex_1', 'diff_ex_2'])
+
+    assert diff.values == {'lr': [0.1, 0.01, 0.1]}
+
+    for name in ['diff_ex_0', 'diff_ex_1', 'diff_ex_2']:
+        os.remove(f'{name}.json')
@@ -0,0 +1,37 @@
+from deeplearning_logger.architectures import ArchitectureCache, fingerprint
+
+class Model():
+    def __init__(self):
+        self.layers = [{'units': 10}]
+
+def test_fingerprint():
+    """
+    Tests equal architectures have the same hash whatever their key order
+    """
+    assert fingerprint({'a': 1, 'b': [1, 2]}) == \
+            fingerprint({'b': [1, 2], 'a': 1})
+    assert fingerprint({'a': 1}) != fingerprint({'a': 2})
+
+def test_architecture_cache():
+    """
+    Tests the architecture of a model is built only once per version
+    """
+    cache = ArchitectureCache()
+    model = Model()
+    calls = []
+
+    def build(model):
+        calls.append(model)
+        return {'layers': list(model.layers)}
+
+    digest, architecture = cache.get(model, build, version=1)
+
+    assert cache.get(model, build, version=1) == (digest, architecture)
+    assert len(calls) == 1
+
+    # A new version builds the architecture again
+    model.layers.append({'units': 1})
+    new_digest, _ = cache.get(model, build, version=2)
+
+    assert len(calls) == 2
+    assert new_digest != digest
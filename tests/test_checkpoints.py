@@ -0,0 +1,161 @@
+from deeplearning_logger.checkpoints import BlobStore, CheckpointRegistry, \
+                                            hash_file
+import hashlib
+import os
+import pytest
+import shutil
+
+_FOLDER = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                       'checkpoints_01')
+
+@pytest.fixture
+def folder():
+    os.makedirs(_FOLDER, exist_ok=True)
+
+    yield _FOLDER
+
+    shutil.rmtree(_FOLDER)
+
+def write_file(folder, name, content):
+    path = os.path.join(folder, name)
+
+    with open(path, 'wb') as file:
+        file.write(content)
+
+    return path
+
+def test_hash_file(folder):
+    """
+    Tests the chunked hash is the hash of the whole content
+    """
+    content = os.urandom(10000)
+    path = write_file(folder, 'model.ckpt', content)
+
+    digest, size = hash_file(path, chunk_size=1024)
+
+    assert digest == hashlib.sha256(content).hexdigest()
+    assert size == 10000
+
+def test_blob_store_copy(folder):
+    """
+    Tests identical checkpoints are stored once, and the stored content
+    survives the checkpoint being overwritten
+    """
+    store = BlobStore(os.path.join(folder, '.checkpoints'))
+    first = write_file(folder, 'first.ckpt', b'weights')
+    second = write_file(folder, 'second.ckpt', b'weights')
+
+    digest, size = store.put(first)
+
+    assert store.put(second) == (digest, size)
+    assert os.listdir(os.path.join(folder, '.checkpoints')) == [digest]
+
+    write_file(folder, 'first.ckpt', b'new weights')
+
+    with open(store.get_path(digest), 'rb') as file:
+        assert file.read() == b'weights'
+
+def test_blob_store_link(folder):
+    """
+    Tests the duplicated checkpoints are replaced by links to the blob
+    """
+    store = BlobStore(os.path.join(folder, '.checkpoints'), dedup='link')
+    first = write_file(folder, 'first.ckpt', b'weights')
+    second = write_file(folder, 'second.ckpt', b'weights')
+
+    digest, _ = store.put(first)
+    store.put(second)
+
+    assert os.path.samefile(first, store.get_path(digest))
+    assert os.path.samefile(second, store.get_path(digest))
+    assert os.stat(second).st_nlink == 3
+
+def test_blob_store_dedup_exception(folder):
+    with pytest.raises(ValueError):
+        BlobStore(folder, dedup='move')
+
+def test_checkpoint_registry(folder):
+    """
+    Tests the entries, the best checkpoint and the duplicates of a registry
+    """
+    store = BlobStore(os.path.join(folder, '.checkpoints'))
+    registry = CheckpointRegistry(os.path.join(folder, 'checkpoints.jsonl'),
+                                  blob_store=store)
+    losses = [0.9, 0.4, 0.6]
+
+    for epoch, loss in enumerate(losses):
+        path = write_file(folder, 'model.ckpt', f'epoch {epoch}'.encode())
+        registry.add(path, epoch, {'val_loss': loss, 'accuracy': 1 - loss})
+
+    best = registry.best()
+
+    assert len(registry) == 3
+    assert best['epoch'] == 1
+    assert registry.best('accuracy', 'max')['epoch'] == 1
+    assert registry.best('val_loss', 'max')['epoch'] == 0
+    assert registry.best('missing') is None
+    assert registry.latest()['epoch'] == 2
+
+    # The best content is kept although the file was overwritten
+    with open(registry.get_file(best), 'rb') as file:
+        assert file.read() == b'epoch 1'
+
+    path = write_file(folder, 'copy.ckpt', b'epoch 1')
+    registry.add(path, 3)
+
+    assert [entry['epoch'] for entry in
+            registry.duplicates(best['hash'])] == [1, 3]
+
+    # The registry is reloaded from its file
+    reloaded = CheckpointRegistry(registry.path)
+
+    assert reloaded.entries == registry.entries
+    assert reloaded.best()['epoch'] == 1
+
+def test_checkpoint_registry_nan_metric(folder):
+    """
+    Tests a NaN metric, which some JSON backends write as null, is never the
+    best value after reloading the registry
+    """
+    registry = CheckpointRegistry(os.path.join(folder, 'checkpoints.jsonl'))
+    registry.add(write_file(folder, 'diverged.ckpt', b'diverged'), 0,
+                 {'val_loss': float('nan')})
+    registry.add(write_file(folder, 'model.ckpt', b'weights'), 1,
+                 {'val_loss': 0.5})
+
+    # The diverged value is reloaded as null
+    with open(registry.path, 'r') as file:
+        lines = file.read().splitlines()
+    with open(registry.path, 'w') as file:
+        file.write('\n'.join([lines[0].replace('NaN', 'null')] + lines[1:]))
+
+    reloaded = CheckpointRegistry(registry.path)
+
+    assert reloaded.entries[0]['metrics']['val_loss'] is None
+    assert reloaded.best('val_loss', 'min')['epoch'] == 1
+    assert reloaded.best('val_loss', 'max')['epoch'] == 1
+
+def test_checkpoint_registry_truncated(folder):
+    """
+    Tests a line truncated by a killed process is skipped
+    """
+    registry = CheckpointRegistry(os.path.join(folder, 'checkpoints.jsonl'))
+    registry.add(write_file(folder, 'model.ckpt', b'weights'), 0,
+                 {'val_loss': 0.5})
+
+    with open(registry.path, 'ab') as file:
+        file.write(b'{"path": "trunc')
+
+    registry.add(write_file(folder, 'model.ckpt', b'new weights'), 1,
+                 {'val_loss': 0.4})
+
+    reloaded = CheckpointRegistry(registry.path)
+
+    assert [entry['epoch'] for entry in reloaded.entries] == [0, 1]
+    assert not reloaded.entries[0]['stored']
+
+def test_checkpoint_registry_missing_file_exception(folder):
+    registry = CheckpointRegistry(os.path.join(folder, 'checkpoints.jsonl'))
+
+    with pytest.raises(ValueError):
+        registry.add(os.path.join(folder, 'missing.ckpt'), 0)
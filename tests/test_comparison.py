@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from deeplearning_logger.comparison import MetricComparison, \
+                                           get_metric_series
+
+def get_comparison():
+    series = [np.array([3., 2., 1.]),
+              np.array([2., 0.5]),
+              np.array([]),
+              np.array([4., np.nan, 0.])]
+
+    return MetricComparison('val_loss', ['a', 'b', 'c', 'd'], series)
+
+def test_metric_comparison_values():
+    """
+    Tests the series are aligned and padded with NaN
+    """
+    comparison = get_comparison()
+    frame = comparison.to_frame()
+
+    assert comparison.values.shape == (4, 3)
+    assert list(comparison.lengths) == [3, 2, 0, 3]
+    assert np.isnan(comparison.values[1, 2])
+    assert list(frame.index) == ['a', 'b', 'c', 'd']
+    assert frame.loc['b', 1] == 0.5
+
+def test_metric_comparison_reductions():
+    """
+    Tests the reductions of each experiment
+    """
+    comparison = get_comparison()
+
+    np.testing.assert_array_equal(comparison.final(), [1., 0.5, np.nan, 0.])
+    np.testing.assert_array_equal(comparison.best(), [1., 0.5, np.nan, 0.])
+    np.testing.assert_array_equal(comparison.best('max'),
+                                  [3., 2., np.nan, 4.])
+    assert list(comparison.best_epoch()) == [2, 1, -1, 2]
+    assert list(comparison.best_epoch('max')) == [0, 0, -1, 0]
+    np.testing.assert_array_equal(comparison.auc(),
+                                  [4., 1.25, np.nan, np.nan])
+
+def test_metric_comparison_rank():
+    """
+    Tests the experiments without values are ranked last
+    """
+    comparison = get_comparison()
+
+    assert list(comparison.rank()) == [3, 2, 4, 1]
+    assert list(comparison.rank('final', 'max')) == [1, 2, 4, 3]
+    assert list(comparison.rank('auc')) == [2, 1, 3, 4]
+    assert list(comparison.rank('auc', 'max')) == [1, 2, 3, 4]
+    assert list(comparison.summary().index) == ['d', 'b', 'a', 'c']
+
+    with pytest.raises(ValueError):
+        comparison.rank('median')
+
+def test_get_metric_series():
+    """
+    Tests a metric is read from both stored layouts
+    """
+    epochs = {'epoch_0': {'loss': 1.0}, 'epoch_1': {'loss': None}}
+    columns = {'loss': [1.0, 2.0]}
+
+    np.testing.assert_array_equal(get_metric_series(epochs, 'loss'),
+                                  [1.0, np.nan])
+    np.testing.assert_array_equal(get_metric_series(columns, 'loss'),
+                                  [1.0, 2.0])
+    assert len(get_metric_series(epochs, 'acc')) == 0
+    assert len(get_metric_series({}, 'loss')) == 0
@@ -0,0 +1,65 @@
+import gzip
+import os
+import pytest
+import shutil
+
+from deeplearning_logger.compression import check_compression, \
+                                            compress_stream, find_file, \
+                                            get_extension, read_file
+
+def get_folder(name):
+    folder = os.path.join(os.path.dirname(os.path.realpath(__file__)), name)
+    os.makedirs(folder, exist_ok=True)
+
+    return folder
+
+@pytest.mark.parametrize('compression', [None, 'gzip', 'zstd'])
+def test_compress_stream(compression):
+    """
+    Tests a compressed file is read back transparently
+    """
+    folder = get_folder('compression_01')
+    path = os.path.join(folder, 'data.json')
+    content = b'{"epoch_0": {"loss": 1.0}}' * 100
+
+    with open(path + get_extension(compression), 'wb') as file:
+        with compress_stream(file, compression) as stream:
+            stream.write(content)
+
+        size = file.tell()
+
+    assert find_file(path) == path + get_extension(compression)
+    assert read_file(path) == content
+
+    if compression is not None:
+        assert size < len(content)
+
+    shutil.rmtree(folder)
+
+def test_gzip_file_is_standard():
+    """
+    Tests gzip files can be read by other tools
+    """
+    folder = get_folder('compression_02')
+    path = os.path.join(folder, 'data.json.gz')
+
+    with open(path, 'wb') as file:
+        with compress_stream(file, 'gzip') as stream:
+            stream.write(b'{}')
+
+    with gzip.open(path) as file:
+        assert file.read() == b'{}'
+
+    shutil.rmtree(folder)
+
+def test_check_compression():
+    """
+    Tests an unknown compression raises an exception
+    """
+    check_compression(None)
+
+    with pytest.raises(ValueError):
+        check_compression('bz2')
+
+    with pytest.raises(FileNotFoundError):
+        read_file('missing.json')
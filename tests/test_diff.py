@@ -0,0 +1,79 @@
+import numpy as np
+
+from deeplearning_logger import diff as diff_module
+from deeplearning_logger.diff import diff_many, diff_metrics, diff_trees
+
+def test_diff_trees():
+    """
+    Tests the changed, added and removed values are found with their paths
+    """
+    old = {'model': {'layers': [{'units': 10}, {'units': 1}], 'name': 'a'},
+           'lr': 0.1, 'loss': float('nan'), 'weights': np.arange(3.)}
+    new = {'model': {'layers': [{'units': 20}, {'units': 1}, {'units': 2}]},
+           'lr': 0.1, 'loss': None, 'weights': np.arange(3.), 'seed': 1}
+
+    changes = {change['path']: change for change in diff_trees(old, new)}
+
+    assert set(changes) == {'model.layers.0.units', 'model.layers.2',
+                            'model.name', 'seed'}
+    assert changes['model.layers.0.units']['change'] == 'changed'
+    assert changes['model.layers.0.units']['old'] == 10
+    assert changes['model.layers.2']['change'] == 'added'
+    assert changes['model.name']['change'] == 'removed'
+    assert diff_trees(old, old) == []
+
+def test_diff_trees_hashed_subtree():
+    """
+    Tests the architectures with the same content hash are not compared
+    """
+    old = {'model_hash': 'abc', 'model_config': {'layers': [1, 2]}}
+    new = {'model_hash': 'abc', 'model_config': {'layers': [1, 3]}}
+
+    assert diff_trees(old, new) == []
+
+    new['model_hash'] = 'def'
+    changes = diff_trees(old, new)
+
+    assert [change['path'] for change in changes] == \
+            ['model_hash', 'model_config.layers.1']
+
+def test_diff_metrics():
+    """
+    Tests the statistics of the differences of the metrics
+    """
+    metrics = diff_metrics({'loss': [3., 2., 1.], 'acc': [.5, .6]},
+                           {'loss': [3., 1.5, 1., .5], 'acc': [.5, .6],
+                            'val_loss': [1.]})
+
+    assert metrics['loss']['first_divergence'] == 1
+    assert metrics['loss']['max_abs_diff'] == .5
+    assert metrics['loss']['final_delta'] == -.5
+    assert metrics['loss']['new_epochs'] == 4
+    assert metrics['acc']['equal']
+    assert metrics['val_loss']['first_divergence'] == 0
+    assert np.isnan(metrics['val_loss']['old_final'])
+
+def test_diff_many(monkeypatch):
+    """
+    Tests several structures are compared, diffing each distinct one once
+    """
+    calls = []
+    original = diff_module.diff_trees
+    monkeypatch.setattr(diff_module, 'diff_trees',
+                        lambda *args: calls.append(args) or original(*args))
+
+    trees = {'a': {'lr': 0.1, 'units': 10},
+             'b': {'lr': 0.01, 'units': 10},
+             'c': {'lr': 0.01, 'units': 10},
+             'd': {'lr': 0.1, 'units': 10, 'seed': 2}}
+    columns = {'a': {'loss': [2., 1.]}, 'b': {'loss': [3.]}, 'c': {}}
+    result = diff_many(trees, columns)
+
+    assert len(calls) == 2
+    assert result.values == {'lr': [0.1, 0.01, 0.01, 0.1],
+                             'seed': [None, None, None, 2]}
+    np.testing.assert_array_equal(result.metrics['loss']['final'],
+                                  [1., 3., np.nan, np.nan])
+    np.testing.assert_array_equal(result.metrics['loss']['epochs'],
+                                  [2, 1, 0, 0])
+    assert list(result.to_frame().columns) == ['a', 'b', 'c', 'd']
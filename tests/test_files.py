@@ -0,0 +1,177 @@
+import json
+import os
+import pytest
+import shutil
+
+from deeplearning_logger.files import FileLock, atomic_write, commit_files, \
+                                      get_temp_path, recover_folder
+
+# Host of the writers, and a process of it which is never alive
+HOST = get_temp_path('')[1:].rpartition('-')[0]
+DEAD_PID = 999999999
+DEAD_WRITER = f'{HOST}-{DEAD_PID}'
+
+def get_folder(name):
+    folder = os.path.join(os.path.dirname(os.path.realpath(__file__)), name)
+    os.makedirs(folder, exist_ok=True)
+
+    return folder
+
+def test_atomic_write():
+    """
+    Tests a file is replaced without leaving temporary files
+    """
+    folder = get_folder('files_01')
+    path = os.path.join(folder, 'data.json')
+
+    for fsync in ['never', 'always']:
+        assert atomic_write(path, b'{"a": 1}', fsync) == 8
+
+        with open(path, 'rb') as file:
+            assert file.read() == b'{"a": 1}'
+
+    assert os.listdir(folder) == ['data.json']
+
+    shutil.rmtree(folder)
+
+def test_commit_files():
+    """
+    Tests several files are committed together
+    """
+    folder = get_folder('files_02')
+    files = {'config.json': b'{}', 'data.json': b'[1, 2]'}
+
+    assert commit_files(folder, files) == 8
+    assert sorted(os.listdir(folder)) == ['config.json', 'data.json']
+    assert recover_folder(folder) == 'clean'
+
+    shutil.rmtree(folder)
+
+def test_recover_folder_pending_commit():
+    """
+    Tests a commit interrupted after its journal was written is finished
+    """
+    folder = get_folder('files_03')
+
+    with open(os.path.join(folder, 'data.json'), 'wb') as file:
+        file.write(b'old')
+
+    # The config file was already renamed before the crash
+    renames = [[f'config.json.{DEAD_WRITER}.tmp', 'config.json'],
+               [f'data.json.{DEAD_WRITER}.tmp', 'data.json']]
+    for name, content in [('config.json', b'new'),
+                          (f'data.json.{DEAD_WRITER}.tmp', b'new')]:
+        with open(os.path.join(folder, name), 'wb') as file:
+            file.write(content)
+    with open(os.path.join(folder, '.commit'), 'w') as file:
+        json.dump({'host': HOST, 'pid': DEAD_PID, 'renames': renames}, file)
+
+    assert recover_folder(folder) == 'committed'
+    assert sorted(os.listdir(folder)) == ['config.json', 'data.json']
+
+    with open(os.path.join(folder, 'data.json'), 'rb') as file:
+        assert file.read() == b'new'
+
+    shutil.rmtree(folder)
+
+def test_recover_folder_pending_commit_sidecar():
+    """
+    Tests the sidecar files of an interrupted commit are renamed with the
+    data file instead of being rolled back
+    """
+    folder = get_folder('files_06')
+    os.makedirs(os.path.join(folder, 'arrays'))
+
+    sidecar = os.path.join('arrays', 'loss.npy')
+    temp_sidecar = f'{sidecar}.{DEAD_WRITER}.tmp'
+    renames = [[temp_sidecar, sidecar],
+               [f'data.json.{DEAD_WRITER}.tmp', 'data.json']]
+    for name, _ in renames:
+        with open(os.path.join(folder, name), 'wb') as file:
+            file.write(b'new')
+    with open(os.path.join(folder, '.commit'), 'w') as file:
+        json.dump({'host': HOST, 'pid': DEAD_PID, 'renames': renames}, file)
+
+    assert recover_folder(folder) == 'committed'
+    assert sorted(os.listdir(folder)) == ['arrays', 'data.json']
+    assert os.listdir(os.path.join(folder, 'arrays')) == ['loss.npy']
+
+    # Sidecar files of a commit killed before its journal are removed
+    with open(os.path.join(folder, temp_sidecar), 'wb') as file:
+        file.write(b'newer')
+
+    assert recover_folder(folder) == 'rolled_back'
+    assert os.listdir(os.path.join(folder, 'arrays')) == ['loss.npy']
+
+    shutil.rmtree(folder)
+
+def test_recover_folder_rollback():
+    """
+    Tests the temporary files of a dead process are removed, and the ones
+    of a live process are kept
+    """
+    folder = get_folder('files_04')
+    alive = os.path.basename(get_temp_path('data.json'))
+
+    for name in ['data.json', f'data.json.{DEAD_WRITER}.tmp', alive]:
+        with open(os.path.join(folder, name), 'wb') as file:
+            file.write(b'{}')
+
+    assert recover_folder(folder) == 'rolled_back'
+    assert sorted(os.listdir(folder)) == ['data.json', alive]
+
+    # A folder which only held temporary files is removed
+    os.remove(os.path.join(folder, 'data.json'))
+    os.remove(os.path.join(folder, alive))
+    dead = f'data.json.{DEAD_WRITER}.tmp'
+    with open(os.path.join(folder, dead), 'wb') as file:
+        file.write(b'{')
+
+    assert recover_folder(folder) == 'removed'
+    assert not os.path.exists(folder)
+
+def test_recover_folder_unknown_writer():
+    """
+    Tests the commits and temporary files of other hosts or of unknown
+    writers are kept, since their writers may still be alive
+    """
+    folder = get_folder('files_07')
+    names = [f'data.json.other-host-{DEAD_PID}.tmp',
+             f'data.json.{DEAD_PID}.tmp', 'config.json.tmp']
+
+    for name in names:
+        with open(os.path.join(folder, name), 'wb') as file:
+            file.write(b'{}')
+    with open(os.path.join(folder, '.commit'), 'w') as file:
+        json.dump({'host': 'other-host', 'pid': DEAD_PID,
+                   'renames': [[names[0], 'data.json']]}, file)
+
+    assert recover_folder(folder) == 'clean'
+    assert sorted(os.listdir(folder)) == sorted(names + ['.commit'])
+
+    # Journals of older versions don't record their writer
+    with open(os.path.join(folder, '.commit'), 'w') as file:
+        json.dump([[names[0], 'data.json']], file)
+
+    assert recover_folder(folder) == 'clean'
+    assert sorted(os.listdir(folder)) == sorted(names + ['.commit'])
+
+    shutil.rmtree(folder)
+
+def test_file_lock():
+    """
+    Tests a folder lock excludes other holders until it is released
+    """
+    folder = get_folder('files_05')
+
+    with FileLock(folder):
+        with pytest.raises(TimeoutError):
+            FileLock(folder, timeout=0.05).acquire()
+
+    with FileLock(folder, timeout=0.05):
+        pass
+
+    # Folders are locked without creating files
+    assert os.listdir(folder) == []
+
+    shutil.rmtree(folder)
@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+
+from deeplearning_logger.imports import lazy_type
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+_READ_SCRIPT = '''
+import sys
+import tempfile
+
+from deeplearning_logger.keras.configs import MetricsConfig
+from deeplearning_logger.keras.project import Project
+from deeplearning_logger.pytorch.pytorch_logger import ExperimentData, \\
+                                                       PytorchLogger
+
+with tempfile.TemporaryDirectory() as folder:
+    project = Project('project', folder)
+    metrics = MetricsConfig({'epoch_0': {'loss': 1.0}})
+    project.create_experiment('experiment', configs=[metrics])
+
+    experiment = project.open_experiment(project.list_experiments()[0])
+    assert experiment.get_config('metrics').get_columns()['loss'][0] == 1.0
+    assert project.compare('loss').final()[0] == 1.0
+
+    logger = PytorchLogger(folder)
+    logger.save(ExperimentData(), 'experiment')
+    assert logger.load('experiment')['epochs'] == 0
+
+heavy = [module for module in ('tensorflow', 'torch', 'pandas', 'keras')
+         if module in sys.modules]
+assert not heavy, heavy
+'''
+
+def test_read_side_imports():
+    """
+    Tests writing and reading experiments from dictionaries doesn't import
+    any deep learning framework nor pandas
+    """
+    result = subprocess.run([sys.executable, '-c', _READ_SCRIPT], cwd=_ROOT,
+                            capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+
+def test_pytorch_side_imports():
+    """
+    Tests the PyTorch logger, diffs included, doesn't import the Keras side
+    of the package
+    """
+    script = ('import sys\n'
+              'import deeplearning_logger.pytorch.pytorch_logger\n'
+              "assert 'deeplearning_logger.keras' not in sys.modules\n")
+    result = subprocess.run([sys.executable, '-c', script], cwd=_ROOT,
+                            capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+
+def test_lazy_type():
+    """
+    Tests a lazy type checks the instances of an imported class, and of no
+    class when its module isn't imported
+    """
+    OrderedDict = lazy_type('collections', 'OrderedDict')
+    Missing = lazy_type('not_imported_module', 'Class')
+    # Class missing from an imported module, or from a missing submodule
+    MissingClass = lazy_type('collections', 'Variable')
+    MissingSubmodule = lazy_type('collections.missing', 'Variable')
+
+    assert isinstance(__import__('collections').OrderedDict(), OrderedDict)
+    assert not isinstance({}, OrderedDict)
+    assert not isinstance({}, Missing)
+    assert not isinstance({}, MissingClass)
+    assert not isinstance({}, MissingSubmodule)
+    assert not issubclass(dict, MissingClass)
+    assert issubclass(__import__('collections').OrderedDict, OrderedDict)
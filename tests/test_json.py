@@ -0,0 +1,82 @@
+import pytest
+import json
+import numpy as np
+
+from deeplearning_logger.json import ConfigsJSONEncoder, JSONSerializer
+
+_BACKENDS = ['json', 'ujson', 'orjson']
+
+def get_serializer(backend, compact=False):
+    pytest.importorskip(backend)
+
+    return JSONSerializer(backend=backend, compact=compact)
+
+@pytest.mark.parametrize('backend', _BACKENDS)
+@pytest.mark.parametrize('compact', [False, True])
+def test_serializer_numpy(backend, compact):
+    """
+    Tests serializing numpy arrays and scalars with each backend
+    """
+    serializer = get_serializer(backend, compact)
+    data = {
+        'losses': np.linspace(0, 1, 5),
+        'epochs': np.int64(5),
+        'lr': np.float32(0.5),
+        'model': {'layers': [{'units': 10}, {'units': 1}]}
+    }
+
+    content = serializer.dumps(data)
+
+    assert isinstance(content, bytes)
+    assert (b'\n' not in content) == compact
+    assert json.loads(content) == json.loads(
+                                    json.dumps(data, cls=ConfigsJSONEncoder))
+    assert serializer.loads(content)['losses'][-1] == 1.
+
+@pytest.mark.parametrize('backend', _BACKENDS)
+def test_serializer_not_serializable(backend):
+    """
+    Tests serializing an object no backend supports
+    """
+    serializer = get_serializer(backend)
+
+    with pytest.raises(TypeError):
+        serializer.dumps({'value': object()})
+
+def test_serializer_unknown_backend():
+    """
+    Tests creating a serializer with an unknown backend
+    """
+    with pytest.raises(ValueError):
+        JSONSerializer(backend='simplejson')
+
+def test_serializer_default_backend():
+    """
+    Tests the default serializer keeps the standard library format and
+    reads back NaN and infinite values
+    """
+    serializer = JSONSerializer()
+    data = {'losses': [0.5, float('nan'), float('inf')],
+            'series': np.array([np.nan, 0.1])}
+
+    content = serializer.dumps(data)
+    loaded = serializer.loads(content)
+
+    assert serializer.backend == 'json'
+    assert content == json.dumps(data, indent=4,
+                                 cls=ConfigsJSONEncoder).encode('utf-8')
+    assert np.isnan(loaded['losses'][1]) and loaded['losses'][2] == np.inf
+    assert np.isnan(loaded['series'][0]) and loaded['series'][1] == 0.1
+
+@pytest.mark.parametrize('backend', _BACKENDS)
+def test_serializer_loads_non_finite(backend):
+    """
+    Tests every backend reads the NaN and infinite values written by the
+    default backend
+    """
+    serializer = get_serializer(backend)
+    content = JSONSerializer().dumps({'loss': [np.nan, 0.5, -np.inf]})
+    loaded = serializer.loads(content)
+
+    assert np.isnan(loaded['loss'][0]) and loaded['loss'][1] == 0.5
+    assert loaded['loss'][2] == -np.inf
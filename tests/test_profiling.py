@@ -0,0 +1,122 @@
+from deeplearning_logger.profiling import PROFILER, STATS_FILE, Profiler, \
+                                          disable_profiling, dump_stats, \
+                                          enable_profiling, get_stats, \
+                                          profiled, reset_stats
+from deeplearning_logger.pytorch.pytorch_logger import PytorchLogger, \
+                                                        ExperimentData
+from deeplearning_logger.keras.configs import MetricsConfig
+import pandas as pd
+import pytest
+import json
+import os
+import shutil
+
+@pytest.fixture
+def profiler():
+    reset_stats()
+    enable_profiling()
+
+    yield PROFILER
+
+    disable_profiling()
+    reset_stats()
+
+def test_profiling_disabled():
+    """
+    Tests nothing is counted while the profiler is disabled
+    """
+    reset_stats()
+    logger = PytorchLogger()
+    logger.save(ExperimentData(), 'profiling_ex')
+
+    assert get_stats() == {}
+
+    os.remove('profiling_ex.json')
+
+def test_profiling_save(profiler):
+    """
+    Tests the time and bytes of a saved experiment are counted
+    """
+    logger = PytorchLogger()
+    logger.save(ExperimentData(), 'profiling_ex')
+
+    stats = get_stats()
+    size = os.path.getsize('profiling_ex.json')
+
+    assert stats['PytorchLogger.save']['calls'] == 1
+    assert stats['PytorchLogger.save']['bytes_written'] == size
+    assert stats['PytorchLogger.write_experiment']['bytes_written'] == size
+    assert stats['ExperimentData.get']['bytes_written'] == 0
+    assert stats['PytorchLogger.save']['seconds'] >= \
+            stats['PytorchLogger.write_experiment']['seconds']
+
+    save = stats['PytorchLogger.save']
+    assert save['serialization_seconds'] == \
+            pytest.approx(save['seconds'] - save['io_seconds'])
+    assert sum(save['histogram_us'].values()) == 1
+
+    os.remove('profiling_ex.json')
+
+def test_profiling_config(profiler):
+    """
+    Tests the creation of each config type is counted
+    """
+    MetricsConfig(pd.DataFrame({'loss': [0.5, 0.4]}))
+    MetricsConfig(pd.DataFrame({'loss': [0.3]}))
+
+    assert get_stats()['MetricsConfig.get_config']['calls'] == 2
+
+def test_profiling_nested():
+    """
+    Tests the I/O of a nested operation is also counted in the outer one
+    """
+    profiler = Profiler()
+
+    def inner():
+        profiler.add_io(10, 0.5)
+
+    def outer():
+        profiler.add_io(5, 0.25)
+        profiler.call('inner', inner)
+
+    profiler.call('outer', outer)
+    stats = profiler.get_stats()
+
+    assert stats['inner']['bytes_written'] == 10
+    assert stats['outer']['bytes_written'] == 15
+    assert stats['outer']['io_seconds'] == 0.75
+
+def test_profiled_decorator(profiler):
+    """
+    Tests the decorator keeps the result and the exceptions of the function
+    """
+    @profiled('test.function')
+    def function(value):
+        if value is None:
+            raise ValueError('No value')
+        return value * 2
+
+    assert function(2) == 4
+    with pytest.raises(ValueError):
+        function(None)
+
+    assert get_stats()['test.function']['calls'] == 2
+
+def test_dump_stats(profiler):
+    """
+    Tests the stats file written into an experiment folder
+    """
+    folder = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                          'profiling_01')
+    os.makedirs(folder, exist_ok=True)
+
+    MetricsConfig(pd.DataFrame({'loss': [0.5, 0.4]}))
+    path = dump_stats(folder)
+
+    with open(path, 'r') as file:
+        stats = json.load(file)
+
+    assert path == os.path.join(folder, STATS_FILE)
+    assert stats['MetricsConfig.get_config']['calls'] == 1
+
+    shutil.rmtree(folder)
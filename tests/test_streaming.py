@@ -0,0 +1,181 @@
+from deeplearning_logger import streaming
+from deeplearning_logger.arrays import ArrayStore
+from deeplearning_logger.compression import compress_stream
+from deeplearning_logger.json import JSONSerializer
+from deeplearning_logger.streaming import iter_epochs, iter_metric, \
+                                          iter_sections, read_metric, \
+                                          read_section
+import json
+import math
+import numpy as np
+import os
+import pytest
+import shutil
+import tracemalloc
+
+_FOLDER = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                       'streaming_01')
+
+@pytest.fixture
+def folder():
+    os.makedirs(_FOLDER, exist_ok=True)
+
+    yield _FOLDER
+
+    shutil.rmtree(_FOLDER)
+
+def write_data(folder, data, compression=None):
+    path = os.path.join(folder, 'experiment_data.json')
+    extension = {'gzip': '.gz', None: ''}[compression]
+
+    with open(path + extension, 'wb') as file:
+        with compress_stream(file, compression) as stream:
+            stream.write(json.dumps(data, indent=4).encode('utf-8'))
+
+    return path
+
+def get_data(epochs=5):
+    return {
+        'model': {'model_config': {'name': 'módel "quoted"\n',
+                                   'layers': [1, -2.5e-3, True, None]}},
+        'metrics': {f'epoch_{epoch}': {'loss': 1. / (epoch + 1),
+                                       'accuracy': epoch / 10}
+                    for epoch in range(epochs)},
+        'callbacks': {}
+    }
+
+@pytest.mark.parametrize('chunk_size', [3, 7, 1 << 16])
+def test_read_section(folder, monkeypatch, chunk_size):
+    """
+    Tests reading a section whatever the chunk boundaries
+    """
+    monkeypatch.setattr(streaming, '_CHUNK_SIZE', chunk_size)
+    data = get_data()
+    path = write_data(folder, data)
+
+    assert read_section(path, 'model') == data['model']
+    assert read_section(path, 'callbacks') == {}
+    assert dict(iter_sections(path)) == data
+
+    with pytest.raises(KeyError):
+        read_section(path, 'optimizer')
+
+def test_non_finite_values(folder):
+    """
+    Tests the non finite values written by the json module
+    """
+    path = write_data(folder, {'metrics': {'loss': [float('nan'),
+                                                    float('inf'),
+                                                    -float('inf'), 1]}})
+    values = list(iter_metric(path, 'loss'))
+
+    assert math.isnan(values[0])
+    assert values[1:] == [float('inf'), -float('inf'), 1]
+
+def test_iter_epochs(folder):
+    """
+    Tests iterating the epochs of both layouts
+    """
+    data = get_data()
+    path = write_data(folder, data)
+
+    epochs = list(iter_epochs(path))
+
+    assert [epoch for epoch, _ in epochs] == list(range(5))
+    assert epochs[2][1] == data['metrics']['epoch_2']
+
+    columns = {'loss': [0.5, 0.4], 'accuracy': [0.1, 0.2]}
+    path = write_data(folder, {'metrics': columns})
+
+    assert list(iter_epochs(path)) == [(0, {'loss': 0.5, 'accuracy': 0.1}),
+                                       (1, {'loss': 0.4, 'accuracy': 0.2})]
+
+def test_iter_metric(folder):
+    """
+    Tests iterating a metric of both layouts, plain and compressed
+    """
+    data = get_data()
+    expected = [1. / (epoch + 1) for epoch in range(5)]
+
+    path = write_data(folder, data, compression='gzip')
+    assert list(iter_metric(path, 'loss')) == expected
+    assert list(iter_metric(path, 'missing')) == [None] * 5
+    os.remove(path + '.gz')
+
+    path = write_data(folder, {'metrics': {'accuracy': [0.1] * 5,
+                                           'loss': expected}})
+    assert list(iter_metric(path, 'loss')) == expected
+
+def test_iter_metric_sidecar(folder):
+    """
+    Tests iterating a metric stored in a sidecar file
+    """
+    losses = np.linspace(1, 0, 100)
+    data = ArrayStore(folder, threshold=10).externalize(
+                        {'metrics': {'loss': losses, 'accuracy': losses}})
+    path = write_data(folder, data)
+
+    np.testing.assert_array_equal(list(iter_metric(path, 'loss')), losses)
+    np.testing.assert_array_equal(read_section(path, 'metrics')['accuracy'],
+                                  losses)
+
+@pytest.mark.parametrize('chunk_size', [7, 1 << 16])
+def test_read_metric(folder, monkeypatch, chunk_size):
+    """
+    Tests reading a metric of each layout into an array
+    """
+    monkeypatch.setattr(streaming, '_CHUNK_SIZE', chunk_size)
+    data = get_data()
+    data['metrics']['epoch_2'] = {'loss': None}
+    expected = [1., 0.5, np.nan, 0.25, 0.2]
+
+    path = write_data(folder, data)
+    np.testing.assert_array_equal(read_metric(path, 'loss'), expected)
+    assert read_metric(path, 'missing').size == 0
+
+    path = write_data(folder, {'metrics': {'accuracy': [0.1] * 5,
+                                           'loss': expected}})
+    np.testing.assert_array_equal(read_metric(path, 'loss'), expected)
+    assert read_metric(path, 'missing').size == 0
+
+    losses = np.linspace(1, 0, 100)
+    path = write_data(folder, ArrayStore(folder, threshold=10).externalize(
+                        {'metrics': {'accuracy': losses, 'loss': losses}}))
+    np.testing.assert_array_equal(read_metric(path, 'loss'), losses)
+
+def test_iter_metric_constant_memory(folder):
+    """
+    Tests the memory scanning a metric doesn't grow with the file
+    """
+    path = os.path.join(folder, 'experiment_data.json')
+    metrics = {f'epoch_{epoch}': {f'metric_{idx}': 0.5 for idx in range(20)}
+               for epoch in range(20000)}
+
+    with open(path, 'wb') as file:
+        JSONSerializer().dump({'metrics': metrics}, file)
+
+    tracemalloc.start()
+    count = sum(1 for _ in iter_metric(path, 'metric_3'))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    assert count == 20000
+    assert peak < os.path.getsize(path) / 20
+
+def test_invalid_json(folder):
+    path = os.path.join(folder, 'experiment_data.json')
+
+    with open(path, 'wb') as file:
+        file.write(b'{"metrics": {"loss": [1, ?]}}')
+
+    with pytest.raises(ValueError):
+        list(iter_metric(path, 'loss'))
+
+def test_truncated_json(folder):
+    path = os.path.join(folder, 'experiment_data.json')
+
+    with open(path, 'wb') as file:
+        file.write(b'{"model": {"name": "cut')
+
+    with pytest.raises(ValueError):
+        read_section(path, 'metrics')
@@ -0,0 +1,64 @@
+from deeplearning_logger.pytorch.experiment_data import MetricsData, \
+                                                        OptimizerData, \
+                                                        _get_field_types
+from deeplearning_logger.keras.configs import MetricsConfig
+from deeplearning_logger.validation import is_validation_enabled, \
+                                           set_validation, skip_validation
+import threading
+import pytest
+
+def test_cached_field_types():
+    field_types = _get_field_types(OptimizerData)
+
+    assert field_types == (('lr', float), ('optimizer', str),
+                           ('weight_decay', float))
+    assert _get_field_types(OptimizerData) is field_types
+
+def test_validation_error():
+    with pytest.raises(ValueError):
+        OptimizerData(lr='0.01')
+
+    with pytest.raises(TypeError):
+        MetricsConfig([0.5, 0.4])
+
+def test_trusted_constructor():
+    optimizer = OptimizerData.trusted(lr='0.01')
+
+    assert optimizer.lr == '0.01'
+    assert is_validation_enabled()
+
+    with pytest.raises(ValueError):
+        OptimizerData(lr='0.01')
+
+def test_set_validation():
+    set_validation(False)
+
+    try:
+        assert OptimizerData(lr='0.01').lr == '0.01'
+        assert MetricsData(train_losses=0.5).train_losses == 0.5
+        assert not is_validation_enabled()
+    finally:
+        set_validation(True)
+
+    with pytest.raises(ValueError):
+        OptimizerData(lr='0.01')
+
+def test_skip_validation_thread():
+    errors = []
+
+    def build():
+        try:
+            OptimizerData(lr='0.01')
+        except ValueError as error:
+            errors.append(error)
+
+    with skip_validation():
+        assert not is_validation_enabled()
+
+        # Other threads keep validating
+        thread = threading.Thread(target=build)
+        thread.start()
+        thread.join()
+
+    assert len(errors) == 1
+    assert is_validation_enabled()
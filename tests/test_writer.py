@@ -0,0 +1,157 @@
+import pytest
+import threading
+
+from deeplearning_logger.writer import BackgroundWriter, snapshot
+
+def test_background_writer_flush():
+    """
+    Tests the pending writes are done after flushing the writer
+    """
+    writer = BackgroundWriter()
+    written = []
+
+    for idx in range(10):
+        writer.submit(written.append, idx)
+
+    writer.flush()
+
+    assert written == list(range(10))
+
+    writer.close()
+
+def test_background_writer_error():
+    """
+    Tests an exception raised by a write is raised again when flushing
+    """
+    writer = BackgroundWriter()
+
+    writer.submit(int, 'not a number')
+
+    with pytest.raises(ValueError):
+        writer.flush()
+
+    writer.close()
+
+    with pytest.raises(ValueError):
+        writer.submit(print, 'closed')
+
+@pytest.mark.parametrize('policy, written, dropped', [
+    ('drop_newest', [0, 1], 2),
+    ('drop_oldest', [0, 3], 2)
+])
+def test_background_writer_drop_policies(policy, written, dropped):
+    """
+    Tests the policies that discard writes when the queue is full
+    """
+    writer = BackgroundWriter(max_pending=1, policy=policy)
+    release = threading.Event()
+    started = threading.Event()
+    result = []
+
+    def blocked_write(value):
+        started.set()
+        release.wait()
+        result.append(value)
+
+    # Keeps the background thread busy so the queue fills up
+    writer.submit(blocked_write, 0)
+    started.wait()
+
+    discarded = []
+
+    for idx in range(1, 4):
+        writer.submit(result.append, idx,
+                      on_drop=lambda idx=idx: discarded.append(idx))
+
+    release.set()
+    writer.close()
+
+    assert result == written
+    assert writer.dropped == dropped
+    # Each discarded write is reported to its caller
+    assert sorted(discarded + written[1:]) == [1, 2, 3]
+
+@pytest.mark.parametrize('policy, written', [
+    ('drop_newest', [0, 1, 2]),
+    ('drop_oldest', [0, 1, 4])
+])
+def test_background_writer_required(policy, written):
+    """
+    Tests the required writes are never discarded by the policies
+    """
+    writer = BackgroundWriter(max_pending=2, policy=policy)
+    release = threading.Event()
+    started = threading.Event()
+    result = []
+
+    def blocked_write(value):
+        started.set()
+        release.wait()
+        result.append(value)
+
+    writer.submit(blocked_write, 0)
+    started.wait()
+
+    writer.submit(result.append, 1, required=True)
+    for idx in range(2, 5):
+        writer.submit(result.append, idx)
+
+    release.set()
+    writer.close()
+
+    assert result == written
+    assert writer.dropped == 2
+
+def test_background_writer_raise_policy():
+    """
+    Tests the policy that raises an exception when the queue is full
+    """
+    writer = BackgroundWriter(max_pending=1, policy='raise')
+    release = threading.Event()
+    started = threading.Event()
+
+    writer.submit(lambda: (started.set(), release.wait()))
+    started.wait()
+    writer.submit(print, 'pending')
+
+    with pytest.raises(BufferError):
+        writer.submit(print, 'too many')
+
+    release.set()
+    writer.close()
+
+def test_background_writer_submit_close_race():
+    """
+    Tests a writer closed while a write is being submitted still runs it
+    """
+    writer = BackgroundWriter()
+    written = []
+    put = writer._queue.put
+
+    def put_while_closing(task):
+        # The writer is closed between the check and the enqueuing of the
+        # write, the stop sentinel is enqueued as usual
+        if task is not None:
+            closing.start()
+            closing.join(timeout=0.1)
+        put(task)
+
+    closing = threading.Thread(target=writer.close)
+    writer._queue.put = put_while_closing
+    writer.submit(written.append, 1)
+    closing.join()
+
+    assert written == [1]
+
+def test_snapshot():
+    """
+    Tests the snapshot copies the containers but not the values
+    """
+    values = object()
+    data = {'losses': [0.1, 0.2], 'values': values}
+    copy = snapshot(data)
+
+    data['losses'].append(0.3)
+
+    assert copy['losses'] == [0.1, 0.2]
+    assert copy['values'] is values